@@ -0,0 +1,184 @@
+"""Chats REST API.
+
+Plain `@endpoint` handlers — no generic router factory. Each route is gated with
+the `role="authenticated"` sugar and reads the current user ambiently via
+`from cat import user`, scoping every row by `user.id`.
+"""
+
+from typing import List, Dict, Optional
+
+from fastapi import Body, Query, HTTPException
+from fastapi.responses import StreamingResponse
+
+from cat import endpoint, user
+from cat.types import Message
+
+from ..db import (
+    ChatDB,
+    ChatMessageDB,
+    derived_columns,
+    load_messages,
+    stream_messages,
+    append_messages,
+    replace_messages,
+    insert_chat,
+)
+from ..threads import ChatThreads
+from ..utils.schemas import Page, CRUDSelect, CRUDUpdate
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..utils.search import search_condition
+
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+class ChatCreateUpdate(CRUDUpdate):
+    messages: List[Message] = []
+    context: Dict = {}
+
+
+class ChatSelect(CRUDSelect):
+    messages: List[Message]
+    context: Dict
+
+
+class ChatSummary(CRUDSelect):
+    """A chat as shown in a listing: no messages, no context."""
+    message_count: int
+    last_message: str
+
+
+FULL_COLUMNS = [ChatDB.id, ChatDB.name, ChatDB.updated_at, ChatDB.context]
+SUMMARY_COLUMNS = [
+    ChatDB.id, ChatDB.name, ChatDB.updated_at, ChatDB.message_count, ChatDB.last_message
+]
+
+
+@endpoint.get("/chats", tags=["Chats"], role="authenticated")
+async def list_chats(
+    search: Optional[str] = Query(None, description="Full-text search query"),
+    cursor: Optional[str] = Query(None, description="`cursor` of the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    summary: bool = Query(False, description="List summaries instead of full chats"),
+) -> Page[ChatSummary] | Page[ChatSelect]:
+    """Chats of the current user, most recently updated first.
+
+    Pages are keyset paginated on `(updated_at, id)`: pass the returned
+    `cursor` to get the next page; it is None on the last one. With
+    `summary=true` items carry the message count and a snippet of the last
+    message instead of messages and context, read from narrow columns.
+    """
+    q = (
+        ChatDB.select(*(SUMMARY_COLUMNS if summary else FULL_COLUMNS))
+        .where(ChatDB.user_id == user.id)
+        .order_by(ChatDB.updated_at, ChatDB.id, ascending=False)
+        .limit(limit + 1)
+    )
+    if search and search.strip():
+        q = q.where(search_condition(search))
+    if cursor:
+        try:
+            updated_at, id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        q = q.where(
+            (ChatDB.updated_at < updated_at)
+            | ((ChatDB.updated_at == updated_at) & (ChatDB.id < id))
+        )
+
+    rows = await q.output(load_json=True)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["updated_at"], rows[-1]["id"])
+    if summary:
+        return Page[ChatSummary](items=rows, cursor=next_cursor)
+
+    messages = await load_messages([row["id"] for row in rows])
+    for row in rows:
+        row["messages"] = messages[row["id"]]
+    return Page[ChatSelect](items=rows, cursor=next_cursor)
+
+
+async def get_own_chat(id: str, *columns) -> dict:
+    row = await (
+        ChatDB.select(*columns)
+        .where(ChatDB.id == id)
+        .where(ChatDB.user_id == user.id)
+        .first()
+        .output(load_json=True)
+    )
+    if row is None:
+        raise HTTPException(status_code=404, detail="Chat not found.")
+    return row
+
+
+@endpoint.get("/chats/{id}", tags=["Chats"], role="authenticated")
+async def get_chat(id: str) -> ChatSelect:
+    row = await get_own_chat(id, *FULL_COLUMNS)
+    row["messages"] = (await load_messages([row["id"]]))[row["id"]]
+    return row
+
+
+@endpoint.get("/chats/{id}/messages", tags=["Chats"], role="authenticated")
+async def read_messages(
+    id: str,
+    start: int = Query(0, ge=0, description="Position of the first message to read"),
+) -> StreamingResponse:
+    """Messages of a chat in order, streamed as NDJSON (one message per line)
+    while they are read from the database in batches."""
+    row = await get_own_chat(id, ChatDB.id)
+
+    async def lines():
+        async for message in stream_messages(row["id"], start):
+            yield Message(**message).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@endpoint.post("/chats/{id}/messages", tags=["Chats"], role="authenticated")
+async def add_messages(id: str, messages: List[Message] = Body(...)) -> ChatSummary:
+    """Append messages to a chat: only the new turn is sent and written."""
+    chat = await append_messages(id, user.id, messages)
+    if chat is None:
+        raise HTTPException(status_code=404, detail="Chat not found.")
+    ChatThreads().forget(id)
+    return chat
+
+
+@endpoint.post("/chats", tags=["Chats"], role="authenticated")
+async def create_chat(data: ChatCreateUpdate = Body(...)) -> ChatSelect:
+    obj = await insert_chat(user.id, data.name, data.messages, data.context)
+    return ChatSelect(
+        id=obj.id, name=obj.name, updated_at=obj.updated_at,
+        messages=data.messages, context=data.context,
+    )
+
+
+@endpoint.put("/chats/{id}", tags=["Chats"], role="authenticated")
+async def edit_chat(id: str, data: ChatCreateUpdate = Body(...)) -> ChatSelect:
+    """Replace a chat. Messages matching the stored history are not rewritten;
+    to add a turn prefer `POST /chats/{id}/messages`."""
+    row = await get_own_chat(id, ChatDB.id)
+    values = {"name": data.name, "context": data.context}
+    values.update(derived_columns(data.name, data.messages))
+
+    async with ChatDB._meta.db.transaction():
+        await replace_messages(row["id"], data.messages)
+        updated = await (
+            ChatDB.update({getattr(ChatDB, k): v for k, v in values.items()})
+            .where(ChatDB.id == row["id"])
+            .returning(ChatDB.id, ChatDB.name, ChatDB.updated_at)
+        )
+    ChatThreads().forget(id)
+    return ChatSelect(**updated[0], messages=data.messages, context=data.context)
+
+
+@endpoint.delete("/chats/{id}", tags=["Chats"], role="authenticated")
+async def delete_chat(id: str):
+    row = await get_own_chat(id, ChatDB.id)
+    async with ChatDB._meta.db.transaction():
+        await ChatMessageDB.delete().where(ChatMessageDB.chat_id == row["id"])
+        await ChatDB.delete().where(ChatDB.id == row["id"])
+    ChatThreads().forget(id)
@@ -29,7 +29,7 @@ from .ambient.runtime import plugin
 from .ambient import agui_event
 
 # --- models & agents -------------------------------------------------------
-from .ambient import llm, embedder
+from .ambient import llm, embedder, embedder_many
 from .services.agents.base import Agent
 from .services.directives.base import Directive
 
@@ -54,6 +54,7 @@ __all__ = [
     # models & agents
     "llm",
     "embedder",
+    "embedder_many",
     "Agent",
     "Directive",
     # advanced: base classes & registry escape hatch
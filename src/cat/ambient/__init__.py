@@ -4,8 +4,9 @@ without threading objects around.
 
 Three submodules, one idea:
 
-- `verbs`        — the actions you *call*: `llm`, `embedder`, `hook`,
-                   `execute_hook`, `agui_event`, `call_agent`, `auth`, `get`.
+- `verbs`        — the actions you *call*: `llm`, `embedder`, `embedder_many`,
+                   `hook`, `execute_hook`, `agui_event`, `call_agent`, `auth`,
+                   `get`.
 - `context_vars` — per-request state (a `contextvars.ContextVar`): `ctx`, `user`.
 - `runtime`      — the one `CheshireCat` per process: `ccat`, `plugin`.
 
@@ -18,6 +19,7 @@ from cat.ambient.verbs import (
     agui_event,
     llm,
     embedder,
+    embedder_many,
     auth,
     hook,
     execute_hook,
@@ -30,6 +32,7 @@ __all__ = [
     "agui_event",
     "llm",
     "embedder",
+    "embedder_many",
     "auth",
     "hook",
     "execute_hook",
@@ -5,14 +5,22 @@ Set once per request by the middleware in `cat.startup`; each asyncio Task gets
 its own copy, so concurrent requests never see each other's user or stream
 callback. Importing builds nothing — `ctx()` resolves the current request lazily.
 
+The user is authenticated lazily too: the middleware leaves an `authenticator`
+on the context, and the first `await ctx().get_user()` — the auth dependency
+behind core routes and plugin endpoints — runs it and keeps the result for the
+rest of the request. Public core routes and static files never pay for
+authentication.
+
 `from cat import user` binds a live proxy that resolves the current request's
-user on every access. The process-wide CheshireCat handle lives in `cat.ambient.runtime`.
+user, through `get_user()`, on every access. The process-wide CheshireCat handle lives in `cat.ambient.runtime`.
 """
 
+import asyncio
+import inspect
 from contextlib import contextmanager
 from contextvars import ContextVar, Token
-from dataclasses import dataclass
-from typing import Callable, TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from fastapi import Request
@@ -27,7 +35,22 @@ class Ctx:
     user: "User | None"
     request: "Request | None" = None
     stream: Callable | None = None
+    # pending authentication of `request`; run once by `get_user()`
+    authenticator: "Callable[[], Awaitable[User | None]] | None" = None
     # working_memory intentionally omitted — out of scope for this change.
+    _auth_lock: asyncio.Lock = field(
+        default_factory=asyncio.Lock, init=False, repr=False, compare=False
+    )
+
+    async def get_user(self) -> "User | None":
+        """The user of the request, authenticated on first call. Concurrent
+        first calls wait for the same authentication."""
+        if self.authenticator is not None:
+            async with self._auth_lock:
+                if self.authenticator is not None:
+                    user = await self.authenticator()
+                    self.user, self.authenticator = user, None
+        return self.user
 
 
 _ctx: ContextVar["Ctx | None"] = ContextVar("cat_ctx", default=None)
@@ -71,6 +94,12 @@ class _UserProxy:
     `from cat import user` binds this once; every attribute read resolves the
     user of whatever request is currently on the event loop. Reading it outside
     a request raises a clear error rather than returning shared/stale state.
+
+    Plugin endpoints and gated routes authenticate before running, so the user
+    is known by the time they read it. Where it is not yet (a core route
+    without auth dependency), the async methods (`user.save(...)`, ...)
+    authenticate first through `Ctx.get_user()`; plain attributes need an
+    `await ctx().get_user()` before.
     """
 
     def _user(self) -> "User":
@@ -81,7 +110,22 @@ class _UserProxy:
             )
         return user
 
+    async def _resolve(self) -> "User":
+        await ctx().get_user()
+        return self._user()
+
     def __getattr__(self, name):
+        from cat.auth.user import User
+
+        if ctx().authenticator is not None:
+            if inspect.iscoroutinefunction(getattr(User, name, None)):
+                async def method(*args, **kwargs):
+                    return await getattr(await self._resolve(), name)(*args, **kwargs)
+                return method
+            raise RuntimeError(
+                "The user of this request is not authenticated yet: "
+                "`await ctx().get_user()` before reading `user`."
+            )
         return getattr(self._user(), name)
 
     def __repr__(self):
@@ -1,9 +1,9 @@
 """
 Ambient utilities to avoid deeply nested objects.
 
-The actions you *call*: `llm`, `embedder`, `hook`, `execute_hook`, `agui_event`,
-`call_agent`. (The ambient *nouns* you read — `user`, `plugin` — live in
-`cat.ambient.context_vars` and `cat.ambient.runtime`.)
+The actions you *call*: `llm`, `embedder`, `embedder_many`, `hook`,
+`execute_hook`, `agui_event`, `call_agent`. (The ambient *nouns* you read —
+`user`, `plugin` — live in `cat.ambient.context_vars` and `cat.ambient.runtime`.)
 
 `from cat import llm, embedder, hook` binds *names to functions*.
 Importing builds nothing; each function resolves the configured implementation
@@ -16,12 +16,14 @@ Streaming is sourced from the request context (`ctx().stream`), never from a
 """
 
 import time
-from uuid import uuid4
 from typing import TYPE_CHECKING
 
 from cat.ambient.context_vars import ctx
 from cat.ambient.runtime import ccat
+from cat.db.embeddings import embedding_cache
+from cat import config
 from cat.protocols.agui import events
+from cat.protocols.agui.coalescing import TextMessageCoalescer
 
 if TYPE_CHECKING:
     from cat.types import Message, Task, TaskResult
@@ -58,7 +60,9 @@ def _split_slug(slug: str) -> tuple[str, str]:
     return provider_slug, model_slug
 
 
-async def _default_model_slug(field: str) -> str:
+async def default_model_slug(field: str) -> str:
+    """The "provider:model" configured in the core settings `field`, e.g.
+    `default_llm` or `default_embedder`."""
     core = await ccat().get("config", "core")
     settings = await core.load_settings()
     return getattr(settings, field)
@@ -78,7 +82,7 @@ async def llm(
     `model="provider:model"`. Streams tokens to the current client via the
     request context's stream callback.
     """
-    slug = model or await _default_model_slug("default_llm")
+    slug = model or await default_model_slug("default_llm")
     provider_slug, model_slug = _split_slug(slug)
     provider = await ccat().get("model_providers", provider_slug, raise_error=True)
 
@@ -92,24 +96,18 @@ async def llm(
         messages = [Message(role="user", content=[TextContent(text=system_prompt)])]
         system_prompt = ""
 
-    # Stream text tokens as AGUI events.
+    # Stream text tokens as AGUI events, coalesced into time/size bounded
+    # batches (see config.STREAM_FLUSH_MS / STREAM_FLUSH_BYTES).
     on_token = None
-    text_started = False
+    text = None
     if stream:
-        async def on_token(token: str):
-            nonlocal text_started
-            if not token:
-                return
-            if not text_started:
-                await agui_event(events.TextMessageStartEvent(
-                    message_id=str(uuid4()), timestamp=int(time.time())
-                ))
-                text_started = True
-            await agui_event(events.TextMessageContentEvent(
-                message_id=str(uuid4()), delta=token, timestamp=int(time.time())
-            ))
+        text = TextMessageCoalescer(agui_event)
+        on_token = text.push
 
     async def on_tool_call(tool_call):
+        # text streamed before the call goes out before it
+        if text is not None:
+            await text.flush()
         await agui_event(events.ToolCallStartEvent(
             timestamp=int(time.time()),
             tool_call_id=str(tool_call.id),
@@ -126,33 +124,58 @@ async def llm(
             tool_call_id=str(tool_call.id),
         ))
 
-    result = await provider.llm(
-        model_slug, messages, system_prompt, tools, on_token, on_tool_call
-    )
-
-    if text_started:
-        await agui_event(events.TextMessageEndEvent(
-            message_id=str(uuid4()), timestamp=int(time.time())
-        ))
-
-    return result
+    try:
+        return await provider.llm(
+            model_slug, messages, system_prompt, tools, on_token, on_tool_call
+        )
+    finally:
+        # also on errors: no timer left to flush into an ended stream
+        if text is not None:
+            await text.close()
 
 
 async def embedder(text: str, model: str | None = None) -> list[float]:
     """Embed text with the configured embedder (or an explicit `model=`)."""
-    slug = model or await _default_model_slug("default_embedder")
+    vectors = await embedder_many([text], model=model)
+    return vectors[0]
+
+
+async def embedder_many(texts: list[str], model: str | None = None) -> list[list[float]]:
+    """Embed several texts at once, one vector per text, in order.
+
+    Prefer this over a loop of `embedder()` calls: providers with a batch API
+    embed many texts per request. Vectors already in the embedding cache
+    (`cat.db.embeddings`) are not recomputed.
+    """
+    slug = model or await default_model_slug("default_embedder")
     provider_slug, model_slug = _split_slug(slug)
     provider = await ccat().get("model_providers", provider_slug, raise_error=True)
-    return await provider.embed(model_slug, text)
+
+    if not config.EMBEDDING_CACHE:
+        if len(texts) == 1:
+            return [await provider.embed(model_slug, texts[0])]
+        return await provider.embed_many(model_slug, texts)
+
+    vectors = await embedding_cache.get_many(provider_slug, model_slug, texts)
+    missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+    if missing:
+        if len(missing) == 1:
+            computed = [await provider.embed(model_slug, missing[0])]
+        else:
+            computed = await provider.embed_many(model_slug, missing)
+        await embedding_cache.put_many(provider_slug, model_slug, missing, computed)
+        by_text = dict(zip(missing, computed))
+        vectors = [by_text[t] if v is None else v for t, v in zip(texts, vectors)]
+    return vectors
 
 
 # ---------------------------------------------------------------------------
 # Auth — framework plumbing, not a plugin-facing capability.
 #
-# `auth()` is what the request-context middleware calls once per request to
-# populate `ctx().user` (see cat.startup). It is intentionally NOT exported from
-# the `cat` front door: plugins read the already-authenticated `user`, they do
-# not re-run authentication. Imported as `from cat.ambient import auth`.
+# `auth()` is what the request context runs, on first need, to populate
+# `ctx().user` (see cat.startup and `Ctx.get_user`). It is intentionally NOT
+# exported from the `cat` front door: plugins read the already-authenticated
+# `user`, they do not re-run authentication. Imported as `from cat.ambient import auth`.
 # ---------------------------------------------------------------------------
 
 async def auth(request, role: str | None = None) -> "User | None":
@@ -161,9 +184,12 @@ async def auth(request, role: str | None = None) -> "User | None":
     first `User` produced. Optionally enforce a role.
     """
     from cat.auth.user import User
+    from cat.auth.cache import auth_cache
 
-    handlers = await ccat().get_all("auths")
-    for handler in handlers.values():
+    # the chain only changes with the registry (which clears it)
+    if auth_cache.handlers is None:
+        auth_cache.handlers = list((await ccat().get_all("auths")).values())
+    for handler in auth_cache.handlers:
         candidate = await handler.authenticate(request)
         if candidate and isinstance(candidate, User):
             if role and not candidate.has_role(role):
@@ -0,0 +1,179 @@
+"""
+Per-user API keys, for integrations and services acting as a user.
+
+A key reads `ccat_<prefix>_<secret>`. The prefix is public and unique: it
+finds the key's row through an index, without scanning. Only a bcrypt hash
+of the secret is stored, so the key itself is shown once, at creation.
+
+Verifying a key not seen recently costs that one indexed query and one bcrypt
+check (in a thread, off the event loop). Verified keys are kept in the auth
+cache (`cat.auth.cache`), so later requests with the same key cost a hash
+lookup. Deleting a key drops its user's cached credentials, in every worker.
+
+Wrong secrets for a known prefix are remembered for
+`config.API_KEY_FAILURE_TTL` seconds, and at most `config.API_KEY_CHECKS`
+bcrypt checks run at once, so a flood of bad keys cannot fill the thread pool.
+
+A key keeps the roles it was created with: changing the roles of its user does
+not change the key. Delete the user's keys (`delete_user_keys`) to apply them.
+
+The master `config.API_KEY` is separate and keeps working (see `Auth`).
+"""
+
+import asyncio
+import hashlib
+import secrets
+import sqlite3
+from typing import List
+from uuid import UUID
+from weakref import WeakKeyDictionary
+
+import asyncpg
+import bcrypt
+from cachetools import TTLCache
+
+from cat.auth.cache import auth_cache
+from cat.auth.user import User
+from cat.db.models import ApiKeyDB
+from cat import config
+
+
+PREFIX = "ccat"
+PREFIX_BYTES = 6   # 8 characters
+SECRET_BYTES = 24  # 32 characters
+
+# Auth cache namespace of verified keys.
+CACHE_HANDLER = "api_keys"
+
+# SHA-256 of keys that failed the bcrypt check recently.
+failures = TTLCache(maxsize=config.AUTH_CACHE_SIZE, ttl=config.API_KEY_FAILURE_TTL)
+
+# New prefixes tried when the ones drawn are taken.
+CREATE_ATTEMPTS = 3
+
+# What saving a key with a taken prefix fails with.
+UNIQUE_ERRORS = (sqlite3.IntegrityError, asyncpg.UniqueViolationError)
+
+# Semaphores bounding the bcrypt checks running at once, one per event loop
+# (a semaphore is bound to the loop it is first used on).
+_checks: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def checks() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _checks.get(loop)
+    if semaphore is None:
+        semaphore = _checks[loop] = asyncio.Semaphore(config.API_KEY_CHECKS)
+    return semaphore
+
+
+def _new_prefix() -> str:
+    return secrets.token_urlsafe(PREFIX_BYTES).replace("_", "-")
+
+
+def _parse(key: str) -> tuple[str, str] | None:
+    """Split a key into (prefix, secret), or None if it is not an API key."""
+    parts = key.split("_", 2)
+    if len(parts) != 3 or parts[0] != PREFIX or not parts[1] or not parts[2]:
+        return None
+    return parts[1], parts[2]
+
+
+class ApiKeys:
+    """Create, list, verify and delete per-user API keys."""
+
+    @staticmethod
+    async def create(user: User, name: str, roles: List[str] | None = None) -> tuple[str, dict]:
+        """New key for `user`, granting `roles` (default: all of the user's).
+        Returns the key, which is not stored, and its record."""
+        secret = secrets.token_urlsafe(SECRET_BYTES)
+        hashed = await asyncio.to_thread(
+            bcrypt.hashpw, secret.encode(), bcrypt.gensalt(config.API_KEY_BCRYPT_ROUNDS)
+        )
+        for attempt in range(CREATE_ATTEMPTS):
+            row = ApiKeyDB(
+                prefix=_new_prefix(),
+                hash=hashed.decode(),
+                name=name,
+                user_id=user.id,
+                user_name=user.name,
+                roles=list(user.roles if roles is None else roles),
+            )
+            try:
+                await row.save()
+                break
+            except UNIQUE_ERRORS:
+                # the prefix is taken: draw another one
+                if attempt == CREATE_ATTEMPTS - 1:
+                    raise
+        return f"{PREFIX}_{row.prefix}_{secret}", ApiKeys._record(row.to_dict())
+
+    @staticmethod
+    async def verify(key: str) -> User | None:
+        """The user `key` acts as, or None if it is not a valid key."""
+        parsed = _parse(key)
+        if parsed is None:
+            return None
+        cached = auth_cache.get(CACHE_HANDLER, key)
+        if cached is not None:
+            return cached
+
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        if digest in failures:
+            return None
+
+        prefix, secret = parsed
+        row = await ApiKeyDB.select(
+            ApiKeyDB.hash, ApiKeyDB.user_id, ApiKeyDB.user_name, ApiKeyDB.roles
+        ).where(ApiKeyDB.prefix == prefix).first().output(load_json=True)
+        if row is None:
+            return None
+        async with checks():
+            valid = await asyncio.to_thread(
+                bcrypt.checkpw, secret.encode(), row["hash"].encode()
+            )
+        if not valid:
+            failures[digest] = True
+            return None
+
+        user = User(id=row["user_id"], name=row["user_name"], roles=row["roles"])
+        auth_cache.put(CACHE_HANDLER, key, user)
+        return user
+
+    @staticmethod
+    async def list(user_id: UUID) -> List[dict]:
+        rows = await ApiKeyDB.select(
+            ApiKeyDB.id, ApiKeyDB.prefix, ApiKeyDB.name, ApiKeyDB.roles, ApiKeyDB.created_at
+        ).where(ApiKeyDB.user_id == user_id).order_by(ApiKeyDB.created_at).output(load_json=True)
+        return [ApiKeys._record(r) for r in rows]
+
+    @staticmethod
+    async def delete(user_id: UUID, key_id: UUID) -> bool:
+        """Delete a key of the user; False if there is no such key."""
+        deleted = await ApiKeyDB.delete().where(
+            (ApiKeyDB.id == key_id) & (ApiKeyDB.user_id == user_id)
+        ).returning(ApiKeyDB.id)
+        if deleted:
+            await auth_cache.revoke_user(user_id)
+        return bool(deleted)
+
+    @staticmethod
+    async def delete_user_keys(user_id: UUID) -> int:
+        """Delete every key of a user; returns how many there were."""
+        deleted = await ApiKeyDB.delete().where(
+            ApiKeyDB.user_id == user_id
+        ).returning(ApiKeyDB.id)
+        if deleted:
+            await auth_cache.revoke_user(user_id)
+        return len(deleted)
+
+    @staticmethod
+    def _record(row: dict) -> dict:
+        """What may be shown of a key: never its hash."""
+        return {
+            "id": row["id"],
+            "prefix": f"{PREFIX}_{row['prefix']}",
+            "name": row["name"],
+            "roles": row["roles"],
+            "created_at": row["created_at"],
+        }
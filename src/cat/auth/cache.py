@@ -0,0 +1,98 @@
+"""
+Verified-credential cache: the fast path of per-request authentication.
+
+Every request carries a credential (a JWT or a key) that the auth handlers
+verify; verifying the same token again on each request costs a signature
+check (or a key lookup) and a new `User`. `AuthCache` remembers the user a
+handler verified a credential as:
+
+- keyed by handler slug and the SHA-256 of the credential (the credential
+  itself is never kept);
+- a bounded LRU of `config.AUTH_CACHE_SIZE` entries;
+- an entry expires with its token (`exp`), and after `config.AUTH_CACHE_TTL`
+  seconds at most, so revoked keys and changed roles are picked up;
+- `revoke()` / `revoke_user()` drop entries here and, through the change bus,
+  in the other workers. Registry refreshes that change the auth handlers (and
+  settings saves of auth handlers) clear everything.
+
+It also keeps the auth handler chain, so requests do not rebuild it from the
+registry. The cache keeps its own copy of a user, and each lookup returns
+another one, so a request changing its user does not leak into the next ones.
+"""
+
+import hashlib
+import time
+from typing import List
+from uuid import UUID
+
+from cachetools import LRUCache
+
+from cat.auth.user import User
+from cat import config
+
+
+class AuthCache:
+
+    def __init__(self):
+        self._entries = LRUCache(maxsize=config.AUTH_CACHE_SIZE)
+        self.handlers: List | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(handler: str, credential: str) -> tuple[str, str]:
+        return (handler, hashlib.sha256(credential.encode()).hexdigest())
+
+    def get(self, handler: str, credential: str) -> User | None:
+        key = self._key(handler, credential)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, user = entry
+            if time.time() < expires:
+                self.hits += 1
+                return user.model_copy(deep=True)
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(
+        self, handler: str, credential: str, user: User, expires: float | None = None
+    ) -> None:
+        """Remember `user` for `credential` until `expires` (a timestamp, e.g.
+        the JWT `exp`), capped at `config.AUTH_CACHE_TTL` seconds."""
+        ttl = config.AUTH_CACHE_TTL
+        if not ttl:
+            return
+        deadline = time.time() + ttl
+        if expires is not None:
+            deadline = min(deadline, expires)
+        # the caller keeps `user`: it may change it after putting it here
+        self._entries[self._key(handler, credential)] = (deadline, user.model_copy(deep=True))
+
+    async def revoke(self, credential: str) -> None:
+        """Forget a credential (all handlers), here and in the other workers."""
+        digest = hashlib.sha256(credential.encode()).hexdigest()
+        for key in [k for k in self._entries if k[1] == digest]:
+            del self._entries[key]
+        await self._announce()
+
+    async def revoke_user(self, user_id: UUID | str) -> None:
+        """Forget every credential of a user, e.g. after a role change."""
+        user_id = str(user_id)
+        for key in [k for k, (_, u) in self._entries.items() if str(u.id) == user_id]:
+            del self._entries[key]
+        await self._announce()
+
+    async def _announce(self) -> None:
+        from cat.looking_glass.change_bus import change_bus
+        await change_bus.publish("auth")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.handlers = None
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+auth_cache = AuthCache()
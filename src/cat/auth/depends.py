@@ -24,9 +24,10 @@ def _get_user(role: "str | list[str] | None" = None) -> Depends:
         async def stuff():
             return {"hi": user.name}
 
-    Both paths share one source of truth: the user is authenticated once per
-    request by the context middleware and stored in the request context; this
-    dependency just reads it and optionally enforces a role. The `role=` kwarg on
+    Both paths share one source of truth: the request context. The user is
+    authenticated on the first call of this dependency in a request (the
+    context middleware only leaves the authenticator there), kept in the
+    context, and a role is optionally enforced. The `role=` kwarg on
     `@endpoint` injects exactly this dependency under the hood.
 
     Parameters
@@ -50,8 +51,8 @@ def _get_user(role: "str | list[str] | None" = None) -> Depends:
     else:
         required = list(role)
 
-    def current_user() -> User:
-        user = ctx().user
+    async def current_user() -> User:
+        user = await ctx().get_user()
         if user is None:
             raise HTTPException(status_code=403, detail="Invalid Credentials")
         if required and not user.has_role(*required):
@@ -59,3 +60,21 @@ def _get_user(role: "str | list[str] | None" = None) -> Depends:
         return user
 
     return Depends(current_user)
+
+
+def _resolve_user() -> Depends:
+    """
+    Best-effort twin of `_get_user`, for plugin endpoints without `role=`:
+    authenticates the request (if it carries a credential) so the ambient
+    `user` can be read there, but lets anonymous callers through.
+
+    Returns
+    -------
+    Depends
+        Resolves to the authenticated User, or None.
+    """
+
+    async def current_user() -> User | None:
+        return await ctx().get_user()
+
+    return Depends(current_user)
@@ -11,8 +11,12 @@ class JWTHelper:
     """JWT utility for encoding, decoding, and detecting JWTs."""
 
     def is_jwt(self, token: str) -> bool:
+        """Whether `token` is shaped like a JWT. Only the header is parsed:
+        the payload is decoded once, when verified by `decode`."""
+        if token.count(".") != 2:
+            return False
         try:
-            jwt.decode(token, options={"verify_signature": False})
+            jwt.get_unverified_header(token)
             return True
         except InvalidTokenError:
             return False
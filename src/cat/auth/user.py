@@ -1,4 +1,4 @@
-from typing import List, Any
+from typing import Dict, Iterable, List, Any
 from uuid import UUID
 from pydantic import BaseModel, field_validator
 
@@ -131,4 +131,77 @@ class User(BaseModel):
         bool
             True if a value was removed, False if the key was unset.
         """
-        return await UserStore.delete(self.id, key)
\ No newline at end of file
+        return await UserStore.delete(self.id, key)
+
+    async def keys(self, prefix: str = "") -> List[str]:
+        """
+        List the keys of this user starting with `prefix`, most recently
+        saved first.
+
+        Parameters
+        ----------
+        prefix : str
+            Only keys starting with it are listed; empty for all of them.
+
+        Returns
+        -------
+        List[str]
+            The matching keys.
+
+        Examples
+        --------
+        >>> await user.keys("todo")
+        ["todos", "todo_settings"]
+        """
+        return await UserStore.keys(self.id, prefix)
+
+    async def load_many(self, keys: Iterable[str], default: Any = None) -> Dict[str, Any]:
+        """
+        Load several values scoped to this user with one query.
+
+        Parameters
+        ----------
+        keys : Iterable[str]
+            The keys to read.
+        default : Any
+            Value reported for keys that are not set.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Every requested key mapped to its value, or to `default`.
+
+        Examples
+        --------
+        >>> await user.load_many(["todos", "theme"])
+        {"todos": [{"text": "buy milk", "done": False}], "theme": None}
+        """
+        return await UserStore.load_many(self.id, keys, default)
+
+    async def save_many(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Save several values scoped to this user (each a full replacement) with
+        one statement.
+
+        Parameters
+        ----------
+        values : Dict[str, Any]
+            Keys mapped to any JSON-serializable values.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The saved mapping.
+        """
+        return await UserStore.save_many(self.id, values)
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete several user-scoped keys with one query.
+
+        Returns
+        -------
+        int
+            How many keys were set and are now removed.
+        """
+        return await UserStore.delete_many(self.id, keys)
@@ -4,6 +4,8 @@ from cat.services.model_providers.base import ModelProvider
 from cat.services.model_providers.openai_compatible import OpenAICompatibleProvider
 from cat.services.directives.base import Directive
 from cat.services.agents.base import Agent
+from cat.services.vector_indexes.base import VectorIndex, VectorHit
+from cat.services.threads.base import Threads
 
 __all__ = [
     "Service",
@@ -12,4 +14,7 @@ __all__ = [
     "OpenAICompatibleProvider",
     "Directive",
     "Agent",
+    "VectorIndex",
+    "VectorHit",
+    "Threads",
 ]
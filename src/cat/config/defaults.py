@@ -23,13 +23,36 @@ SQL = "sqlite:///data/core/core.db"
 # Setting it to None disables key auth entirely (JWT-only; no open gate).
 API_KEY = "meow"
 
+# bcrypt cost of per-user API keys (see `cat.auth.api_keys`). At most
+# API_KEY_CHECKS bcrypt checks run at once, and a wrong key is rejected without
+# checking again for API_KEY_FAILURE_TTL seconds.
+API_KEY_BCRYPT_ROUNDS = 12
+API_KEY_CHECKS = 4
+API_KEY_FAILURE_TTL = 60
+
 # JWT signing secret and token lifetime (in minutes).
 JWT_SECRET = "meow_jwt"
 JWT_EXPIRE_MINUTES = 60 * 24  # 1 day
 
+# Verified credentials (JWTs, keys) are cached per token, AUTH_CACHE_SIZE of
+# them, until the token expires or for AUTH_CACHE_TTL seconds at most (0: off).
+AUTH_CACHE_SIZE = 10_000
+AUTH_CACHE_TTL = 300
+
 # Self-reload during development (turn off in production).
 DEBUG = True
 
+# Worker processes serving the API. With more than one, the app and the active
+# plugins are imported once before forking, and workers tell each other about
+# plugin, store and settings changes through the database, checked every
+# CHANGE_BUS_POLL seconds on SQLite (Postgres pushes them with NOTIFY, also to
+# other deployments on the same database), where the last CHANGE_LOG_SIZE
+# changes are kept for the workers to read.
+# Self-reload (DEBUG) only works with a single worker.
+WORKERS = 1
+CHANGE_BUS_POLL = 1.0
+CHANGE_LOG_SIZE = 1000
+
 # Log level: DEBUG | INFO | WARNING | ERROR | CRITICAL
 LOG_LEVEL = "INFO"
 
@@ -50,5 +73,66 @@ CORS_ALLOWED_ORIGINS = "*"
 DEFAULT_LLM = "default:default"
 DEFAULT_EMBEDDER = "default:default"
 
+# Streaming: LLM text deltas are coalesced before being sent to the client, so
+# a fast model produces a few events per second instead of one per token. A
+# batch is flushed after STREAM_FLUSH_MS milliseconds (by a timer, also when no
+# further token arrives) or STREAM_FLUSH_BYTES bytes, whichever comes first.
+# Set STREAM_FLUSH_MS = 0 to send every token.
+STREAM_FLUSH_MS = 50
+STREAM_FLUSH_BYTES = 512
+
+# Max events buffered per streaming connection, and what to do when a slow
+# client lets the buffer fill up: "block" (slow down the agent), "drop_oldest"
+# or "coalesce" (merge text deltas, block for anything else).
+STREAM_QUEUE_SIZE = 1000
+STREAM_OVERFLOW = "block"
+
+# Service settings are cached in memory after the first read and invalidated
+# when saved. With several worker processes on one DB, a worker may serve stale
+# settings saved by another for at most this many seconds (None: no expiry).
+SETTINGS_CACHE_TTL = 60
+
+# Global store cache: values read with `store.load()` are kept in memory (up to
+# STORE_CACHE_SIZE keys) for STORE_CACHE_TTL seconds (None: until changed).
+# Writes of other workers reach it with the other changes (see WORKERS).
+STORE_CACHE = True
+STORE_CACHE_SIZE = 1000
+STORE_CACHE_TTL = 300
+
+# Embedding cache: vectors are cached by (provider, model, text hash) in memory
+# (an LRU of EMBEDDING_CACHE_SIZE entries) and in the database, so the same
+# text is never sent twice to the embedder. Set EMBEDDING_CACHE = False to
+# always call the provider.
+EMBEDDING_CACHE = True
+EMBEDDING_CACHE_SIZE = 10_000
+
+# Context window: agents trim the conversation sent to the LLM to the context
+# window of the model (known models have theirs, others get CONTEXT_WINDOW
+# tokens), keeping CONTEXT_RESERVE tokens free for the reply.
+CONTEXT_WINDOW = 32_000
+CONTEXT_RESERVE = 4_000
+
+# Conversation summaries (the `summary` directive) are stored per user for the
+# SUMMARY_LIMIT most recently summarized conversations; older ones are deleted.
+SUMMARY_LIMIT = 100
+
+# Server-side threads: the histories of the THREAD_CACHE_SIZE most recently
+# used threads are kept in memory for THREAD_CACHE_TTL seconds, so a turn only
+# reads storage when its thread went cold.
+THREAD_CACHE_SIZE = 256
+THREAD_CACHE_TTL = 600
+
+# MCP sessions are kept open per user and per server and reused across runs:
+# idle ones are pinged every MCP_KEEPALIVE seconds (and reopened if they do not
+# answer), closed after MCP_IDLE_TIMEOUT seconds without use, and run at most
+# MCP_SESSION_CONCURRENCY requests at once.
+MCP_KEEPALIVE = 30
+MCP_IDLE_TIMEOUT = 600
+MCP_SESSION_CONCURRENCY = 8
+
+# Tool listings of MCP servers are cached per server configuration for
+# MCP_TOOLS_CACHE_TTL seconds, or until the server notifies a change.
+MCP_TOOLS_CACHE_TTL = 300
+
 # Anonymous telemetry.
 TELEMETRY = True
@@ -1,5 +1,6 @@
 from cat.db.helper import Store, UserStore
-from cat.db.models import KeyValueDB, UserKeyValueDB, UserScopedDB
+from cat.db.models import KeyValueDB, UserKeyValueDB, UserScopedDB, EmbeddingDB
+from cat.db.embeddings import EmbeddingCache, embedding_cache
 
 # Ambient global key-value store. `Store` is just static methods (no request
 # context), so the lowercase ambient name is the class itself — no proxy needed,
@@ -13,4 +14,7 @@ __all__ = [
     "KeyValueDB",
     "UserKeyValueDB",
     "UserScopedDB",
+    "EmbeddingDB",
+    "EmbeddingCache",
+    "embedding_cache",
 ]
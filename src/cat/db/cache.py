@@ -0,0 +1,107 @@
+"""Read-through cache of the global key-value store (`cat.db.Store`).
+
+Keys like `active_plugins` and the service settings blobs are read far more
+often than they are written, so `Store` keeps the stored JSON text of recently
+read keys in memory (unset keys too) and only queries the DB on a miss or
+after the entry expired. Hits decode the text again, so callers always get
+fresh objects they may mutate.
+
+Every `save`/`delete` invalidates the key locally and announces the change to
+the other workers sharing the database on the change bus
+(`cat.looking_glass.change_bus`), as a `store:<key>` topic: they drop the key
+from their cache when they receive it.
+
+Entries also expire after a TTL (`config.STORE_CACHE_TTL`, or per read with
+`store.load(key, ttl=...)`), which bounds staleness if a change notification is
+lost, e.g. while the listening connection reconnects.
+"""
+
+import time
+
+from cachetools import LRUCache
+
+from cat import config
+
+
+# `get()` result for a key with no usable entry.
+MISS = object()
+
+
+class StoreCache:
+    """
+    Bounded LRU of stored JSON text (None for unset keys), keyed by store key.
+
+    Like `SettingsCache`, each key carries a version bumped by every
+    invalidation, so a read that raced with a write does not cache the value
+    it read before the write.
+    """
+
+    def __init__(self, maxsize: int | None = None):
+        self._entries = LRUCache(
+            maxsize=config.STORE_CACHE_SIZE if maxsize is None else maxsize
+        )
+        self._versions: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(config.STORE_CACHE)
+
+    def version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def get(self, key: str):
+        """Cached JSON text for `key` (None if cached as unset), or `MISS`."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            version, expires, raw = entry
+            if version == self.version(key) and time.monotonic() < expires:
+                self.hits += 1
+                return raw
+            del self._entries[key]
+        self.misses += 1
+        return MISS
+
+    def put(self, key: str, version: int, raw, ttl: float | None = None) -> None:
+        """Cache `raw`, read at `version`, unless the key changed meanwhile.
+        `ttl` overrides `config.STORE_CACHE_TTL`; 0 does not cache at all."""
+        if version != self.version(key):
+            return
+        ttl = config.STORE_CACHE_TTL if ttl is None else ttl
+        if ttl == 0:
+            return
+        expires = float("inf") if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (version, expires, raw)
+
+    def invalidate(self, key: str) -> None:
+        self._versions[key] = self.version(key) + 1
+        self._entries.pop(key, None)
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. when the database itself was swapped)."""
+        for key in set(self._entries) | set(self._versions):
+            self.invalidate(key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+    async def changed(self, keys: list[str]) -> None:
+        """Invalidate `keys` here and in every other worker."""
+        from cat.looking_glass.change_bus import change_bus
+
+        for key in keys:
+            self.invalidate(key)
+        await change_bus.publish(*(f"store:{key}" for key in keys))
+
+
+store_cache = StoreCache()
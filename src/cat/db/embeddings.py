@@ -0,0 +1,136 @@
+"""Two-tier, content-addressed embedding cache.
+
+Embedding the same text with the same model always gives the same vector, so
+`embedder()` / `embedder_many()` look vectors up here before calling the
+provider:
+
+1. an in-process LRU (`config.EMBEDDING_CACHE_SIZE` entries), then
+2. the `ccat_embedding_cache` table, shared by every worker and kept across
+   restarts, storing vectors as packed float32 bytes.
+
+Entries are keyed by `provider:model:sha256(text)`. Vectors read back from the
+DB tier are float32, i.e. rounded to ~7 significant digits.
+"""
+
+import hashlib
+from array import array
+
+from cachetools import LRUCache
+
+from cat.db.models import EmbeddingDB
+from cat import config
+
+
+# Rows per query, to stay well below SQLite's bound-parameter limit.
+CHUNK_SIZE = 250
+
+
+def pack_vector(vector: list[float]) -> bytes:
+    """Serialize a vector as packed float32 bytes."""
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(raw: bytes) -> list[float]:
+    """Inverse of `pack_vector`."""
+    vector = array("f")
+    vector.frombytes(raw)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """In-memory LRU in front of the persistent `EmbeddingDB` table.
+
+    Exposed as the process-wide `embedding_cache`; hit counters are kept per
+    tier so `stats()` can report where lookups were served from.
+    """
+
+    def __init__(self, maxsize: int | None = None):
+        self.memory = LRUCache(
+            maxsize=config.EMBEDDING_CACHE_SIZE if maxsize is None else maxsize
+        )
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(provider: str, model: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{provider}:{model}:{digest}"
+
+    async def get_many(
+        self, provider: str, model: str, texts: list[str]
+    ) -> list[list[float] | None]:
+        """Cached vectors for `texts`, in order; None where nothing is cached."""
+        keys = [self.key(provider, model, t) for t in texts]
+        vectors = [self.memory.get(k) for k in keys]
+
+        missing = [k for k, v in zip(keys, vectors) if v is None]
+        self.memory_hits += len(keys) - len(missing)
+        if not missing:
+            return vectors
+
+        found = {}
+        missing = list(set(missing))
+        for i in range(0, len(missing), CHUNK_SIZE):
+            rows = await EmbeddingDB.select(EmbeddingDB.key, EmbeddingDB.vector).where(
+                EmbeddingDB.key.is_in(missing[i:i + CHUNK_SIZE])
+            )
+            found.update({r["key"]: unpack_vector(r["vector"]) for r in rows})
+        for k, v in found.items():
+            self.memory[k] = v
+
+        for i, k in enumerate(keys):
+            if vectors[i] is None:
+                vectors[i] = found.get(k)
+                if vectors[i] is None:
+                    self.misses += 1
+                else:
+                    self.db_hits += 1
+        return vectors
+
+    async def put_many(
+        self, provider: str, model: str, texts: list[str], vectors: list[list[float]]
+    ) -> None:
+        """Store freshly computed vectors in both tiers."""
+        rows = {}
+        for text, vector in zip(texts, vectors):
+            k = self.key(provider, model, text)
+            self.memory[k] = vector
+            rows[k] = EmbeddingDB(
+                key=k, provider=provider, model=model, vector=pack_vector(vector)
+            )
+        rows = list(rows.values())
+        for i in range(0, len(rows), CHUNK_SIZE):
+            await EmbeddingDB.insert(*rows[i:i + CHUNK_SIZE]).on_conflict(
+                action="DO NOTHING"
+            )
+
+    async def purge(self, provider: str | None = None, model: str | None = None) -> int:
+        """Drop cached vectors (all, or one provider's / model's). Returns the
+        number of rows removed from the DB tier."""
+        query = EmbeddingDB.delete(force=True)
+        if provider is not None:
+            query = query.where(EmbeddingDB.provider == provider)
+        if model is not None:
+            query = query.where(EmbeddingDB.model == model)
+        deleted = await query.returning(EmbeddingDB.key)
+
+        if provider is None and model is None:
+            self.memory.clear()
+        else:
+            for row in deleted:
+                self.memory.pop(row["key"], None)
+        return len(deleted)
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            "size": len(self.memory),
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.db_hits) / lookups if lookups else 0.0,
+        }
+
+
+embedding_cache = EmbeddingCache()
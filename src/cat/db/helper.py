@@ -12,10 +12,21 @@ and non-string dict keys come back as strings.
 """
 
 import json
-from typing import Any
+from typing import Any, Dict, Iterable, List
 from uuid import UUID
 
 from cat.db.models import KeyValueDB, UserKeyValueDB
+from cat.db.cache import store_cache, MISS
+
+
+# Rows per statement of the bulk verbs: SQLite caps the bound variables of a
+# statement (999 on older builds), so long key lists are sent in chunks.
+CHUNK_SIZE = 500
+
+
+def _chunks(items: List) -> Iterable[List]:
+    for start in range(0, len(items), CHUNK_SIZE):
+        yield items[start:start + CHUNK_SIZE]
 
 
 def _encode(value: Any) -> str:
@@ -50,9 +61,47 @@ class Store:
         await store.save("theme", {"color": "dark"})
         theme = await store.load("theme")   # {"color": "dark"} or None
 
-    Abstracts away Piccolo queries on the `ccat_global_key_value` table.
+    Abstracts away Piccolo queries on the `ccat_global_key_value` table. Reads
+    go through the in-process `store_cache` (see `cat.db.cache`), which every
+    write invalidates, here and in the other workers.
     """
 
+    cache = store_cache
+
+    @staticmethod
+    async def _read(keys: List[str], ttl: float | None = None) -> Dict[str, Any]:
+        """Stored JSON text of `keys` (None where unset), through the cache."""
+        cache = store_cache if store_cache.enabled else None
+        raws, misses = {}, keys
+        if cache is not None:
+            misses = []
+            for key in keys:
+                raw = cache.get(key)
+                if raw is MISS:
+                    misses.append(key)
+                else:
+                    raws[key] = raw
+        if not misses:
+            return raws
+
+        versions = {key: cache.version(key) for key in misses} if cache else {}
+        found = {}
+        for chunk in _chunks(misses):
+            rows = await KeyValueDB.select(KeyValueDB.key, KeyValueDB.value).where(
+                KeyValueDB.key == chunk[0] if len(chunk) == 1 else KeyValueDB.key.is_in(chunk)
+            )
+            found.update({r["key"]: r["value"] for r in rows})
+        for key in misses:
+            raws[key] = found.get(key)
+            if cache is not None:
+                cache.put(key, versions[key], raws[key], ttl)
+        return raws
+
+    @staticmethod
+    async def _changed(keys: List[str]) -> None:
+        # announced even with the cache off: other workers refresh settings
+        await store_cache.changed(keys)
+
     @staticmethod
     async def save(key: str, value: Any) -> Any:
         """
@@ -70,17 +119,16 @@ class Store:
         Any
             The saved value (the same object you passed in).
         """
-        payload = _encode(value)
-        db_entry = await KeyValueDB.objects().where(KeyValueDB.key == key).first()
-        if db_entry is None:
-            await KeyValueDB(key=key, value=payload).save()
-        else:
-            db_entry.value = payload
-            await db_entry.save()
+        await KeyValueDB.insert(
+            KeyValueDB(key=key, value=_encode(value))
+        ).on_conflict(
+            target=KeyValueDB.key, action="DO UPDATE", values=[KeyValueDB.value]
+        )
+        await Store._changed([key])
         return value
 
     @staticmethod
-    async def load(key: str, default: Any = None) -> Any:
+    async def load(key: str, default: Any = None, ttl: float | None = None) -> Any:
         """
         Load a value, or return `default` if the key is unset.
 
@@ -90,16 +138,19 @@ class Store:
             The database key.
         default : Any
             Value to return if the key is not found.
+        ttl : float | None
+            Seconds the value may be served from the cache; None uses
+            `config.STORE_CACHE_TTL`, 0 bypasses the cache for this read.
 
         Returns
         -------
         Any
             The stored value (with its original type), or `default`.
         """
-        db_entry = await KeyValueDB.objects().where(KeyValueDB.key == key).first()
-        if db_entry is None:
+        raw = (await Store._read([key], ttl))[key]
+        if raw is None:
             return default
-        return _decode(db_entry.value)
+        return _decode(raw)
 
     @staticmethod
     async def delete(key: str) -> bool:
@@ -111,11 +162,11 @@ class Store:
         bool
             True if a value was removed, False if the key was unset.
         """
-        db_entry = await KeyValueDB.objects().where(KeyValueDB.key == key).first()
-        if db_entry is None:
-            return False
-        await db_entry.remove()
-        return True
+        deleted = await KeyValueDB.delete().where(
+            KeyValueDB.key == key
+        ).returning(KeyValueDB.key)
+        await Store._changed([key])
+        return len(deleted) > 0
 
     @staticmethod
     async def exists(key: str) -> bool:
@@ -127,8 +178,79 @@ class Store:
         bool
             True if the key exists, False otherwise.
         """
-        db_entry = await KeyValueDB.objects().where(KeyValueDB.key == key).first()
-        return db_entry is not None
+        if store_cache.enabled:
+            return (await Store._read([key]))[key] is not None
+        return await KeyValueDB.exists().where(KeyValueDB.key == key)
+
+    @staticmethod
+    async def load_many(
+        keys: Iterable[str], default: Any = None, ttl: float | None = None
+    ) -> Dict[str, Any]:
+        """
+        Load several values with one query per `CHUNK_SIZE` keys (for the keys
+        not in the cache).
+
+        Parameters
+        ----------
+        keys : Iterable[str]
+            The database keys.
+        default : Any
+            Value reported for keys that are not set.
+        ttl : float | None
+            Cache lifetime of the values read, as in `load()`.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Every requested key mapped to its value, or to `default`.
+        """
+        keys = list(dict.fromkeys(keys))
+        raws = await Store._read(keys, ttl) if keys else {}
+        return {
+            key: default if raws[key] is None else _decode(raws[key]) for key in keys
+        }
+
+    @staticmethod
+    async def save_many(values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Save several values (each a full replacement) with one statement per
+        `CHUNK_SIZE` keys.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The saved mapping (the same object you passed in).
+        """
+        if values:
+            for chunk in _chunks(list(values.items())):
+                await KeyValueDB.insert(
+                    *(KeyValueDB(key=k, value=_encode(v)) for k, v in chunk)
+                ).on_conflict(
+                    target=KeyValueDB.key, action="DO UPDATE", values=[KeyValueDB.value]
+                )
+            await Store._changed(list(values))
+        return values
+
+    @staticmethod
+    async def delete_many(keys: Iterable[str]) -> int:
+        """
+        Delete several keys with one query per `CHUNK_SIZE` keys.
+
+        Returns
+        -------
+        int
+            How many keys were set and are now removed.
+        """
+        keys = list(keys)
+        if not keys:
+            return 0
+        deleted = 0
+        for chunk in _chunks(keys):
+            deleted += len(await KeyValueDB.delete().where(
+                KeyValueDB.key.is_in(chunk)
+            ).returning(KeyValueDB.key))
+        await Store._changed(keys)
+        return deleted
 
 
 class UserStore:
@@ -163,15 +285,13 @@ class UserStore:
         Any
             The saved value (the same object you passed in).
         """
-        payload = _encode(value)
-        db_entry = await UserKeyValueDB.objects().where(
-            (UserKeyValueDB.user_id == user_id) & (UserKeyValueDB.key == key)
-        ).first()
-        if db_entry is None:
-            await UserKeyValueDB(user_id=user_id, key=key, value=payload).save()
-        else:
-            db_entry.value = payload
-            await db_entry.save()
+        await UserKeyValueDB.insert(
+            UserKeyValueDB(user_id=user_id, key=key, value=_encode(value))
+        ).on_conflict(
+            target=(UserKeyValueDB.user_id, UserKeyValueDB.key),
+            action="DO UPDATE",
+            values=[UserKeyValueDB.value, UserKeyValueDB.updated_at],
+        )
         return value
 
     @staticmethod
@@ -193,12 +313,12 @@ class UserStore:
         Any
             The stored value (with its original type), or `default`.
         """
-        db_entry = await UserKeyValueDB.objects().where(
+        row = await UserKeyValueDB.select(UserKeyValueDB.value).where(
             (UserKeyValueDB.user_id == user_id) & (UserKeyValueDB.key == key)
         ).first()
-        if db_entry is None:
+        if row is None:
             return default
-        return _decode(db_entry.value)
+        return _decode(row["value"])
 
     @staticmethod
     async def delete(user_id: UUID, key: str) -> bool:
@@ -210,13 +330,10 @@ class UserStore:
         bool
             True if a value was removed, False if the key was unset.
         """
-        db_entry = await UserKeyValueDB.objects().where(
+        deleted = await UserKeyValueDB.delete().where(
             (UserKeyValueDB.user_id == user_id) & (UserKeyValueDB.key == key)
-        ).first()
-        if db_entry is None:
-            return False
-        await db_entry.remove()
-        return True
+        ).returning(UserKeyValueDB.id)
+        return len(deleted) > 0
 
     @staticmethod
     async def exists(user_id: UUID, key: str) -> bool:
@@ -228,7 +345,81 @@ class UserStore:
         bool
             True if the key exists, False otherwise.
         """
-        db_entry = await UserKeyValueDB.objects().where(
+        return await UserKeyValueDB.exists().where(
             (UserKeyValueDB.user_id == user_id) & (UserKeyValueDB.key == key)
-        ).first()
-        return db_entry is not None
+        )
+
+    @staticmethod
+    async def keys(user_id: UUID, prefix: str = "") -> List[str]:
+        """
+        List the user's keys starting with `prefix`, most recently saved first.
+
+        Returns
+        -------
+        List[str]
+            The matching keys.
+        """
+        # `_` and `%` in the prefix are LIKE wildcards: filtered again below
+        rows = await UserKeyValueDB.select(UserKeyValueDB.key).where(
+            (UserKeyValueDB.user_id == user_id) & UserKeyValueDB.key.like(f"{prefix}%")
+        ).order_by(UserKeyValueDB.updated_at, ascending=False)
+        return [r["key"] for r in rows if r["key"].startswith(prefix)]
+
+    @staticmethod
+    async def load_many(
+        user_id: UUID, keys: Iterable[str], default: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Load several user-scoped values with one query per `CHUNK_SIZE` keys.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Every requested key mapped to its value, or to `default`.
+        """
+        values = dict.fromkeys(keys, default)
+        for chunk in _chunks(list(values)):
+            rows = await UserKeyValueDB.select(UserKeyValueDB.key, UserKeyValueDB.value).where(
+                (UserKeyValueDB.user_id == user_id) & UserKeyValueDB.key.is_in(chunk)
+            )
+            values.update({r["key"]: _decode(r["value"]) for r in rows})
+        return values
+
+    @staticmethod
+    async def save_many(user_id: UUID, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Save several user-scoped values (each a full replacement) with one
+        statement per `CHUNK_SIZE` keys.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The saved mapping (the same object you passed in).
+        """
+        for chunk in _chunks(list(values.items())):
+            await UserKeyValueDB.insert(*(
+                UserKeyValueDB(user_id=user_id, key=k, value=_encode(v))
+                for k, v in chunk
+            )).on_conflict(
+                target=(UserKeyValueDB.user_id, UserKeyValueDB.key),
+                action="DO UPDATE",
+                values=[UserKeyValueDB.value, UserKeyValueDB.updated_at],
+            )
+        return values
+
+    @staticmethod
+    async def delete_many(user_id: UUID, keys: Iterable[str]) -> int:
+        """
+        Delete several user-scoped keys with one query per `CHUNK_SIZE` keys.
+
+        Returns
+        -------
+        int
+            How many keys were set and are now removed.
+        """
+        deleted = 0
+        for chunk in _chunks(list(keys)):
+            deleted += len(await UserKeyValueDB.delete().where(
+                (UserKeyValueDB.user_id == user_id) & UserKeyValueDB.key.is_in(chunk)
+            ).returning(UserKeyValueDB.id))
+        return deleted
@@ -7,6 +7,8 @@ from piccolo.columns import (
     JSON,
     UUID,
     Timestamptz,
+    Bytea,
+    Serial,
 )
 
 from .database import DB
@@ -26,6 +28,40 @@ class KeyValueDB(Table, db=DB):
         tablename = "ccat_global_key_value"
 
 
+class ChangeDB(Table, db=DB):
+    """Change bus log: one row per change (plugins, a store key...),
+    numbered by `seq`, with the worker that made it. Only the last
+    `config.CHANGE_LOG_SIZE` rows are kept.
+
+    Written on SQLite only; workers poll it to refresh what other workers
+    changed (see `cat.looking_glass.change_bus`). Postgres uses NOTIFY instead.
+    """
+
+    seq = Serial(primary_key=True)
+    topic = Varchar(length=1024)
+    worker = Varchar(length=32)
+
+    class Meta:
+        tablename = "ccat_change_log"
+
+
+class EmbeddingDB(Table, db=DB):
+    """Persistent tier of the embedding cache (see `cat.db.embeddings`).
+
+    Content addressed: `key` is `provider:model:sha256(text)`, so the same text
+    embedded by the same model is stored once. Vectors are packed float32 bytes,
+    about 4x smaller than a JSON list of floats.
+    """
+
+    key = Varchar(length=1024, primary_key=True)
+    provider = Varchar(length=256, index=True)
+    model = Varchar(length=512)
+    vector = Bytea()
+
+    class Meta:
+        tablename = "ccat_embedding_cache"
+
+
 ##########################
 ### user scoped tables ###
 ##########################
@@ -35,18 +71,42 @@ class UserKeyValueDB(Table, db=DB):
 
     Standalone (not a subclass of KeyValueDB): the global table makes `key` its
     primary key, but here the same key must coexist across users, so the key is
-    scoped by `user_id`. A surrogate `id` is the primary key; `(user_id, key)`
-    uniqueness is enforced in the application layer (UserStore.save upserts).
+    scoped by `user_id`. A surrogate `id` is the primary key; `(user_id, key)` is
+    unique through `USER_KEY_VALUE_INDEX` (Piccolo cannot declare composite
+    constraints), which `UserStore.save` targets with `ON CONFLICT DO UPDATE`.
     """
 
     id = UUID(primary_key=True, default=uuid4)
     user_id = UUID(index=True)
     key = Varchar(length=1024, index=True)
     value = JSON()
+    # null on rows written before the column existed
+    updated_at = Timestamptz(null=True)
 
     class Meta:
         tablename = "ccat_user_key_value"
 
+
+class ApiKeyDB(Table, db=DB):
+    """Per-user API keys (see `cat.auth.api_keys`).
+
+    Only a bcrypt hash of each key's secret is stored. Keys are looked up by
+    their public `prefix` (unique, indexed), so verifying one is one indexed
+    query and one hash check. A key acts as its user, with `roles`.
+    """
+
+    id = UUID(primary_key=True, default=uuid4)
+    prefix = Varchar(length=32, unique=True, index=True)
+    hash = Varchar(length=128)
+    name = Varchar(length=1024)
+    user_id = UUID(index=True)
+    user_name = Varchar(length=1024)
+    roles = JSON(default=[])
+    created_at = Timestamptz()
+
+    class Meta:
+        tablename = "ccat_api_keys"
+
 ################################################
 ### utility user scoped table to be extended ###
 ################################################
@@ -66,6 +126,52 @@ class UserScopedDB(Table, db=DB):
         abstract = True
 
 
+# Composite unique index on `ccat_user_key_value (user_id, key)`.
+USER_KEY_VALUE_INDEX = "ccat_user_key_value_user_id_key"
+
+
+def migrate_user_key_value():
+    """Add the `updated_at` column and the `(user_id, key)` unique index, first
+    deleting duplicate rows.
+
+    Older versions only enforced uniqueness in the application layer, so
+    concurrent saves could leave several rows per key. The most recently
+    updated one is kept; rows from before `updated_at` existed have none, and
+    among those the last inserted one is kept on SQLite, the one with the
+    highest id on Postgres (insertion order is not recorded there). A no-op
+    once the index exists.
+    """
+    table = UserKeyValueDB._meta.tablename
+    if DB.engine_type == "sqlite":
+        has_column = f"SELECT 1 FROM pragma_table_info('{table}') WHERE name = 'updated_at'"
+        exists = f"SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = '{USER_KEY_VALUE_INDEX}'"
+        tiebreak = "rowid"
+    else:
+        has_column = (
+            "SELECT 1 FROM information_schema.columns "
+            f"WHERE table_name = '{table}' AND column_name = 'updated_at'"
+        )
+        exists = f"SELECT 1 FROM pg_indexes WHERE indexname = '{USER_KEY_VALUE_INDEX}'"
+        tiebreak = "id"
+
+    if not UserKeyValueDB.raw(has_column).run_sync():
+        UserKeyValueDB.raw(f"ALTER TABLE {table} ADD COLUMN updated_at TIMESTAMPTZ").run_sync()
+    if UserKeyValueDB.raw(exists).run_sync():
+        return
+    UserKeyValueDB.raw(f"""
+        DELETE FROM {table} WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY user_id, key
+                    ORDER BY updated_at DESC NULLS LAST, {tiebreak} DESC
+                ) AS n FROM {table}
+            ) ranked WHERE n > 1
+        )""").run_sync()
+    UserKeyValueDB.raw(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {USER_KEY_VALUE_INDEX} ON {table} (user_id, key)"
+    ).run_sync()
+
+
 def create_tables():
     """Create the core DB tables (idempotent).
 
@@ -78,5 +184,7 @@ def create_tables():
     if db_path:  # sqlite: ensure the db directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
-    for DBTable in [KeyValueDB, UserKeyValueDB]:
+    for DBTable in [KeyValueDB, ChangeDB, UserKeyValueDB, ApiKeyDB, EmbeddingDB]:
         DBTable.create_table(if_not_exists=True).run_sync()
+
+    migrate_user_key_value()
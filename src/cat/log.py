@@ -74,6 +74,16 @@ class LogEngine:
             filter=self.show_log_level,
         )
 
+    def is_enabled(self, level: str = "DEBUG") -> bool:
+        """Whether messages at `level` would be shown.
+
+        Lets hot paths skip building a message nobody will read:
+
+            if log.is_enabled("DEBUG"):
+                log.debug(f"expensive {thing}")
+        """
+        return logger.level(level).no >= logger.level(self.LOG_LEVEL).no
+
     def __call__(self, msg, level="DEBUG"):
         """Alias of self.log()"""
         self.log(msg, level)
@@ -0,0 +1,271 @@
+"""
+Change bus: keeps the plugin and settings state of several workers coherent.
+
+Each worker process holds its own MadHatter, registry singletons and caches,
+so a plugin toggled (or a setting saved) through one worker must be announced
+to the others sharing the database. Changes are published on a topic:
+
+- `plugins:<plugin id>`: a plugin was toggled; other workers activate or
+  deactivate just that plugin, which refreshes its hooks, its services and its
+  endpoints;
+- `plugins`: a plugin was installed or removed; other workers rediscover the
+  plugins folder and the active plugins, re-importing their modules, which
+  refreshes the registry and the endpoints;
+- `store:<key>`: a key of the global store was saved or deleted; other
+  workers drop it from their store cache (`cat.db.cache`) and, for the
+  settings of a service, the cached settings and the live singleton;
+- `auth`: credentials were revoked; other workers clear their verified
+  credential cache;
+- `threads:<user id>:<thread id>`: a thread got new messages; other workers
+  drop it from their hot thread cache.
+
+On Postgres changes go with `NOTIFY` on the `ccat_changes` channel, on SQLite
+by appending a row per change to the `ccat_change_log` table, polled every
+`config.CHANGE_BUS_POLL` seconds. A worker ignores its own changes, which it
+already applied. When it may have missed some (the Postgres listener
+reconnected, or the log was pruned past what it read), it refreshes everything.
+
+Nothing is published, nor received, by a single worker on SQLite
+(`config.WORKERS = 1`): no other process reads that database. A Postgres
+database may be shared by several deployments, so there the bus always runs.
+"""
+
+import asyncio
+import sqlite3
+from uuid import uuid4
+
+import asyncpg
+
+from cat.db.database import DB
+from cat.db.models import ChangeDB
+from cat import config, log
+
+
+CHANNEL = "ccat_changes"
+
+# Store keys of service settings (see `Service._settings_key`).
+SETTINGS_PREFIX = "settings_"
+
+# What reading or applying changes fails with: the database or its connection.
+DB_ERRORS = (OSError, sqlite3.Error, asyncpg.PostgresError, asyncpg.InterfaceError)
+
+
+class ChangeBus:
+
+    def __init__(self):
+        self.worker: str | None = None
+        self.received = 0
+        self._seq: int | None = None
+        self._task: asyncio.Task | None = None
+        self._listener = None
+        # refreshes started by NOTIFY callbacks, referenced until done
+        self._tasks: set[asyncio.Task] = set()
+        # one refresh at a time
+        self._lock = asyncio.Lock()
+
+    @property
+    def shared(self) -> bool:
+        """Whether other processes may change the state of this one."""
+        return config.WORKERS > 1 or DB.engine_type == "postgres"
+
+    async def start(self) -> None:
+        """Start receiving changes (at app startup, in each worker)."""
+        from cat.db.cache import store_cache
+
+        if not self.shared:
+            return
+        # per process: set after a fork, never inherited
+        self.worker = uuid4().hex
+        self._seq = None
+        self._lock = asyncio.Lock()
+        if DB.engine_type == "postgres":
+            await self._listen()
+        else:
+            await self.poll()
+        # read before receiving changes: may be stale
+        store_cache.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self.worker = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._tasks:
+            task.cancel()
+        if self._listener is not None:
+            conn, self._listener = self._listener, None
+            conn.remove_termination_listener(self._on_listener_lost)
+            await conn.close()
+
+    async def publish(self, *topics: str) -> None:
+        """Tell the other workers that `topics` changed."""
+        if self.worker is None or not topics:
+            return  # not serving (single worker, scripts, tests without an app)
+
+        if DB.engine_type == "postgres":
+            await ChangeDB.raw(
+                "SELECT pg_notify({}, {} || ':' || t) FROM unnest({}::text[]) AS t",
+                CHANNEL, self.worker, list(topics),
+            )
+        else:
+            table = ChangeDB._meta.tablename
+            await ChangeDB.insert(*(ChangeDB(topic=t, worker=self.worker) for t in topics))
+            await ChangeDB.raw(
+                f"DELETE FROM {table} WHERE seq <= (SELECT MAX(seq) FROM {table}) - {{}}",
+                config.CHANGE_LOG_SIZE,
+            )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(config.CHANGE_BUS_POLL)
+            try:
+                if DB.engine_type == "postgres":
+                    await self._listen()
+                else:
+                    await self.poll()
+            except DB_ERRORS as e:
+                log.warning(f"Change bus: {e}")
+
+    async def poll(self) -> None:
+        """SQLite: apply the changes other workers made since the last poll."""
+        if self._seq is None:
+            rows = await ChangeDB.raw(
+                f"SELECT COALESCE(MAX(seq), 0) AS seq FROM {ChangeDB._meta.tablename}"
+            )
+            self._seq = rows[0]["seq"]
+            return
+
+        rows = await ChangeDB.select().where(ChangeDB.seq > self._seq).order_by(ChangeDB.seq)
+        if rows and rows[0]["seq"] > self._seq + 1:
+            # pruned before we read them
+            self._seq = rows[-1]["seq"]
+            await self.resync()
+            return
+        for row in rows:
+            self._seq = max(self._seq, row["seq"])
+            if row["worker"] != self.worker:
+                await self.apply(row["topic"])
+
+    async def _listen(self) -> None:
+        if self._listener is not None:
+            return
+        reconnect = self._seq is not None
+        conn = await DB.get_new_connection()
+        await conn.add_listener(CHANNEL, self._on_notify)
+        conn.add_termination_listener(self._on_listener_lost)
+        self._listener = conn
+        self._seq = 0
+        if reconnect:
+            # changes made while we were not listening are unknown
+            await self.resync()
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        worker, _, topic = payload.partition(":")
+        if worker != self.worker:
+            task = asyncio.create_task(self.apply(topic))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _on_listener_lost(self, connection) -> None:
+        log.warning("Change bus: lost the LISTEN connection, reconnecting.")
+        self._listener = None
+
+    async def apply(self, topic: str) -> None:
+        """Refresh this worker after another one changed `topic`."""
+        from cat.db.cache import store_cache
+
+        self.received += 1
+        if topic.startswith("store:"):
+            key = topic[len("store:"):]
+            store_cache.invalidate(key)
+            if not key.startswith(SETTINGS_PREFIX):
+                return
+        log.info(f"Change bus: {topic} changed in another worker, refreshing.")
+        async with self._lock:
+            try:
+                if topic == "plugins":
+                    await self._refresh_plugins()
+                elif topic.startswith("plugins:"):
+                    await self._toggle_plugin(topic[len("plugins:"):])
+                elif topic.startswith("store:"):
+                    await self._refresh_settings(topic[len("store:"):])
+                elif topic == "auth":
+                    from cat.auth.cache import auth_cache
+                    auth_cache.clear()
+                elif topic.startswith("threads:"):
+                    user_id, _, thread_id = topic[len("threads:"):].partition(":")
+                    self._forget_threads((user_id, thread_id))
+            except DB_ERRORS as e:
+                log.error(f"Change bus: could not refresh {topic}: {e}")
+
+    async def resync(self) -> None:
+        """Refresh everything, after changes of other workers may have been
+        missed."""
+        from cat.auth.cache import auth_cache
+        from cat.db.cache import store_cache
+        from cat.services.service import settings_cache
+
+        log.warning("Change bus: changes may have been missed, refreshing everything.")
+        async with self._lock:
+            try:
+                store_cache.clear()
+                await self._refresh_plugins()
+                auth_cache.clear()
+                settings_cache.clear()
+                self._forget_threads()
+            except DB_ERRORS as e:
+                log.error(f"Change bus: could not refresh: {e}")
+
+    async def _refresh_plugins(self) -> None:
+        from cat.ambient.runtime import ccat
+        from cat.db.cache import store_cache
+
+        mad_hatter = ccat().mad_hatter
+        store_cache.invalidate("active_plugins")
+        # drop the imported modules, the other worker may have installed new code
+        for plugin in mad_hatter.plugins.values():
+            plugin.deactivate()
+        await mad_hatter.find_plugins()
+
+    async def _toggle_plugin(self, plugin_id: str) -> None:
+        from cat.ambient.runtime import ccat
+        from cat.db.cache import store_cache
+
+        mad_hatter = ccat().mad_hatter
+        plugin = mad_hatter.plugins.get(plugin_id)
+        if plugin is None:
+            # installed by the other worker: not known here yet
+            await self._refresh_plugins()
+            return
+        store_cache.invalidate("active_plugins")
+        plugin.deactivate()
+        if plugin_id in await mad_hatter.get_active_plugins():
+            plugin.activate()
+        await mad_hatter.refresh_caches([plugin_id])
+
+    def _forget_threads(self, key: tuple[str, str] | None = None) -> None:
+        """Drop a (user id, thread id) from the live thread caches, or all."""
+        from cat.ambient.runtime import ccat
+
+        for ThreadsClass in ccat().registry.classes.get("threads", {}).values():
+            instance = ThreadsClass.__dict__.get("_instance")
+            if instance is None:
+                continue
+            if key is None:
+                instance.cache.clear()
+            else:
+                instance.cache.pop(key, None)
+
+    async def _refresh_settings(self, key: str) -> None:
+        from cat.ambient.runtime import ccat
+        from cat.services.service import settings_cache
+
+        settings_cache.invalidate(key)
+        for classes in ccat().registry.classes.values():
+            for ServiceClass in classes.values():
+                if ServiceClass._settings_key() == key:
+                    await ServiceClass.refresh()
+
+
+change_bus = ChangeBus()
@@ -1,15 +1,23 @@
 import sys
-from typing import TYPE_CHECKING
+import importlib.util
+from typing import Dict, List, TYPE_CHECKING
 
 from cat import log
 from cat.ambient.runtime import set_ccat
 from cat.protocols.model_context.client import MCPClients
 from cat.mad_hatter.mad_hatter import MadHatter
 from cat.services.factory import Registry
+from cat.routes import openapi
 
 if TYPE_CHECKING:
     from cat.services.service import Service
     from cat.mad_hatter.plugin import Plugin
+    from cat.mad_hatter.decorators import Endpoint
+
+
+def _same(a: List, b: List) -> bool:
+    """Same objects, in the same order."""
+    return len(a) == len(b) and all(x is y for x, y in zip(a, b))
 
 
 class CheshireCat:
@@ -38,6 +46,12 @@ class CheshireCat:
         try:
             # reference to the FastAPI object
             self.fastapi_app = fastapi_app
+            # routes included in it, by plugin: (endpoints, routes). Kept on
+            #  the app, which may outlive this instance (lifespan restarts)
+            if not hasattr(fastapi_app.state, "plugin_routes"):
+                fastapi_app.state.plugin_routes = {}
+            self.plugin_routes: Dict[str, tuple[List["Endpoint"], List]] = \
+                fastapi_app.state.plugin_routes
 
             # instantiate MadHatter
             self.mad_hatter = MadHatter()
@@ -50,7 +64,7 @@ class CheshireCat:
             # allows plugins to do something before cat components are loaded
             await self.mad_hatter.execute_hook("before_cat_bootstrap", None)
 
-            # init MCP clients cache
+            # init MCP session pool
             self.mcp_clients = MCPClients()
 
             # allows plugins to do something after the cat bootstrap is complete
@@ -75,22 +89,30 @@ class CheshireCat:
         log.welcome()
 
     async def refresh_registry(self):
-        """Re-register core + plugin service classes (no eager construction)."""
+        """Sync the registry with core + plugin service classes (no eager construction).
+
+        Applied as a diff: a plugin toggle closes the singletons of the classes
+        it added, removed or replaced, the others (e.g. provider clients with
+        warm HTTP pools) stay alive.
+        """
 
         # avoid circular imports
         from cat.services.auths.default import DefaultAuth
+        from cat.services.threads.default import DefaultThreads
         from cat.services.agents.default import DefaultAgent
         from cat.services.model_providers.openai_compatible import OpenAICompatibleProvider
         from cat.services.model_providers.default import DefaultModelProvider
         from cat.services.core_settings import CoreSettings
-
-        # Reset registry (shutdown existing singletons and clear classes)
-        await self.registry.teardown()
+        from cat.services.directives.summary import SummaryDirective
+        from cat.auth.cache import auth_cache
 
         # Register default services (all core-provided, one place). Core ships
         # exactly one model provider — the generic OpenAI-compatible engine; the
         # named vendor presets live in the scaffolded `llms` plugin.
-        core_defaults = [CoreSettings, DefaultAgent, DefaultModelProvider, OpenAICompatibleProvider]
+        core_defaults = [
+            CoreSettings, DefaultAgent, DefaultModelProvider, OpenAICompatibleProvider,
+            SummaryDirective,
+        ]
 
         # DefaultAuth is just the `Auth` base with a slug — it only exists so a
         # plugin-less core can still verify JWTs and the master key. The moment a
@@ -99,35 +121,74 @@ class CheshireCat:
         if not self.mad_hatter.service_classes.get("auths"):
             core_defaults.insert(1, DefaultAuth)
 
+        # Same for threads: the core ones live in the user key-value store, a
+        # plugin (e.g. `chats`) may store them better.
+        if not self.mad_hatter.service_classes.get("threads"):
+            core_defaults.append(DefaultThreads)
+
+        # The NumPy vector indexes ship with the optional `vector` extra.
+        if importlib.util.find_spec("numpy"):
+            from cat.services.vector_indexes.default import DefaultVectorIndex
+            from cat.services.vector_indexes.ivf import IVFVectorIndex
+            core_defaults += [DefaultVectorIndex, IVFVectorIndex]
+
+        classes = {}
         for ServiceClass in core_defaults:
             ServiceClass.plugin_id = "core"
-            self.registry.register(ServiceClass)
+            classes.setdefault(ServiceClass.service_type, {})[ServiceClass.slug] = ServiceClass
 
-        # Register all services from plugins
+        # Add all services from plugins (they may replace a core default)
         for service_type, services in self.mad_hatter.service_classes.items():
-            for slug, ServiceClass in services.items():
-                self.registry.register(ServiceClass)
+            classes.setdefault(service_type, {}).update(services)
+
+        # Swap only what changed (closing those singletons)
+        changed = await self.registry.sync(classes)
+        if "auths" in changed:
+            # auth handlers changed: verified credentials and chain go too
+            auth_cache.clear()
 
     def refresh_endpoints(self):
-        """Sync plugin endpoints in the fastapi app."""
-
-        # remove all plugin Endpoint routes from fastapi app
-        routes_to_remove = []
-        for route in self.fastapi_app.routes:
-            # route may be a plain APIRoute (has `.endpoint`) or a nested
-            # router/mount (from `@endpoint.router`) that does not
-            if hasattr(getattr(route, "endpoint", None), 'plugin_id') \
-                    or hasattr(route, "plugin_id"):
-                routes_to_remove.append(route)
-        for route in routes_to_remove:
-            self.fastapi_app.routes.remove(route)
-
-        # add the new list
-        for e in self.mad_hatter.endpoints:
-            self.fastapi_app.include_router(e)
+        """Sync plugin endpoints in the fastapi app, plugin by plugin.
 
-        # reset openapi schema
-        self.fastapi_app.openapi_schema = None
+        Only plugins whose endpoints changed (toggled, reloaded) have their
+        routes removed and included again; the OpenAPI schema is rebuilt in the
+        background if anything changed.
+        """
+
+        # current endpoints, by plugin
+        wanted: Dict[str, List["Endpoint"]] = {}
+        for e in self.mad_hatter.endpoints:
+            wanted.setdefault(e.plugin_id, []).append(e)
+
+        changed = [
+            plugin_id for plugin_id in self.plugin_routes.keys() | wanted.keys()
+            if not _same(self.plugin_routes.get(plugin_id, ([], []))[0], wanted.get(plugin_id, []))
+        ]
+        if not changed:
+            return
+
+        # remove the routes of changed plugins, in one pass
+        stale = set()
+        for plugin_id in changed:
+            _, routes = self.plugin_routes.pop(plugin_id, ([], []))
+            stale.update(id(r) for r in routes)
+        if stale:
+            self.fastapi_app.router.routes[:] = [
+                r for r in self.fastapi_app.router.routes if id(r) not in stale
+            ]
+
+        # include their new endpoints, remembering the routes each one adds
+        routes = self.fastapi_app.router.routes
+        for plugin_id in changed:
+            if plugin_id not in wanted:
+                continue
+            start = len(routes)
+            for e in wanted[plugin_id]:
+                self.fastapi_app.include_router(e)
+            self.plugin_routes[plugin_id] = (wanted[plugin_id], routes[start:])
+
+        # rebuild the openapi schema, off the event loop
+        openapi.document(self.fastapi_app).invalidate()
 
     async def get(
         self,
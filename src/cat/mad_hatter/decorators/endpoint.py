@@ -33,14 +33,16 @@ class EndpointDecorator:
         async def staff(): ...
 
     `role` semantics:
-      - None (default)      → open, no auth required.
+      - None (default)      → open: anyone may call it; `user` is the caller
+                              when they sent valid credentials.
       - "authenticated"     → any logged-in user, regardless of roles.
       - "admin"             → must have that role.
       - ["a", "b"]          → must have any of these (OR).
 
     Any non-None `role` injects the same auth dependency core uses
     (`cat.auth.depends._get_user`), which 403s when the caller is unauthenticated
-    or lacks the role. Other kwargs (`prefix`, `tags`, `response_model`, ...) pass
+    or lacks the role; open endpoints get its best-effort twin
+    (`_resolve_user`), which never refuses. Other kwargs (`prefix`, `tags`, `response_model`, ...) pass
     straight to FastAPI.
     """
 
@@ -53,11 +55,14 @@ class EndpointDecorator:
 
             # `role=` sugar → inject the core auth dependency. Imported lazily to
             # avoid an import cycle (this module is imported at `cat` boot).
+            from cat.auth.depends import _get_user, _resolve_user
+
             role = kwargs.pop("role", None)
             dependencies = list(kwargs.pop("dependencies", []))
             if role is not None:
-                from cat.auth.depends import _get_user
                 dependencies.append(_get_user(role=role))
+            else:
+                dependencies.append(_resolve_user())
 
             router = Endpoint()
             router.add_api_route(
@@ -96,8 +101,10 @@ class EndpointDecorator:
                 "The function decorated with @endpoint.router must return an APIRouter instance."
             )
 
+        from cat.auth.depends import _resolve_user
+
         ce = Endpoint()
-        ce.include_router(returned_router)
+        ce.include_router(returned_router, dependencies=[_resolve_user()])
         return ce
 
 # TODOV2: endpoints with the same function name collide, even with different paths
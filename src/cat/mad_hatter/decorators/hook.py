@@ -1,3 +1,4 @@
+import inspect
 from typing import Union, Callable
 
 
@@ -9,6 +10,9 @@ class Hook:
         self.priority = priority
         self.plugin_id = None
 
+        # resolved once here, so firing the hook never inspects the function
+        self.is_async = inspect.iscoroutinefunction(func)
+
     def __repr__(self) -> str:
         return f"Hook(plugin={self.plugin_id}, name={self.name}, priority={self.priority})"
 
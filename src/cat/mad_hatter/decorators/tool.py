@@ -1,7 +1,8 @@
 import inspect
 import time
 from uuid import uuid4
-from typing import Callable, Dict, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+from typing import Callable, Dict, List, TYPE_CHECKING
 
 from fastmcp.tools.tool import FunctionTool, ParsedFunction
 from fastmcp.client.client import CallToolResult
@@ -24,6 +25,7 @@ class Tool:
         input_schema: Dict,
         output_schema: Dict,
         is_internal: bool = True,
+        parallel: bool = False,
     ):
         self.func = func
         self.name = name
@@ -32,14 +34,23 @@ class Tool:
         self.output_schema = output_schema
 
         self.is_internal = is_internal
+
+        # safe to run alongside the other tool calls of the same LLM turn
+        # (see `Agent.call_tools`); agents can also opt in all their tools at once
+        self.parallel = parallel
     
         # will be assigned by MadHatter
         self.plugin_id = None
 
+        # parameters and kind of `func`, inspected on the first `bind_to`
+        self._bind_params = None
+        self._bind_async = False
+
     @classmethod
     def from_decorated_function(
         cls,
         func: Callable,
+        parallel: bool = False,
     ) -> 'Tool':
 
         parsed_function = ParsedFunction.from_function(
@@ -54,6 +65,7 @@ class Tool:
             description = parsed_function.description,
             input_schema = parsed_function.input_schema,
             output_schema = parsed_function.output_schema,
+            parallel = parallel,
         )
 
     @classmethod
@@ -73,7 +85,7 @@ class Tool:
         )
     
     def __repr__(self) -> str:
-        return f"Tool(name={self.name}, input_schema={self.input_schema}, internal={self.is_internal})"
+        return f"Tool(name={self.name}, input_schema={self.input_schema}, internal={self.is_internal}, parallel={self.parallel})"
 
     async def execute(self, agent, tool_call) -> "Message":
         """
@@ -102,9 +114,8 @@ class Tool:
                     self.func, **tool_call.args
                 )
             else:
-                # MCP tool
-                async with agent.mcp:
-                    tool_result: CallToolResult = await self.func(self.name, tool_call.args)
+                # MCP tool, on the pooled session of its server
+                tool_result: CallToolResult = await self.func(self.name, tool_call.args)
         except Exception as e:
             tool_result = f"Error: {e}"
 
@@ -154,44 +165,80 @@ class Tool:
         )
 
     def bind_to(self, instance) -> 'Tool':
-        """Bind this tool's function to an instance (for class-based tools)."""
+        """Bind this tool's function to an instance (for class-based tools).
+        The signature is inspected once per tool, so binding is cheap."""
 
-        original_func = self.func
-        sig = inspect.signature(original_func)
-        valid_params = set(sig.parameters.keys()) - {'self'}
+        if self._bind_params is None:
+            sig = inspect.signature(self.func)
+            self._bind_params = set(sig.parameters.keys()) - {'self'}
+            self._bind_async = inspect.iscoroutinefunction(self.func)
+        params, is_async = self._bind_params, self._bind_async
 
         # Bind the method
-        bound_method = original_func.__get__(instance, instance.__class__)
-
-        # Create wrapper
-        def create_bound_wrapper(bound_func, params):
-            async def wrapper(**kwargs):
-                filtered_kwargs = {k: v for k, v in kwargs.items() if k in params}
-                if inspect.iscoroutinefunction(bound_func):
-                    return await bound_func(**filtered_kwargs)
-                else:
-                    return bound_func(**filtered_kwargs)
+        bound_func = self.func.__get__(instance, instance.__class__)
 
-            return wrapper
+        async def wrapper(**kwargs):
+            filtered_kwargs = {k: v for k, v in kwargs.items() if k in params}
+            if is_async:
+                return await bound_func(**filtered_kwargs)
+            return bound_func(**filtered_kwargs)
 
         # Return a NEW Tool with the bound function
         return Tool(
-            func=create_bound_wrapper(bound_method, valid_params),
+            func=wrapper,
             name=self.name,
             description=self.description,
             input_schema=self.input_schema,
             output_schema=self.output_schema,
-            is_internal=self.is_internal
+            is_internal=self.is_internal,
+            parallel=self.parallel,
         )
 
 
-def tool(*args) -> Tool:
+class ClassTools:
+    """The `Tool`s declared on each class (agents), found once per class; runs
+    then only bind them to their instance."""
+
+    def __init__(self):
+        self.tools: WeakKeyDictionary = WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cls: type) -> List[Tool]:
+        tools = self.tools.get(cls)
+        if tools is None:
+            self.misses += 1
+            tools = self.tools[cls] = [
+                attr
+                for name in dir(cls)
+                if isinstance(attr := getattr(cls, name, None), Tool)
+            ]
+        else:
+            self.hits += 1
+        return tools
+
+    def bind(self, instance) -> List[Tool]:
+        return [t.bind_to(instance) for t in self.get(type(instance))]
+
+    def stats(self) -> dict:
+        return {"classes": len(self.tools), "hits": self.hits, "misses": self.misses}
+
+
+class_tools = ClassTools()
+
+
+def tool(*args, parallel: bool = False) -> Tool:
+    """`@tool` decorator to make `Tool` objects out of functions.
+
+    `@tool(parallel=True)` marks a tool as independent from its siblings, so the
+    agent may run it concurrently with the other tool calls of the same turn.
+    """
 
     if len(args) == 1 and callable(args[0]):
-        return Tool.from_decorated_function(args[0])
+        return Tool.from_decorated_function(args[0], parallel=parallel)
     else:
         def wrapper(func):
-            return Tool.from_decorated_function(func)
+            return Tool.from_decorated_function(func, parallel=parallel)
         return wrapper
 
 
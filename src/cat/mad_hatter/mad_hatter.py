@@ -9,6 +9,7 @@ from cat.db import store
 from cat.mad_hatter.plugin_extractor import PluginExtractor
 from cat.mad_hatter.registry import registry_download_plugin
 from cat.mad_hatter.plugin import Plugin
+from cat.looking_glass.change_bus import change_bus
 
 if TYPE_CHECKING:
     from cat.services.service import Service
@@ -91,6 +92,8 @@ class MadHatter:
 
         if activate:
             await self.toggle_plugin(plugin.id)
+        else:
+            await change_bus.publish("plugins")
     
         return plugin
 
@@ -110,6 +113,7 @@ class MadHatter:
 
         # remove plugin folder
         shutil.rmtree(plugin_path, ignore_errors=True)
+        await change_bus.publish("plugins")
 
     async def find_plugins(self):
         """
@@ -143,33 +147,62 @@ class MadHatter:
 
         await self.refresh_caches()
 
-    async def refresh_caches(self):
-        """Load decorated functions from active plugins into MadHatter."""
-        
-        # emptying caches
-        self.hooks = {}
-        self.endpoints = []
-        self.service_classes = {}
+    async def refresh_caches(self, plugin_ids: List[str] | None = None):
+        """Load decorated functions from active plugins into MadHatter.
+
+        With `plugin_ids` (a toggle), only the entries of those plugins are
+        swapped: the hooks and endpoints of the other plugins stay as indexed.
+        """
 
-        for _, plugin in self.plugins.items():
+        if plugin_ids is None:
+            # emptying caches
+            self.hooks = {}
+            self.endpoints = []
+            loaded = list(self.plugins.values())
+            changed_hooks = {h.name for plugin in loaded for h in plugin.hooks}
+        else:
+            # swap the entries of the changed plugins only
+            self.endpoints = [e for e in self.endpoints if e.plugin_id not in plugin_ids]
+            loaded = [self.plugins[p] for p in plugin_ids if p in self.plugins]
+            changed_hooks = {
+                name for name, hooks in self.hooks.items()
+                if any(h.plugin_id in plugin_ids for h in hooks)
+            } | {h.name for plugin in loaded for h in plugin.hooks}
+
+        for plugin in loaded:
             # load decorated funcs from plugins (only active ones have them populated)
             self.endpoints += plugin.endpoints
 
-            # index service classes by type and slug
+            # warn about sync hooks once, at load time, instead of on every call
+            for h in plugin.hooks:
+                if not h.is_async:
+                    path = inspect.getfile(h.function)
+                    log.warning(
+                        f"Deprecation Warning: hook {h.name} in {path} should be async."
+                    )
+
+        # (re)index the changed hooks by name, in plugin order, then sort each
+        #  list by priority: the list is the ready-to-run pipeline
+        #  `execute_hook` walks, with no per-call inspection
+        rebuilt = {name: [] for name in changed_hooks}
+        for plugin in self.plugins.values():
+            for h in plugin.hooks:
+                if h.name in rebuilt:
+                    rebuilt[h.name].append(h)
+        for hook_name, hooks in rebuilt.items():
+            if hooks:
+                self.hooks[hook_name] = sorted(hooks, key=lambda x: x.priority, reverse=True)
+            else:
+                self.hooks.pop(hook_name, None)
+
+        # index service classes by type and slug (in plugin order: on a slug
+        #  clash the last plugin wins, whichever plugin was toggled)
+        self.service_classes = {}
+        for plugin in self.plugins.values():
             for S in plugin.services:
                 if S.service_type not in self.service_classes.keys():
                     self.service_classes[S.service_type] = {}
                 self.service_classes[S.service_type][S.slug] = S
-            
-            # index hooks by name
-            for h in plugin.hooks:
-                if h.name not in self.hooks.keys():
-                    self.hooks[h.name] = []
-                self.hooks[h.name].append(h)
-
-        # sort each hooks list by priority
-        for hook_name in self.hooks.keys():
-            self.hooks[hook_name].sort(key=lambda x: x.priority, reverse=True)
 
         # Notify subscribers about finished refresh
         for callback in self.on_refresh_callbacks:
@@ -218,8 +251,9 @@ class MadHatter:
 
         # update DB with list of active plugins, delete duplicate plugins
         await self.set_active_plugins(active_plugins)
-        # update cache
-        await self.refresh_caches()
+        # update cache for this plugin only, here and in the other workers
+        await self.refresh_caches([plugin_id])
+        await change_bus.publish(f"plugins:{plugin_id}")
 
 
     async def execute_hook(
@@ -241,9 +275,14 @@ class MadHatter:
             The value after all hooks have been executed.
         """
 
+        # debug messages are only built when they will be shown
+        debug = log.is_enabled("DEBUG")
+
         # check if hook is supported
-        if hook_name not in self.hooks.keys():
-            log.debug(f"Hook {hook_name} not present in any plugin")
+        hooks = self.hooks.get(hook_name)
+        if not hooks:
+            if debug:
+                log.debug(f"Hook {hook_name} not present in any plugin")
             return default_value
 
         # Hook with one argument: the pipeable value.
@@ -253,15 +292,16 @@ class MadHatter:
         value = default_value
 
         # run hooks
-        for hook in self.hooks[hook_name]:
+        for hook in hooks:
             try:
-                log.debug(
-                    f"Executing {hook.plugin_id}::{hook.name} with priority {hook.priority}"
-                )
-                returned = await utils.run_sync_or_async(
-                    hook.function,
-                    value,
-                )
+                if debug:
+                    log.debug(
+                        f"Executing {hook.plugin_id}::{hook.name} with priority {hook.priority}"
+                    )
+                if hook.is_async:
+                    returned = await hook.function(value)
+                else:
+                    returned = hook.function(value)
                 if returned is not None:
                     value = returned
             except Exception:
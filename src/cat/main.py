@@ -1,7 +1,7 @@
 import uvicorn
 from urllib.parse import urlparse
 
-from cat import config
+from cat import config, log
 from cat.scaffold import scaffolder
 
 # RUN!
@@ -42,16 +42,28 @@ def main():
     else:
         raise Exception(f"Cannot extract port from config.URL {config.URL}")
 
-    uvicorn.run(
-        "cat.startup:cheshire_cat_api",
+    options = dict(
         host="0.0.0.0",
         port=port,
         ws="none",
         use_colors=True,
         log_level=config.LOG_LEVEL.lower(),
-        **debug_config,
         **proxy_pass_config,
     )
 
+    # several processes, app preloaded before forking (see `cat.workers`)
+    if config.WORKERS > 1:
+        if config.DEBUG:
+            log.warning("Self-reload (DEBUG) is off with more than one worker.")
+        from cat import workers
+        workers.serve(config.WORKERS, **options)
+        return
+
+    uvicorn.run(
+        "cat.startup:cheshire_cat_api",
+        **options,
+        **debug_config,
+    )
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,97 @@
+import time
+import asyncio
+from uuid import uuid4
+from typing import Awaitable, Callable
+
+from cat.protocols.agui import events
+from cat import config
+
+
+class TextMessageCoalescer:
+    """
+    Turns the provider's stream of text deltas into one AGUI text message.
+
+    Deltas are buffered and emitted as a single `TextMessageContentEvent` once
+    `flush_ms` milliseconds passed since the previous flush or `flush_bytes`
+    bytes piled up, whichever comes first, so a fast model produces a handful of
+    events per second instead of one per token. Start, content and end events
+    share one `message_id`, as the AGUI protocol expects.
+
+    The bounds are checked when a delta arrives; text left in the buffer is
+    sent by a deadline timer `flush_ms` after it was buffered, so a burst
+    followed by a slow token is not held back for the whole gap.
+    Set `flush_ms=0` to emit every delta as it comes.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[["events.BaseEvent"], Awaitable[None]],
+        flush_ms: int | None = None,
+        flush_bytes: int | None = None,
+    ):
+        self.emit = emit
+        self.flush_s = (config.STREAM_FLUSH_MS if flush_ms is None else flush_ms) / 1000
+        self.flush_bytes = config.STREAM_FLUSH_BYTES if flush_bytes is None else flush_bytes
+
+        self.message_id = str(uuid4())
+        self.started = False
+
+        self._parts: list[str] = []
+        self._size = 0
+        self._last_flush = 0.0
+        self._deadline: asyncio.Task | None = None
+        # flushes from the timer and from `push` emit in order
+        self._lock = asyncio.Lock()
+
+    async def push(self, delta: str) -> None:
+        """Buffer a text delta, flushing if the time or size bound is hit."""
+        if not delta:
+            return
+
+        if not self.started:
+            self.started = True
+            self._last_flush = time.monotonic()
+            await self.emit(events.TextMessageStartEvent(
+                message_id=self.message_id, timestamp=int(time.time())
+            ))
+
+        self._parts.append(delta)
+        self._size += len(delta.encode())
+
+        if self._size >= self.flush_bytes \
+                or time.monotonic() - self._last_flush >= self.flush_s:
+            await self.flush()
+        elif self._deadline is None:
+            delay = self.flush_s - (time.monotonic() - self._last_flush)
+            self._deadline = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Emit everything buffered so far as a single content event."""
+        if self._deadline is not None:
+            if self._deadline is not asyncio.current_task():
+                self._deadline.cancel()
+            self._deadline = None
+        self._last_flush = time.monotonic()
+        delta = "".join(self._parts)
+        self._parts = []
+        self._size = 0
+        # taken even with nothing to send: on return, earlier flushes are out
+        async with self._lock:
+            if delta:
+                await self.emit(events.TextMessageContentEvent(
+                    message_id=self.message_id, delta=delta, timestamp=int(time.time())
+                ))
+
+    async def close(self) -> None:
+        """Flush what is left and end the message (no-op if nothing was streamed)."""
+        if not self.started:
+            return
+        await self.flush()
+        async with self._lock:
+            await self.emit(events.TextMessageEndEvent(
+                message_id=self.message_id, timestamp=int(time.time())
+            ))
@@ -1,17 +1,96 @@
 import asyncio
 import json
 import time
-from asyncio import Queue
+from asyncio import Queue, QueueFull
 from uuid import uuid4
 from typing import AsyncGenerator, Any, TYPE_CHECKING
 
 from fastapi.responses import StreamingResponse
 from cat.protocols.agui import events
-from cat import log
+from cat import log, config
 
 if TYPE_CHECKING:
     from cat import Agent
     from cat.types import Task
+    from cat.services.threads.base import Threads
+
+
+class StreamChannel(Queue):
+    """
+    Bounded event queue between a running agent (producer) and the client
+    connection (consumer).
+
+    `put()` takes the `put_nowait` fast path while there is room. When the
+    queue is full, the `overflow` policy decides:
+
+    - "block"       the producer waits for the consumer (backpressure).
+    - "drop_oldest" the oldest queued event is discarded to make room.
+    - "coalesce"    a text delta is merged into the newest queued delta of the
+                    same message; anything that cannot be merged blocks.
+
+    Counters (`depth`, `peak_depth`, `dropped`, `coalesced`) are kept per
+    channel for diagnostics.
+    """
+
+    OVERFLOW_POLICIES = ("block", "drop_oldest", "coalesce")
+
+    def __init__(self, maxsize: int | None = None, overflow: str | None = None):
+        super().__init__(config.STREAM_QUEUE_SIZE if maxsize is None else maxsize)
+
+        self.overflow = overflow or config.STREAM_OVERFLOW
+        if self.overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown stream overflow policy {self.overflow!r}, "
+                f"expected one of {self.OVERFLOW_POLICIES}"
+            )
+
+        self.peak_depth = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        """Events currently waiting for the consumer."""
+        return self.qsize()
+
+    async def put(self, item: Any) -> None:
+        """Enqueue an event, applying the overflow policy if the queue is full."""
+        try:
+            self.put_nowait(item)
+        except QueueFull:
+            if self.overflow == "drop_oldest":
+                self.get_nowait()
+                self.dropped += 1
+                self.put_nowait(item)
+            elif self.overflow == "coalesce" and self._coalesce(item):
+                return
+            else:
+                await super().put(item)
+        self.peak_depth = max(self.peak_depth, self.qsize())
+
+    def _coalesce(self, item: Any) -> bool:
+        """Merge a text delta into the newest queued one of the same message."""
+        if not self._is_text_delta(item) or not self._queue:
+            return False
+        last = self._queue[-1]
+        if not self._is_text_delta(last) or last["message_id"] != item["message_id"]:
+            return False
+        self._queue[-1] = {**last, "delta": last["delta"] + item["delta"]}
+        self.coalesced += 1
+        return True
+
+    @staticmethod
+    def _is_text_delta(item: Any) -> bool:
+        return isinstance(item, dict) \
+            and item.get("type") == events.EventType.TEXT_MESSAGE_CONTENT
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "peak_depth": self.peak_depth,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
 
 
 class AgentStream:
@@ -19,14 +98,18 @@ class AgentStream:
     Base class for streaming agent execution.
     Handles queue, callback setup, and agent execution.
     Subclasses override lifecycle hooks and formatting.
+
+    With `threads`, the task continues thread `task.thread_id` (see
+    `Threads.run`).
     """
 
     media_type: str = "text/event-stream"  # Default for SSE, override in subclasses
 
-    def __init__(self, agent: "Agent", task: "Task"):
+    def __init__(self, agent: "Agent", task: "Task", threads: "Threads | None" = None):
         self.agent = agent
         self.task = task
-        self.queue = Queue()
+        self.threads = threads
+        self.channel = StreamChannel()
 
     async def _before_run(self) -> AsyncGenerator[Any, None]:
         """Override to emit events before agent runs."""
@@ -70,31 +153,32 @@ class AgentStream:
         async for event in self._before_run():
             yield event
 
-        # Setup callback to populate queue, on the current request context.
-        # The runner task (below) is created in this same context, so it
-        # snapshots the same Ctx object and sees this stream callback.
+        # Setup callback to populate the channel, on the current request
+        # context. The runner task (below) is created in this same context, so
+        # it snapshots the same Ctx object and sees this stream callback.
         from cat.ambient.context_vars import ctx
-        ctx().stream = lambda event: asyncio.create_task(
-            self.queue.put(event)
-        )
+        ctx().stream = self.channel.put
 
         async def runner() -> None:
             try:
                 # Run the agent
-                result = await self.agent(self.task)
+                if self.threads is not None:
+                    result = await self.threads.run(self.agent, self.task)
+                else:
+                    result = await self.agent(self.task)
 
                 # Emit after-run events
                 async for event in self._after_run(result):
-                    await self.queue.put(event)
+                    await self.channel.put(event)
 
             except Exception as e:
                 # Agent execution error - emit error events
                 async for event in self._on_error(e):
-                    await self.queue.put(event)
+                    await self.channel.put(event)
                 log.error(e)
 
             finally:
-                await self.queue.put(None)  # Signal completion
+                await self.channel.put(None)  # Signal completion
 
         # Run agent concurrently
         runner_task = asyncio.create_task(runner())
@@ -102,7 +186,7 @@ class AgentStream:
         try:
             # Yield events from queue as they arrive
             while True:
-                msg = await self.queue.get()
+                msg = await self.channel.get()
                 if msg is None:
                     break
                 yield msg
@@ -110,6 +194,9 @@ class AgentStream:
             await runner_task  # Ensure completion
 
         finally:
+            if self.channel.dropped or self.channel.coalesced:
+                log.debug(f"{type(self).__name__} channel stats: {self.channel.stats()}")
+
             # Cancel runner if streaming is interrupted (e.g., client disconnect)
             if not runner_task.done():
                 runner_task.cancel()
@@ -125,10 +212,11 @@ class AGUIStream(AgentStream):
     Adds AGUI lifecycle events and formats as Server-Sent Events (SSE).
     """
 
-    def __init__(self, agent: "Agent", task: "Task"):
-        super().__init__(agent, task)
+    def __init__(self, agent: "Agent", task: "Task", threads: "Threads | None" = None):
+        super().__init__(agent, task, threads)
         self.run_id = str(uuid4())
-        self.thread_id = "_"  # TODOV2: should come from request/session
+        # a run without a server-side thread is a thread of its own
+        self.thread_id = task.thread_id or str(uuid4())
 
     async def _before_run(self) -> AsyncGenerator[Any, None]:
         """Emit RunStartedEvent before agent execution."""
@@ -1,72 +1,298 @@
+"""
+MCP client side: a pool of live sessions, one per user and per server.
+
+Opening an MCP session means a connection plus the `initialize` handshake, so
+doing it for every agent run (or every tool call) adds a round trip or more to
+each of them. `MCPClients` keeps each session open once initialized and reuses
+it across runs and tool calls:
+
+- sessions are keyed by (user id, server name) and reopened when the server
+  configuration changes;
+- at most `config.MCP_SESSION_CONCURRENCY` requests run at once on a session;
+- a background task pings idle sessions every `config.MCP_KEEPALIVE` seconds
+  (keepalive and health check in one), and a session idle for more than
+  `config.MCP_KEEPALIVE` is pinged again before being reused; a session that
+  does not answer is closed and reopened on the next use;
+- sessions unused for `config.MCP_IDLE_TIMEOUT` seconds are closed, and all of
+  them at shutdown.
+
+Agents see the servers of their user through an `MCPUserClient`, which lists
+and calls tools across them. Tool listings are cached per server configuration
+for `config.MCP_TOOLS_CACHE_TTL` seconds, or until the server sends
+`notifications/tools/list_changed`.
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
 from cachetools import TTLCache
-from fastmcp import FastMCP, Client
+from fastmcp import Client
+from fastmcp.client.messages import MessageHandler
+from mcp.types import Tool as MCPTool
+
+from cat import config, log
+
+
+# Seconds a health check waits for the pong.
+PING_TIMEOUT = 10
+
+
+def listing_key(name: str, server_config: Any) -> tuple:
+    """Cache key of the tools of a server configuration."""
+    if isinstance(server_config, dict):
+        return (name, json.dumps(server_config, sort_keys=True, default=str))
+    return (name, server_config)
+
+
+class ToolListChanged(MessageHandler):
+    """Calls back when the server says its tools changed."""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    async def on_tool_list_changed(self, message) -> None:
+        self.callback()
+
+
+class MCPSession:
+    """A live, initialized session of one user with one MCP server."""
+
+    def __init__(self, name: str, server_config: Any, on_tools_changed=None):
+        self.name = name
+        self.config = server_config
+        if isinstance(server_config, dict):
+            server_config = {"mcpServers": {name: server_config}}
+        self.client = Client(
+            server_config,
+            message_handler=on_tools_changed and ToolListChanged(on_tools_changed),
+        )
+        self.limit = asyncio.Semaphore(config.MCP_SESSION_CONCURRENCY)
+        self.active = 0
+        self.last_used = self.last_checked = time.monotonic()
+
+    async def open(self) -> None:
+        # entered once and left open: fastmcp keeps the session in a
+        # background task until `close()`
+        await self.client.__aenter__()
+
+    async def close(self) -> None:
+        try:
+            await self.client.close()
+        except Exception as e:
+            log.warning(f"Error closing MCP session {self.name}: {e}")
 
+    @property
+    def connected(self) -> bool:
+        return self.client.is_connected()
 
-# necessary in case of empty client config
-empty_server = FastMCP("EmptyServer")
+    def idle_for(self) -> float:
+        return time.monotonic() - max(self.last_used, self.last_checked)
 
+    async def healthy(self) -> bool:
+        """Ping the server; doubles as keepalive."""
+        self.last_checked = time.monotonic()
+        try:
+            async with self.limit:
+                return await asyncio.wait_for(self.client.ping(), PING_TIMEOUT)
+        except Exception as e:
+            log.warning(f"MCP session {self.name} is not answering: {e}")
+            return False
 
-class MCPClient(Client):
-    """Cat MCP client is scoped by user_id and does not keep a live connection to servers.
-        We use caches waiting for the protocol to become stateless.
+    async def request(self, method: str, *args):
+        """Run a client method on the session, within its concurrency limit."""
+        async with self.limit:
+            self.active += 1
+            try:
+                return await getattr(self.client, method)(*args)
+            finally:
+                self.active -= 1
+                self.last_used = time.monotonic()
+
+
+class MCPUserClient:
+    """The MCP servers of the current user, as seen by an agent run.
+
+    Sessions are taken from the pool on first use, so runs of agents without
+    MCP servers never connect. Tool names are prefixed with the server name
+    when there is more than one server.
     """
 
-    def __init__(self, config):
+    def __init__(self, pool: "MCPClients", servers: Dict[str, Any]):
+        self.pool = pool
+        self.user_id: str | None = None
+        self.servers = servers
+        self.routes: Dict[str, tuple[str, str]] = {}
+
+    async def __aenter__(self) -> "MCPUserClient":
+        self.user_id = await self.pool._user_id()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        # sessions stay open in the pool
+        pass
 
-        # TODO: get addresses / tokens / api keys from DB
-        self.config = config
-        if len(config["mcpServers"]) == 0:
-            super().__init__(empty_server)
+    async def list_tools(self) -> List[MCPTool]:
+        listings = await asyncio.gather(*[
+            self._list_tools(name, server_config)
+            for name, server_config in self.servers.items()
+        ])
+        return [t for listing in listings for t in listing]
+
+    async def _list_tools(self, name: str, server_config: Any) -> List[MCPTool]:
+        tools = await self.pool.list_tools(self.user_id, name, server_config)
+        if len(self.servers) > 1:
+            tools = [t.model_copy(update={"name": f"{name}_{t.name}"}) for t in tools]
+            for t in tools:
+                self.routes[t.name] = (name, t.name[len(name) + 1:])
         else:
-            super().__init__(config)
+            self.routes.update({t.name: (name, t.name) for t in tools})
+        return tools
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]):
+        if name not in self.routes:
+            raise ValueError(f"Unknown MCP tool {name}")
+        server, tool_name = self.routes[name]
+        session = await self.pool.session(self.user_id, server, self.servers[server])
+        return await session.request("call_tool", tool_name, arguments)
 
 
-class MCPClients():
-    """Keep a cache of user scoped MCP clients"""
+class MCPClients:
+    """Process-wide pool of MCP sessions, per user and per server."""
 
     def __init__(self):
-        self.clients = TTLCache(maxsize=1000, ttl=60*10)
-    
-    def get_user_client(self, agent) -> MCPClient:
+        self.sessions: Dict[tuple[str, str], MCPSession] = {}
+        self.locks: Dict[tuple[str, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.reaper: asyncio.Task | None = None
+        self.opened = 0
+        self.reused = 0
+        self.evicted = 0
 
-        need_new, config = self.need_new_client(agent)
-        user_id = self._user_id()
-        if need_new:
-            self.clients[user_id] = MCPClient(config)
+        # tools of each server configuration
+        self.listings = TTLCache(maxsize=1000, ttl=config.MCP_TOOLS_CACHE_TTL)
+        self.listing_hits = 0
+        self.listing_misses = 0
 
-        return self.clients[user_id]
+    def get_user_client(self, agent) -> MCPUserClient:
+        return MCPUserClient(self, self.server_configs(agent))
 
-    def _user_id(self):
+    async def _user_id(self) -> str:
         """Current user id, sourced from the request context."""
         from cat.ambient.context_vars import ctx
-        return ctx().user.id
+        return str((await ctx().get_user()).id)
 
-    def need_new_client(self, agent) -> tuple[bool, dict]:
-
-        config = {
-            "mcpServers": {}
-        }
+    def server_configs(self, agent) -> Dict[str, Any]:
+        """MCP servers available to the agent, by name."""
 
+        servers = {}
         for slug, server_config in {}: # TODOV2 RECOVER
-            config["mcpServers"][slug] = {
+            servers[slug] = {
                 "url": str(server_config.url)
             }
         for server_config in []: # TODOV2 RECOVER
-            config["mcpServers"][server_config.name] = {
+            servers[server_config.name] = {
                 "url": str(server_config.url)
             }
+        return servers
 
-        user_id = self._user_id()
-        need_new = (user_id not in self.clients) \
-            or self.clients[user_id].config != config
+    async def session(self, user_id: str, name: str, server_config: Any) -> MCPSession:
+        """The open session of a user with a server, opened if needed."""
+        key = (user_id, name)
+        async with self.locks[key]:
+            session = self.sessions.get(key)
+            if session is not None:
+                stale = session.config != server_config or not session.connected
+                if stale or (
+                    session.idle_for() > config.MCP_KEEPALIVE
+                    and not await session.healthy()
+                ):
+                    await self._evict(key)
+                    session = None
 
-        return (
-            need_new,
-            config
-        )
-        
+            if session is None:
+                session = MCPSession(
+                    name, server_config,
+                    on_tools_changed=lambda: self.forget_tools(name, server_config),
+                )
+                await session.open()
+                self.sessions[key] = session
+                self.opened += 1
+            else:
+                self.reused += 1
 
-    
-        
+            self._start_reaper()
+            return session
 
-    
+    async def list_tools(self, user_id: str, name: str, server_config: Any) -> List[MCPTool]:
+        """Tools of a server, listed on the user's session unless cached."""
+        key = listing_key(name, server_config)
+        tools = self.listings.get(key)
+        if tools is not None:
+            self.listing_hits += 1
+            return tools
+
+        self.listing_misses += 1
+        session = await self.session(user_id, name, server_config)
+        tools = await session.request("list_tools")
+        self.listings[key] = tools
+        return tools
+
+    def forget_tools(self, name: str, server_config: Any) -> None:
+        self.listings.pop(listing_key(name, server_config), None)
+
+    def _start_reaper(self) -> None:
+        if self.reaper is None or self.reaper.done():
+            self.reaper = asyncio.create_task(self._reap())
+
+    async def _reap(self) -> None:
+        """Ping idle sessions, close dead and long unused ones."""
+        while self.sessions:
+            await asyncio.sleep(config.MCP_KEEPALIVE)
+            await self.sweep()
+
+    async def sweep(self) -> None:
+        for key in list(self.sessions):
+            async with self.locks[key]:
+                session = self.sessions.get(key)
+                if session is None or session.active:
+                    continue
+                if time.monotonic() - session.last_used > config.MCP_IDLE_TIMEOUT:
+                    await self._evict(key)
+                elif session.idle_for() >= config.MCP_KEEPALIVE and not await session.healthy():
+                    await self._evict(key)
+            self._drop_lock(key)
+
+    async def _evict(self, key: tuple[str, str]) -> None:
+        session = self.sessions.pop(key, None)
+        if session is not None:
+            self.evicted += 1
+            await session.close()
+
+    def _drop_lock(self, key: tuple[str, str]) -> None:
+        """Forget the lock of a key without a session, unless someone holds it,
+        so `locks` does not grow with every user and server ever seen."""
+        lock = self.locks.get(key)
+        if lock is not None and key not in self.sessions and not lock.locked():
+            del self.locks[key]
+
+    async def close(self) -> None:
+        """Close all sessions (at shutdown)."""
+        if self.reaper is not None:
+            self.reaper.cancel()
+            self.reaper = None
+        for key in list(self.sessions):
+            await self._evict(key)
+        self.locks.clear()
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "opened": self.opened,
+            "reused": self.reused,
+            "evicted": self.evicted,
+            "listings": len(self.listings),
+            "listing_hits": self.listing_hits,
+            "listing_misses": self.listing_misses,
+        }
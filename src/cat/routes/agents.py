@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 from inspect import isclass
 
 from pydantic import BaseModel
@@ -8,6 +8,8 @@ from cat.auth.depends import _get_user
 from cat.ambient.runtime import ccat
 from cat.types import Task, TaskResult
 from cat.protocols.agui.streaming import AGUIStream
+from cat.mad_hatter.decorators.tool import class_tools
+from cat.services.threads.base import Threads
 
 
 router = APIRouter(prefix="/agents", tags=["Agents"])
@@ -43,6 +45,23 @@ async def list_agents(
     return agents
 
 
+class ToolCacheStats(BaseModel):
+    mcp: Dict[str, int]
+    agent_classes: Dict[str, int]
+
+
+@router.get("/tools/cache")
+async def tool_cache_stats(
+    _=_get_user(role="admin"),
+) -> ToolCacheStats:
+    """Tool catalog counters for this process: MCP sessions and tool listings,
+    and agent classes whose tools were collected."""
+    return ToolCacheStats(
+        mcp=ccat().mcp_clients.stats(),
+        agent_classes=class_tools.stats(),
+    )
+
+
 @router.post("/{slug}/message")
 async def agent_message(
     slug: str,
@@ -61,6 +80,18 @@ async def agent_message(
                     "stream": False,
                 }
             },
+            "thread": {
+                "summary": "Next turn of a server-side thread",
+                "value": {
+                    "thread_id": "3f1c2a9e-5b7d-4e8a-9c0f-1a2b3c4d5e6f",
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": [{"type": "text", "text": "And tomorrow?"}]
+                        }
+                    ],
+                }
+            },
             "with_args": {
                 "summary": "Message with agent args",
                 "value": {
@@ -77,7 +108,11 @@ async def agent_message(
     ),
     _=_get_user(),
 ) -> TaskResult:
-    """Send a message to a specific agent identified by its slug."""
+    """Send a message to a specific agent identified by its slug.
+
+    With a `thread_id`, send only the new messages: the history is kept
+    server-side, and the result holds only the agent's new replies.
+    """
 
     agent = await ccat().get("agents", slug, raise_error=False)
     if agent is None:
@@ -86,7 +121,30 @@ async def agent_message(
             detail=f"Agent '{slug}' not found."
         )
 
+    threads = None
+    if task.thread_id is not None:
+        threads = await get_threads()
+        # checked here, before a stream starts and an error could only be an event
+        if await threads.history(task.thread_id) is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Thread '{task.thread_id}' not found."
+            )
+
     if task.stream:
-        return AGUIStream(agent, task).stream()
+        return AGUIStream(agent, task, threads).stream()
+    elif threads is not None:
+        return await threads.run(agent, task)
     else:
         return await agent(task)
+
+
+async def get_threads() -> Threads:
+    """The thread storage: the plugin one if installed, else the core default.
+
+    With several plugins providing threads, the highest `priority` wins, then
+    the first slug in alphabetical order.
+    """
+    classes = ccat().registry.classes["threads"]
+    slug = min(classes, key=lambda s: (-classes[s].priority, s))
+    return await ccat().get("threads", slug)
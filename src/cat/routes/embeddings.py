@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from fastapi import APIRouter
+
+from cat.auth.depends import _get_user
+from cat.db.embeddings import embedding_cache
+
+router = APIRouter(prefix="/embeddings", tags=["Embeddings"])
+
+
+class EmbeddingCacheStats(BaseModel):
+    size: int
+    memory_hits: int
+    db_hits: int
+    misses: int
+    hit_rate: float
+
+
+class EmbeddingCachePurge(BaseModel):
+    deleted: int
+
+
+@router.get("/cache")
+async def embedding_cache_stats(
+    user=_get_user(role="admin"),
+) -> EmbeddingCacheStats:
+    """Embedding cache counters for this process (hits per tier, misses, hit rate)."""
+    return EmbeddingCacheStats(**embedding_cache.stats())
+
+
+@router.delete("/cache")
+async def purge_embedding_cache(
+    provider: str | None = None,
+    model: str | None = None,
+    user=_get_user(role="admin"),
+) -> EmbeddingCachePurge:
+    """Drop cached embeddings, all of them or only one provider's / model's.
+    Needed when a provider starts returning different vectors for the same model."""
+    deleted = await embedding_cache.purge(provider=provider, model=model)
+    return EmbeddingCachePurge(deleted=deleted)
@@ -0,0 +1,23 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+from fastapi import APIRouter
+
+from cat.auth.api_keys import ApiKeys
+from cat.auth.depends import _get_user
+
+router = APIRouter(prefix="/keys", tags=["User"])
+
+
+class ApiKeysRevoked(BaseModel):
+    deleted: int
+
+
+@router.delete("/users/{user_id}")
+async def revoke_user_api_keys(
+    user_id: UUID,
+    user=_get_user(role="admin"),
+) -> ApiKeysRevoked:
+    """Delete every API key of a user, e.g. after changing their roles: keys
+    keep the roles they were created with. They stop working right away."""
+    return ApiKeysRevoked(deleted=await ApiKeys.delete_user_keys(user_id))
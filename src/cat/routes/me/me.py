@@ -1,6 +1,12 @@
-from fastapi import APIRouter
+from datetime import datetime
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Body, HTTPException
+from pydantic import BaseModel
 
 from cat.auth import User
+from cat.auth.api_keys import ApiKeys
 from cat.auth.depends import _get_user
 
 router = APIRouter(prefix="/me", tags=["User"])
@@ -11,3 +17,59 @@ async def get_user_info(
 ) -> User:
     """Returns user information."""
     return user
+
+
+class ApiKey(BaseModel):
+    id: UUID
+    prefix: str
+    name: str
+    roles: List[str]
+    created_at: datetime
+
+
+class NewApiKey(ApiKey):
+    # the key itself, shown only now
+    key: str
+
+
+class ApiKeyRequest(BaseModel):
+    name: str
+    # roles granted to the key, among the user's; all of them if omitted
+    roles: List[str] | None = None
+
+
+@router.get("/keys")
+async def list_api_keys(
+    user: User = _get_user(),
+) -> List[ApiKey]:
+    """The API keys of the user (never the keys themselves)."""
+    return [ApiKey(**k) for k in await ApiKeys.list(user.id)]
+
+
+@router.post("/keys")
+async def create_api_key(
+    request: ApiKeyRequest = Body(...),
+    user: User = _get_user(),
+) -> NewApiKey:
+    """Create an API key acting as the user. The key is only returned here.
+
+    The key gets the requested roles (all of the user's if omitted) as they
+    are now: later changes to the user's roles do not reach it. An admin can
+    delete all keys of a user at `DELETE /keys/users/{user_id}`.
+    """
+    if request.roles is not None and not user.is_admin():
+        missing = set(request.roles) - set(user.roles)
+        if missing:
+            raise HTTPException(status_code=403, detail=f"Roles not held: {sorted(missing)}")
+    key, record = await ApiKeys.create(user, request.name, request.roles)
+    return NewApiKey(key=key, **record)
+
+
+@router.delete("/keys/{id}")
+async def delete_api_key(
+    id: UUID,
+    user: User = _get_user(),
+):
+    """Delete an API key of the user; it stops working right away."""
+    if not await ApiKeys.delete(user.id, id):
+        raise HTTPException(status_code=404, detail="API key not found")
@@ -1,19 +1,125 @@
+"""
+API docs: the OpenAPI document and the RapiDoc playground.
 
+Generating the schema walks every route and model, too slow to do on the event
+loop while plugins come and go. `OpenAPIDocument` builds it in a worker thread,
+the first time it is asked for and then in the background, each time the
+routes change (`invalidate()`, called by `CheshireCat.refresh_endpoints`).
+It is kept serialized: `/openapi.json` serves the ready bytes with an
+`ETag`, and answers 304 to clients that have them already. A request arriving
+mid-rebuild waits for it, without blocking other requests. A failed build is
+logged, and reported to the requests waiting for it.
+"""
+
+import asyncio
+import hashlib
+import json
 from importlib.metadata import metadata
-from fastapi import FastAPI, APIRouter, Request
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, APIRouter, Request, Response
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import HTMLResponse
 
+from cat import log
+
 router = APIRouter()
 
 FAVICON = "https://cheshirecat.ai/wp-content/uploads/2023/10/Logo-Cheshire-Cat.svg"
 RAPIDOC_JS = "https://unpkg.com/rapidoc/dist/rapidoc-min.js"
 
 
+class OpenAPIDocument:
+    """The OpenAPI schema of an app, rebuilt off the event loop on route changes."""
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self.body: bytes | None = None
+        self.etag: str | None = None
+        self.builds = 0
+        # bumped on every route change; a build is current if it saw the last one
+        self.version = 0
+        self._built = -1
+        self._error: Exception | None = None
+        self._task: asyncio.Task | None = None
+
+    def invalidate(self) -> None:
+        """Routes changed: rebuild in the background, if it was ever asked for."""
+        self.version += 1
+        self.app.openapi_schema = None
+        if self.body is None:
+            return  # built on first request
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop (yet): built on first request
+        self._start()
+
+    async def get(self) -> tuple[bytes, str]:
+        """The serialized schema and its ETag, waiting for a pending build."""
+        while self._built != self.version:
+            self._start()
+            await asyncio.shield(self._task)
+            if self._error is not None:
+                raise RuntimeError("Could not build the OpenAPI schema") from self._error
+        return self.body, self.etag
+
+    def _start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._build())
+
+    async def _build(self) -> None:
+        while self._built != self.version:
+            version = self.version
+            # snapshot on the loop: the thread never sees routes mid-change
+            routes = list(self.app.routes)
+            try:
+                schema, body = await asyncio.to_thread(_serialize, self.app, routes)
+            except Exception as e:
+                # background task: log it here, `get()` raises it to requests
+                log.error(f"Could not build the OpenAPI schema: {e}")
+                self._error = e
+                return
+            self._error = None
+            self.builds += 1
+            if version == self.version:
+                self.app.openapi_schema = schema
+                self.body = body
+                self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+                self._built = version
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def document(app: FastAPI) -> OpenAPIDocument:
+    """The OpenAPI document of `app`, created on first use."""
+    doc = getattr(app.state, "openapi_document", None)
+    if doc is None:
+        doc = app.state.openapi_document = OpenAPIDocument(app)
+    return doc
+
+
+@router.get("/openapi.json", include_in_schema=False)
+async def openapi_json(r: Request) -> Response:
+    body, etag = await document(r.app).get()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _matches(r.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Whether an `If-None-Match` header lists `etag` (weak comparison)."""
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in (t.removeprefix("W/") for t in tags)
+
+
 # Endpoint playground
 @router.get("/docs", include_in_schema=False)
 async def swagger_docs(r: Request):
-    r.app.openapi = get_openapi_configuration_function(r.app)
     return HTMLResponse(
         f"""
         <!DOCTYPE html>
@@ -52,42 +158,53 @@ async def swagger_docs(r: Request):
         """
     )
 
-def get_openapi_configuration_function(cheshire_cat_api: FastAPI):
-    # Configure openAPI schema for swagger and redoc
-    def custom_openapi():
-        if cheshire_cat_api.openapi_schema:
-            return cheshire_cat_api.openapi_schema
-
-        meta = metadata("cheshire-cat-ai")
-
-        openapi_schema = get_openapi(
-            title=f"🐱 Cheshire Cat AI - {meta.get('version')}",
-            version=meta.get("version", "unknown"),
-            description=meta.get("Summary"),
-            routes=cheshire_cat_api.routes,
-            external_docs={
-                "description": "Cheshire Cat AI Documentation",
-                "url": "https://cheshire-cat-ai.github.io/docs/",
-            }
-        )
-
-        # Auth now happens in the context middleware, not via a FastAPI security
-        # dependency, so FastAPI no longer emits this on its own. Declare it by
-        # hand so /docs shows the "Authorize" form: paste the master API key or a
-        # JWT and it's sent as `Authorization: Bearer <credential>` (see Auth.get_credential).
-        # The session cookie is handled separately by the requestInterceptor in
-        # /docs (httponly cookies can't be set from the Authorize dialog).
-        openapi_schema.setdefault("components", {})["securitySchemes"] = {
-            "BearerAuth": {
-                "type": "http",
-                "scheme": "bearer",
-                "bearerFormat": "JWT",
-                "description": "Master API key or a core-signed JWT.",
-            },
+
+def _serialize(app: FastAPI, routes: List) -> tuple[Dict[str, Any], bytes]:
+    schema = build_openapi_schema(app, routes)
+    return schema, json.dumps(schema, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def build_openapi_schema(app: FastAPI, routes: List | None = None) -> Dict[str, Any]:
+    """Configure openAPI schema for the docs."""
+
+    meta = metadata("cheshire-cat-ai")
+
+    openapi_schema = get_openapi(
+        title=f"🐱 Cheshire Cat AI - {meta.get('version')}",
+        version=meta.get("version", "unknown"),
+        description=meta.get("Summary"),
+        routes=app.routes if routes is None else routes,
+        external_docs={
+            "description": "Cheshire Cat AI Documentation",
+            "url": "https://cheshire-cat-ai.github.io/docs/",
         }
-        openapi_schema["security"] = [{"BearerAuth": []}]
+    )
+
+    # Auth now happens in the context middleware, not via a FastAPI security
+    # dependency, so FastAPI no longer emits this on its own. Declare it by
+    # hand so /docs shows the "Authorize" form: paste the master API key or a
+    # JWT and it's sent as `Authorization: Bearer <credential>` (see Auth.get_credential).
+    # The session cookie is handled separately by the requestInterceptor in
+    # /docs (httponly cookies can't be set from the Authorize dialog).
+    openapi_schema.setdefault("components", {})["securitySchemes"] = {
+        "BearerAuth": {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT",
+            "description": "Master API key or a core-signed JWT.",
+        },
+    }
+    openapi_schema["security"] = [{"BearerAuth": []}]
+
+    return openapi_schema
 
-        cheshire_cat_api.openapi_schema = openapi_schema
+
+def get_openapi_configuration_function(cheshire_cat_api: FastAPI):
+    """`app.openapi` for in-process callers: the last built schema, or a
+    synchronous build when there is none."""
+    def custom_openapi():
+        if cheshire_cat_api.openapi_schema is None:
+            cheshire_cat_api.openapi_schema = build_openapi_schema(cheshire_cat_api)
         return cheshire_cat_api.openapi_schema
 
     return custom_openapi
@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException, Body
 
 from cat.auth.depends import _get_user
 from cat.ambient.runtime import ccat
+from cat.services.service import load_many_settings
 
 router = APIRouter(prefix="/settings", tags=["Settings"])
 
@@ -41,26 +42,27 @@ async def list_settings(
     schemas. One resolution path — `settings_schema()` — for both static and
     dynamic schemas.
     """
-    entries = []
-
+    schemas = {}
     for service_type, service_dict in ccat().registry.classes.items():
         for slug, ServiceClass in service_dict.items():
-
             model = await ServiceClass.settings_schema()
-            if model is None:
-                continue
-
-            current = await ServiceClass.load_settings()
-
-            entries.append(SettingsEntry(
-                id=_make_id(ServiceClass.plugin_id, service_type, slug),
-                slug=slug,
-                type=service_type,
-                name=ServiceClass.name or ServiceClass.__name__,
-                plugin_id=ServiceClass.plugin_id,
-                value=current.model_dump(mode="json"),
-                schema=model.model_json_schema(),
-            ))
+            if model is not None:
+                schemas[ServiceClass] = model
+
+    # one DB query for every service's stored settings
+    current = await load_many_settings(schemas)
+
+    entries = []
+    for ServiceClass, model in schemas.items():
+        entries.append(SettingsEntry(
+            id=_make_id(ServiceClass.plugin_id, ServiceClass.service_type, ServiceClass.slug),
+            slug=ServiceClass.slug,
+            type=ServiceClass.service_type,
+            name=ServiceClass.name or ServiceClass.__name__,
+            plugin_id=ServiceClass.plugin_id,
+            value=current[ServiceClass].model_dump(mode="json"),
+            schema=model.model_json_schema(),
+        ))
 
     return entries
 
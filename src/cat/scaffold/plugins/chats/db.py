@@ -1,16 +1,342 @@
-from piccolo.columns import JSON
+from piccolo.table import Table
+from piccolo.query import WhereRaw
+from piccolo.columns import JSON, Text, Integer, UUID, Varchar
 
 from cat.db import UserScopedDB
+from cat.db.database import DB
+from cat.types import Message
 
 
 class ChatDB(UserScopedDB):
-    """A saved conversation: its messages and the context they ran in."""
+    """A saved conversation and the context it ran in.
 
-    messages = JSON()
+    Its messages are rows of `ChatMessageDB`; `messages` only holds those of
+    chats saved before that table existed, until `migrate_messages` moves them.
+
+    The last three columns are derived from `name` and the messages and written
+    with them (see `derived_columns`, `append_messages`): `search_text` (name +
+    message text) is indexed for full-text search (see `create_search_index`),
+    `message_count` and `last_message` let listings skip the messages.
+    `message_count` also hands out the `seq` of appended messages.
+    """
+
+    messages = JSON(default=[])
     context = JSON()
+    search_text = Text(null=True, default=None)
+    message_count = Integer(null=True, default=None)
+    last_message = Text(null=True, default=None)
 
     class Meta:
         tablename = "ccat_chats"
 
 
+class ChatMessageDB(Table, db=DB):
+    """One message of a chat, at position `seq` (0, 1, ...) in the conversation.
+
+    Append-only in the common case: a new turn inserts its rows instead of
+    rewriting the whole history. `content` holds the rest of the message
+    (`content` blocks, `tool_calls`, `tool_call_id`).
+    """
+
+    chat_id = UUID(index=True)
+    seq = Integer()
+    role = Varchar(length=16)
+    content = JSON()
+
+    class Meta:
+        tablename = "ccat_chat_messages"
+
+
+# Composite unique index on `ccat_chat_messages (chat_id, seq)`.
+MESSAGE_INDEX = "ccat_chat_messages_chat_id_seq"
+
+# Length of `last_message`, in characters.
+SNIPPET_LENGTH = 200
+
+# Full-text index: an FTS5 table on SQLite, a GIN expression index on Postgres.
+# `ccat_chats` has no INTEGER PRIMARY KEY, so its rowids may change on VACUUM:
+# FTS rows are keyed by their own stable integer, mapped to chat ids.
+FTS_TABLE = "ccat_chats_search_fts"
+FTS_IDS = "ccat_chats_search_ids"
+GIN_INDEX = "ccat_chats_search"
+
+# Earlier FTS5 table, keyed by the rowid of `ccat_chats`.
+LEGACY_FTS_TABLE = "ccat_chats_fts"
+
+
+def is_sqlite() -> bool:
+    return ChatDB._meta.db.engine_type == "sqlite"
+
+
+def message_text(message) -> str:
+    """The text blocks of a message (dict or `Message`), one per line."""
+    if not isinstance(message, dict):
+        message = message.model_dump()
+    return "\n".join(
+        block["text"] for block in message.get("content") or []
+        if block.get("type") == "text" and block.get("text")
+    )
+
+
+def derived_columns(name: str, messages: list) -> dict:
+    """Values of the denormalized columns for a chat with these name/messages."""
+    texts = [message_text(m) for m in messages or []]
+    return {
+        "search_text": "\n".join([name or ""] + [t for t in texts if t]),
+        "message_count": len(texts),
+        "last_message": texts[-1][:SNIPPET_LENGTH] if texts else "",
+    }
+
+
+def message_record(message) -> dict:
+    """A message (dict or `Message`) as stored: JSON-ready, `text` left out."""
+    if isinstance(message, dict):
+        message = Message(**message)
+    return message.model_dump(mode="json", exclude={"text"})
+
+
+def message_rows(chat_id, start: int, messages: list) -> list[ChatMessageDB]:
+    rows = []
+    for seq, message in enumerate(messages, start):
+        record = message_record(message)
+        rows.append(ChatMessageDB(
+            chat_id=chat_id, seq=seq, role=record.pop("role"), content=record
+        ))
+    return rows
+
+
+async def load_messages(chat_ids: list) -> dict:
+    """Messages of each chat, in order, as `{chat_id: [message, ...]}`."""
+    messages = {chat_id: [] for chat_id in chat_ids}
+    if not chat_ids:
+        return messages
+    rows = await (
+        ChatMessageDB.select(ChatMessageDB.chat_id, ChatMessageDB.role, ChatMessageDB.content)
+        .where(ChatMessageDB.chat_id.is_in(list(chat_ids)))
+        .order_by(ChatMessageDB.chat_id, ChatMessageDB.seq)
+        .output(load_json=True)
+    )
+    for row in rows:
+        messages[row["chat_id"]].append({"role": row["role"], **row["content"]})
+    return messages
+
+
+async def stream_messages(chat_id, start: int = 0, batch: int = 100):
+    """Yield the messages of a chat from position `start` on, in order,
+    reading `batch` rows at a time (keyset on `seq`)."""
+    while True:
+        rows = await (
+            ChatMessageDB.select(ChatMessageDB.seq, ChatMessageDB.role, ChatMessageDB.content)
+            .where(ChatMessageDB.chat_id == chat_id)
+            .where(ChatMessageDB.seq >= start)
+            .order_by(ChatMessageDB.seq)
+            .limit(batch)
+            .output(load_json=True)
+        )
+        for row in rows:
+            yield {"role": row["role"], **row["content"]}
+        if len(rows) < batch:
+            return
+        start = rows[-1]["seq"] + 1
+
+
+async def append_messages(chat_id, user_id, messages: list) -> dict | None:
+    """Append `messages` to a chat of `user_id` and update its derived columns.
+
+    Bumping `message_count` reserves the `seq` range of the new rows in the
+    same statement that checks ownership, so concurrent appends never collide.
+    Returns the chat summary, None if there is no such chat.
+    """
+    texts = [message_text(m) for m in messages]
+    values = {ChatDB.message_count: ChatDB.message_count + len(messages)}
+    if texts:
+        values[ChatDB.last_message] = texts[-1][:SNIPPET_LENGTH]
+    if any(texts):
+        values[ChatDB.search_text] = (
+            ChatDB.search_text + "".join("\n" + t for t in texts if t)
+        )
+
+    async with ChatDB._meta.db.transaction():
+        rows = await (
+            ChatDB.update(values)
+            .where(ChatDB.id == chat_id)
+            .where(ChatDB.user_id == user_id)
+            .returning(
+                ChatDB.id, ChatDB.name, ChatDB.updated_at,
+                ChatDB.message_count, ChatDB.last_message,
+            )
+        )
+        if not rows:
+            return None
+        chat = rows[0]
+        if messages:
+            start = chat["message_count"] - len(messages)
+            await ChatMessageDB.insert(*message_rows(chat_id, start, messages))
+    return chat
+
+
+async def insert_chat(user_id, name: str, messages: list, context: dict, id=None) -> ChatDB:
+    """Save a new chat with its messages."""
+    obj = ChatDB(
+        name=name,
+        context=context,
+        **derived_columns(name, messages),
+        user_id=user_id,
+    )
+    if id is not None:
+        obj.id = id
+    async with ChatDB._meta.db.transaction():
+        await obj.save()
+        await replace_messages(obj.id, messages)
+    return obj
+
+
+async def ensure_chat(user_id, name: str, id) -> None:
+    """Create an empty chat with this id, unless one exists already.
+
+    A single `INSERT ... ON CONFLICT DO NOTHING`, so concurrent creators of
+    the same chat (two first turns of a thread) never collide.
+    """
+    await ChatDB.insert(
+        ChatDB(id=id, name=name, context={}, user_id=user_id, **derived_columns(name, []))
+    ).on_conflict(action="DO NOTHING")
+
+
+async def replace_messages(chat_id, messages: list) -> None:
+    """Make `messages` the messages of a chat, rewriting only what changed:
+    rows of the common prefix with the stored history stay untouched."""
+    records = [message_record(m) for m in messages]
+    stored = (await load_messages([chat_id]))[chat_id]
+
+    keep = 0
+    for old, new in zip(stored, records):
+        if old != new:
+            break
+        keep += 1
+
+    if keep < len(stored):
+        await ChatMessageDB.delete().where(
+            (ChatMessageDB.chat_id == chat_id) & (ChatMessageDB.seq >= keep)
+        )
+    if keep < len(records):
+        await ChatMessageDB.insert(*message_rows(chat_id, keep, records[keep:]))
+
+
+def add_missing_columns():
+    """Add columns introduced after the table was first created."""
+    table = ChatDB._meta.tablename
+    if is_sqlite():
+        rows = ChatDB.raw(f"PRAGMA table_info({table})").run_sync()
+    else:
+        rows = ChatDB.raw(
+            "SELECT column_name AS name FROM information_schema.columns "
+            "WHERE table_name = {}", table
+        ).run_sync()
+    existing = {r["name"] for r in rows}
+    for column in ChatDB._meta.columns:
+        name = column._meta.db_column_name
+        if name not in existing:
+            ChatDB.raw(
+                f"ALTER TABLE {table} ADD COLUMN {name} {column.column_type}"
+            ).run_sync()
+
+
+def backfill_derived_columns():
+    """Fill the derived columns of chats saved before they existed."""
+    rows = (
+        ChatDB.select(ChatDB.id, ChatDB.name, ChatDB.messages)
+        .where(ChatDB.search_text.is_null() | ChatDB.message_count.is_null())
+        .output(load_json=True)
+        .run_sync()
+    )
+    for row in rows:
+        values = derived_columns(row["name"], row["messages"])
+        ChatDB.update(
+            {getattr(ChatDB, column): value for column, value in values.items()}
+        ).where(ChatDB.id == row["id"]).run_sync()
+
+
+def create_message_index():
+    ChatMessageDB.raw(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {MESSAGE_INDEX} "
+        f"ON {ChatMessageDB._meta.tablename} (chat_id, seq)"
+    ).run_sync()
+
+
+def migrate_messages():
+    """Move messages still in the `ChatDB.messages` column to `ChatMessageDB`.
+
+    Each chat's rows are replaced before its column is emptied, so a migration
+    interrupted halfway is simply redone on the next start.
+    """
+    column = "messages" if is_sqlite() else "messages::text"
+    rows = (
+        ChatDB.select(ChatDB.id, ChatDB.messages)
+        .where(WhereRaw(f"{column} NOT IN ('[]', '{{}}')"))
+        .output(load_json=True)
+        .run_sync()
+    )
+    for row in rows:
+        ChatMessageDB.delete().where(ChatMessageDB.chat_id == row["id"]).run_sync()
+        if row["messages"]:
+            ChatMessageDB.insert(*message_rows(row["id"], 0, row["messages"])).run_sync()
+        ChatDB.update({ChatDB.messages: []}).where(ChatDB.id == row["id"]).run_sync()
+
+
+def create_search_index():
+    table = ChatDB._meta.tablename
+    if not is_sqlite():
+        ChatDB.raw(
+            f"CREATE INDEX IF NOT EXISTS {GIN_INDEX} ON {table} "
+            "USING GIN (to_tsvector('simple', coalesce(search_text, '')))"
+        ).run_sync()
+        return
+
+    exists = ChatDB.raw(
+        "SELECT 1 FROM sqlite_master WHERE name = {}", FTS_TABLE
+    ).run_sync()
+    if exists:
+        return
+
+    ChatDB.raw(f"DROP TABLE IF EXISTS {LEGACY_FTS_TABLE}").run_sync()
+    for suffix in ("ai", "ad", "au"):
+        ChatDB.raw(f"DROP TRIGGER IF EXISTS {LEGACY_FTS_TABLE}_{suffix}").run_sync()
+
+    # the FTS table keeps its own copy of the text; triggers keep it in sync
+    # with every insert, update and delete
+    ChatDB.raw(
+        f"CREATE TABLE IF NOT EXISTS {FTS_IDS} "
+        "(rowid INTEGER PRIMARY KEY, chat_id TEXT NOT NULL UNIQUE)"
+    ).run_sync()
+    ChatDB.raw(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(search_text)").run_sync()
+    fts_rowid = f"(SELECT rowid FROM {FTS_IDS} WHERE chat_id = {{}}.id)"
+    ChatDB.raw(f"""
+        CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {FTS_IDS}(chat_id) VALUES (new.id);
+            INSERT INTO {FTS_TABLE}(rowid, search_text)
+            VALUES ({fts_rowid.format("new")}, new.search_text);
+        END""").run_sync()
+    ChatDB.raw(f"""
+        CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = {fts_rowid.format("old")};
+            DELETE FROM {FTS_IDS} WHERE chat_id = old.id;
+        END""").run_sync()
+    ChatDB.raw(f"""
+        CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF search_text ON {table} BEGIN
+            UPDATE {FTS_TABLE} SET search_text = new.search_text
+            WHERE rowid = {fts_rowid.format("new")};
+        END""").run_sync()
+    ChatDB.raw(f"DELETE FROM {FTS_IDS}").run_sync()
+    ChatDB.raw(f"INSERT INTO {FTS_IDS}(chat_id) SELECT id FROM {table}").run_sync()
+    ChatDB.raw(
+        f"INSERT INTO {FTS_TABLE}(rowid, search_text) "
+        f"SELECT i.rowid, c.search_text FROM {FTS_IDS} i JOIN {table} c ON c.id = i.chat_id"
+    ).run_sync()
+
 ChatDB.create_table(if_not_exists=True).run_sync()
+ChatMessageDB.create_table(if_not_exists=True).run_sync()
+add_missing_columns()
+backfill_derived_columns()
+create_message_index()
+migrate_messages()
+create_search_index()
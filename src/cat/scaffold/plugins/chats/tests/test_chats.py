@@ -0,0 +1,249 @@
+"""Chats plugin suite.
+
+Lives in the plugin, so the harness auto-includes `chats` for every test here.
+Covers the listing contract: newest first, keyset pages chained by `cursor`,
+summary listings without message bodies, full-text search kept in sync with
+edits, deletes and renumbered rowids, per-user scoping. And the message
+storage: one row per message, appended without rewriting the history, streamed
+back in order, and migrated from the old `messages` column.
+"""
+
+import json
+import base64
+
+
+def _text_message(text: str) -> dict:
+    return {"role": "user", "content": [{"type": "text", "text": text}]}
+
+
+def _create(client, name, *texts):
+    response = client.post("/chats", json={
+        "name": name, "messages": [_text_message(t) for t in texts]
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_crud_roundtrip(client):
+    chat = _create(client, "first", "hello")
+    assert client.get(f"/chats/{chat['id']}").json()["messages"][0]["content"][0]["text"] == "hello"
+
+    response = client.put(f"/chats/{chat['id']}", json={"name": "renamed", "messages": []})
+    assert response.json()["name"] == "renamed"
+
+    assert client.delete(f"/chats/{chat['id']}").status_code == 200
+    assert client.get(f"/chats/{chat['id']}").status_code == 404
+
+
+def test_keyset_pages(client):
+    ids = [_create(client, f"chat {i}")["id"] for i in range(7)]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+        page = client.get("/chats", params=params).json()
+        seen += [c["id"] for c in page["items"]]
+        cursor = page["cursor"]
+        if cursor is None:
+            break
+
+    assert seen == list(reversed(ids))  # newest first, each chat exactly once
+
+
+def test_default_page_size_and_bad_cursor(client):
+    for i in range(12):
+        _create(client, f"chat {i}")
+    page = client.get("/chats").json()
+    assert len(page["items"]) == 10 and page["cursor"]
+
+    assert client.get("/chats", params={"cursor": "garbage"}).status_code == 400
+    # well-formed base64 JSON, wrong contents
+    for crafted in ([0, 5], ["2024-01-01T00:00:00", 5], ["x"], {"a": 1}):
+        cursor = base64.urlsafe_b64encode(json.dumps(crafted).encode()).decode()
+        assert client.get("/chats", params={"cursor": cursor}).status_code == 400
+    assert client.get("/chats", params={"limit": 0}).status_code == 422
+
+
+def test_full_text_search(client):
+    cats = _create(client, "Pets", "my cat likes tuna")
+    _create(client, "Work", "quarterly report draft")
+
+    def found(q):
+        return [c["name"] for c in client.get("/chats", params={"search": q}).json()["items"]]
+
+    assert found("tuna") == ["Pets"]
+    assert found("quarter") == ["Work"]      # prefix match while typing
+    assert found("cat tuna") == ["Pets"]     # every word must match
+    assert found("pets") == ["Pets"]         # the name is indexed too
+    assert found("nothing here") == []
+    assert found('"); DROP') == []           # input is never FTS syntax
+
+    # the index follows edits and deletes
+    client.put(f"/chats/{cats['id']}", json={"name": "Pets", "messages": [_text_message("salmon")]})
+    assert found("tuna") == []
+    assert found("salmon") == ["Pets"]
+    client.delete(f"/chats/{cats['id']}")
+    assert found("salmon") == []
+
+
+async def test_search_survives_renumbered_rowids(client):
+    from chats.db import ChatDB
+
+    _create(client, "Pets", "my cat likes tuna")
+    _create(client, "Work", "quarterly report draft")
+    # what VACUUM may do to a table without an INTEGER PRIMARY KEY
+    await ChatDB.raw(f"UPDATE {ChatDB._meta.tablename} SET rowid = 1000 - rowid")
+
+    def found(q):
+        return [c["name"] for c in client.get("/chats", params={"search": q}).json()["items"]]
+
+    assert found("tuna") == ["Pets"]
+    assert found("quarter") == ["Work"]
+
+
+def test_chats_are_per_user(client, anon_client):
+    _create(client, "admin's")
+    assert anon_client.get("/chats").status_code == 403
+
+
+def test_summary_listing(client):
+    long_reply = "x" * 500
+    chat = _create(client, "Pets", "my cat likes tuna", long_reply)
+    _create(client, "Empty")
+
+    page = client.get("/chats", params={"summary": True}).json()
+    empty, pets = page["items"]
+    assert set(pets) == {"id", "name", "updated_at", "message_count", "last_message"}
+    assert (pets["message_count"], len(pets["last_message"])) == (2, 200)
+    assert (empty["message_count"], empty["last_message"]) == (0, "")
+
+    # kept up to date on edit
+    client.put(f"/chats/{chat['id']}", json={"name": "Pets", "messages": [_text_message("hi")]})
+    pets = client.get("/chats", params={"summary": True, "search": "pets"}).json()["items"][0]
+    assert (pets["message_count"], pets["last_message"]) == (1, "hi")
+
+    # the default listing still returns full chats
+    assert "messages" in client.get("/chats").json()["items"][0]
+
+
+def test_append_and_stream_messages(client):
+    chat = _create(client, "Pets", "hi")
+
+    response = client.post(f"/chats/{chat['id']}/messages", json=[
+        _text_message("my cat likes tuna"), _text_message("noted")
+    ])
+    assert response.status_code == 200, response.text
+    assert (response.json()["message_count"], response.json()["last_message"]) == (3, "noted")
+
+    response = client.get(f"/chats/{chat['id']}/messages")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    texts = [json.loads(line)["content"][0]["text"] for line in response.text.splitlines()]
+    assert texts == ["hi", "my cat likes tuna", "noted"]
+
+    tail = client.get(f"/chats/{chat['id']}/messages", params={"start": 2}).text
+    assert [json.loads(line)["text"] for line in tail.splitlines()] == ["noted"]
+
+    # the full chat, the listing and the search index see the appended turn
+    assert len(client.get(f"/chats/{chat['id']}").json()["messages"]) == 3
+    assert [c["name"] for c in client.get("/chats", params={"search": "tuna"}).json()["items"]] == ["Pets"]
+
+    assert client.post("/chats/00000000-0000-0000-0000-000000000000/messages", json=[]).status_code == 404
+
+
+async def test_put_rewrites_only_the_changed_tail(client):
+    from chats.db import ChatMessageDB
+
+    chat = _create(client, "Pets", "a", "b", "c")
+    before = await ChatMessageDB.select(ChatMessageDB.id, ChatMessageDB.seq).order_by(ChatMessageDB.seq)
+
+    client.put(f"/chats/{chat['id']}", json={
+        "name": "Pets", "messages": [_text_message(t) for t in ("a", "b", "x", "y")]
+    })
+    after = await ChatMessageDB.select(ChatMessageDB.id, ChatMessageDB.seq).order_by(ChatMessageDB.seq)
+    assert after[:2] == before[:2]          # untouched rows
+    assert [r["seq"] for r in after] == [0, 1, 2, 3]
+
+    messages = client.get(f"/chats/{chat['id']}").json()["messages"]
+    assert [m["text"] for m in messages] == ["a", "b", "x", "y"]
+
+    client.delete(f"/chats/{chat['id']}")
+    assert await ChatMessageDB.count() == 0
+
+
+async def test_migrate_messages_column(client):
+    from uuid import uuid4
+    from chats.db import ChatDB, ChatMessageDB, migrate_messages
+
+    # a chat saved before messages had their own table
+    chat = ChatDB(
+        name="legacy", user_id=uuid4(), context={},
+        messages=[_text_message("one"), _text_message("two")],
+    )
+    await chat.save()
+
+    migrate_messages()
+    migrate_messages()  # idempotent
+
+    rows = await (
+        ChatMessageDB.select().where(ChatMessageDB.chat_id == chat.id)
+        .order_by(ChatMessageDB.seq).output(load_json=True)
+    )
+    assert [(r["seq"], r["content"]["content"][0]["text"]) for r in rows] == [(0, "one"), (1, "two")]
+    assert (await ChatDB.select(ChatDB.messages).where(ChatDB.id == chat.id).output(load_json=True))[0]["messages"] == []
+
+
+def test_agent_thread_is_a_chat(client):
+    from uuid import uuid4
+
+    thread_id = str(uuid4())
+    for text in ("my cat likes tuna", "and salmon"):
+        response = client.post("/agents/default/message", json={
+            "thread_id": thread_id, "stream": False, "messages": [_text_message(text)],
+        })
+        assert response.status_code == 200, response.text
+        assert len(response.json()["messages"]) == 1  # only the reply
+
+    chat = client.get(f"/chats/{thread_id}").json()
+    assert chat["name"] == "my cat likes tuna"
+    assert [m["role"] for m in chat["messages"]] == ["user", "assistant"] * 2
+
+    # edits through the chats API are seen by the next turn
+    client.put(f"/chats/{thread_id}", json={"name": "Pets", "messages": [_text_message("hi")]})
+    client.post("/agents/default/message", json={
+        "thread_id": thread_id, "stream": False, "messages": [_text_message("again")],
+    })
+    assert len(client.get(f"/chats/{thread_id}").json()["messages"]) == 3
+
+    response = client.post("/agents/default/message", json={
+        "thread_id": "not-a-chat-id", "stream": False, "messages": [_text_message("x")],
+    })
+    assert response.status_code == 404
+
+
+
+async def test_concurrent_first_turns_share_the_chat(client, monkeypatch):
+    from uuid import uuid4, uuid5, NAMESPACE_DNS
+    from cat.auth.user import User
+    from cat.ambient.context_vars import Ctx, use_ctx
+    from cat.types import Message
+    from chats import threads as chat_threads
+
+    threads, thread_id = chat_threads.ChatThreads(), str(uuid4())
+    original, raced = chat_threads.append_messages, []
+
+    async def racing(chat_id, user_id, messages):
+        chat = await original(chat_id, user_id, messages)
+        if chat is None and not raced:
+            # the other first turn creates the chat in between
+            raced.append(True)
+            await threads.append(thread_id, [Message(**_text_message("two"))])
+        return chat
+
+    monkeypatch.setattr(chat_threads, "append_messages", racing)
+    admin = User(id=uuid5(NAMESPACE_DNS, "admin"), name="admin", roles=["admin"])
+    with use_ctx(Ctx(user=admin)):
+        await threads.append(thread_id, [Message(**_text_message("one"))])
+
+    chat = client.get(f"/chats/{thread_id}").json()
+    assert chat["name"] == "two"
+    assert [m["text"] for m in chat["messages"]] == ["two", "one"]
@@ -0,0 +1,53 @@
+"""Server-side threads stored as chats.
+
+The thread id of an agent request is a chat id: the history is read from the
+chat's messages and each turn is appended to it, so conversations held through
+`POST /agents/{slug}/message` with a `thread_id` show up in `/chats`. A thread
+id that is not a chat yet creates one on the first turn.
+"""
+
+from uuid import UUID
+from typing import List
+
+from cat import user
+from cat.base import Threads
+from cat.types import Message
+
+from .db import ChatDB, load_messages, append_messages, ensure_chat, message_text
+
+
+# Length of the name of a chat created by a thread, from its first message.
+NAME_LENGTH = 50
+
+
+class ChatThreads(Threads):
+    """Threads stored as chats, one row per message."""
+
+    slug = "chats"
+    name = "Chats"
+    description = "Server-side threads saved as chats."
+
+    async def load(self, thread_id: str) -> List[Message] | None:
+        try:
+            chat_id = UUID(thread_id)
+        except ValueError:
+            return None
+
+        row = await ChatDB.select(ChatDB.user_id).where(ChatDB.id == chat_id).first()
+        if row is None:
+            return []
+        if str(row["user_id"]) != str(user.id):
+            return None
+        messages = await load_messages([chat_id])
+        return [Message(**m) for m in messages[chat_id]]
+
+    async def append(self, thread_id: str, messages: List[Message]) -> None:
+        chat_id = UUID(thread_id)
+        if await append_messages(chat_id, user.id, messages) is not None:
+            return
+        # first turn: create the chat (or find it created by a concurrent
+        #  first turn) and append to it
+        name = message_text(messages[0])[:NAME_LENGTH] if messages else ""
+        await ensure_chat(user.id, name or "No name", chat_id)
+        if await append_messages(chat_id, user.id, messages) is None:
+            raise ValueError(f"Thread '{thread_id}' not found.")
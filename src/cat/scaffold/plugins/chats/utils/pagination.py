@@ -0,0 +1,30 @@
+"""Opaque keyset cursors for chat listings.
+
+A cursor is the `(updated_at, id)` of the last item of a page, as URL-safe
+base64 JSON; the next page starts strictly after it in `(updated_at, id)`
+descending order. Unlike offsets, cursors stay stable while chats are created
+or updated, and the query is an index range scan however deep the page.
+"""
+
+import json
+import base64
+import binascii
+from uuid import UUID
+from datetime import datetime
+
+
+def encode_cursor(updated_at: datetime, id: UUID) -> str:
+    raw = json.dumps([updated_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of `encode_cursor`; raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        updated_at, id = json.loads(raw)
+        if not isinstance(updated_at, str) or not isinstance(id, str):
+            raise TypeError("cursor fields must be strings")
+        return datetime.fromisoformat(updated_at), UUID(id)
+    except (binascii.Error, TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
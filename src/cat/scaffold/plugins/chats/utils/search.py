@@ -0,0 +1,49 @@
+"""Full-text search over `ChatDB.search_text`.
+
+Backed by the FTS5 table on SQLite and by the `to_tsvector` GIN index on
+Postgres (both created in `db.py`). Every word of the query must match; the
+last one also matches as a prefix, so results narrow down while typing.
+"""
+
+import re
+
+from piccolo.query import WhereRaw
+
+from ..db import FTS_IDS, FTS_TABLE, is_sqlite
+
+
+def _words(query: str) -> list[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def fts5_query(query: str) -> str:
+    """User input as an FTS5 MATCH expression (quoted terms, no operators)."""
+    terms = [f'"{w}"' for w in _words(query)]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def tsquery(query: str) -> str:
+    """User input as a Postgres `to_tsquery` expression."""
+    terms = _words(query)
+    if terms:
+        terms[-1] += ":*"
+    return " & ".join(terms)
+
+
+def search_condition(query: str) -> WhereRaw:
+    """WHERE clause restricting `ChatDB` rows to those matching `query`."""
+    if not _words(query):
+        # nothing searchable (e.g. only punctuation): no match
+        return WhereRaw("1 = 0")
+    if is_sqlite():
+        return WhereRaw(
+            f"id IN (SELECT i.chat_id FROM {FTS_IDS} i JOIN {FTS_TABLE} f "
+            f"ON f.rowid = i.rowid WHERE {FTS_TABLE} MATCH {{}})",
+            fts5_query(query),
+        )
+    return WhereRaw(
+        "to_tsvector('simple', coalesce(search_text, '')) @@ to_tsquery('simple', {})",
+        tsquery(query),
+    )
@@ -25,7 +25,7 @@ class UploadedFileResponse(BaseModel):
     mime_type: str
 
 
-@endpoint.post("/uploads", tags=["Uploads"])
+@endpoint.post("/uploads", tags=["Uploads"], role="authenticated")
 async def upload_file(
     file: UploadFile = File(...),
 ) -> UploadedFileResponse:
@@ -61,7 +61,7 @@ async def upload_file(
     )
 
 
-@endpoint.get("/uploads", tags=["Uploads"])
+@endpoint.get("/uploads", tags=["Uploads"], role="authenticated")
 async def get_uploaded_files() -> List[UploadedFileResponse]:
     """Retrieve list of uploaded file URLs uploaded by a specific user."""
 
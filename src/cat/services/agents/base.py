@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, TYPE_CHECKING
 from inspect import isclass
 
@@ -5,8 +6,11 @@ from pydantic import BaseModel
 
 from cat.types import Message, Task, TaskResult
 from cat.mad_hatter.decorators import Tool
+from cat.mad_hatter.decorators.tool import class_tools
 from cat.services.service import Service
+from cat.services.agents.context_window import ContextWindow
 from cat.ambient import llm, execute_hook
+from cat.ambient.verbs import default_model_slug
 from cat import log
 
 if TYPE_CHECKING:
@@ -40,6 +44,19 @@ class Agent(Service):
     # Set an int to stop and log after that many turns (runaway protection).
     max_iterations: int | None = None
 
+    # Run the tool calls of a single LLM turn concurrently instead of one after
+    # the other. Off by default: tools may depend on each other's side effects.
+    # With it off, only tools declared `@tool(parallel=True)` run concurrently.
+    # `max_concurrent_tool_calls` caps how many run at once (`None` = no cap).
+    parallel_tool_calls: bool = False
+    max_concurrent_tool_calls: int | None = None
+
+    # Keeps each LLM call within the model's context window, dropping or
+    # blanking old messages when the conversation grows too long (see
+    # `cat.services.agents.context_window`). Off by default: `None` sends
+    # everything; set e.g. `ContextWindow()` to opt in.
+    context_window: ContextWindow | None = None
+
     args: BaseModel | None = None
 
     @property
@@ -62,6 +79,7 @@ class Agent(Service):
             # Per-run state on a fresh instance.
             self.task = task
             self.result = TaskResult()
+            self.tokens_saved = 0
             self.system_prompt = await self.get_system_prompt()
             self.tools = await self.list_tools()
             self.directives = await self._resolve_directives()
@@ -105,6 +123,7 @@ class Agent(Service):
 
         # snapshot system prompt to be reset before each step (good old RAG use cases)
         _base_prompt = self.system_prompt
+        model = self.model or await default_model_slug("default_llm")
 
         iteration = 0
         while True:
@@ -125,10 +144,11 @@ class Agent(Service):
             for d in self.directives:
                 await d.step(self)
 
+            messages = self.fit_context(model)
             llm_mex: Message = await llm(
                 self.system_prompt,
                 model=self.model,
-                messages=self.task.messages + self.result.messages,
+                messages=messages,
                 tools=self.tools,
                 stream=self.task.stream,
             )
@@ -136,7 +156,7 @@ class Agent(Service):
             self.result.messages.append(llm_mex)
             log.convo_summary(
                 self.system_prompt,
-                self.task.messages + self.result.messages,
+                messages + [llm_mex],
                 self.slug
             )
 
@@ -145,9 +165,28 @@ class Agent(Service):
                 return
             else:
                 # LLM has chosen to use tools, run them
-                for tool_call in llm_mex.tool_calls:
-                    tool_message = await self.call_tool(tool_call)
-                    self.result.messages.append(tool_message)
+                tool_messages = await self.call_tools(llm_mex.tool_calls)
+                self.result.messages.extend(tool_messages)
+
+    def fit_context(self, model: str) -> List[Message]:
+        """
+        The messages to send to the LLM at this step: the conversation so far,
+        trimmed by `context_window` to the budget of `model`. Tokens saved are
+        added up in `self.tokens_saved`.
+        """
+        messages = self.task.messages + self.result.messages
+        if self.context_window is None:
+            return messages
+
+        messages, report = self.context_window.fit(self.system_prompt, messages, model)
+        if report.saved:
+            self.tokens_saved += report.saved
+            log.debug(
+                f"Agent '{self.slug}': context {report.tokens_before} -> "
+                f"{report.tokens_after} tokens (budget {report.budget}, "
+                f"{', '.join(report.strategies)})"
+            )
+        return messages
 
     async def get_system_prompt(self) -> str:
         """
@@ -236,13 +275,63 @@ class Agent(Service):
                 )
         return resolved
 
+    async def call_tools(self, tool_calls) -> List[Message]:
+        """
+        Run the tool calls of one LLM turn, returning their messages in the same
+        order as `tool_calls`.
+
+        Consecutive calls that may run concurrently (every call if
+        `parallel_tool_calls` is set, else tools declared `parallel=True`) are
+        dispatched together, bounded by `max_concurrent_tool_calls`; the others
+        run sequentially, in order. Each tool emits its AGUI result event as
+        soon as it finishes.
+        """
+
+        semaphore = None
+        if self.max_concurrent_tool_calls is not None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_tool_calls)
+
+        async def bounded_call(tool_call):
+            if semaphore is None:
+                return await self.call_tool(tool_call)
+            async with semaphore:
+                return await self.call_tool(tool_call)
+
+        messages: List[Message] = []
+        batch = []
+        for tool_call in tool_calls:
+            if self._is_parallel(tool_call):
+                batch.append(tool_call)
+                continue
+            if batch:
+                messages += await asyncio.gather(*map(bounded_call, batch))
+                batch = []
+            messages.append(await self.call_tool(tool_call))
+        if batch:
+            messages += await asyncio.gather(*map(bounded_call, batch))
+
+        return messages
+
+    def _is_parallel(self, tool_call) -> bool:
+        """Whether a tool call may run concurrently with its siblings."""
+        if self.parallel_tool_calls:
+            return True
+        tool = self._find_tool(tool_call.name)
+        return tool is not None and tool.parallel
+
+    def _find_tool(self, name: str) -> Tool | None:
+        for t in self.tools:
+            if t.name == name:
+                return t
+        return None
+
     async def call_tool(self, tool_call, *args, **kwargs):
         """Call a tool."""
 
         name = tool_call.name
-        for t in self.tools:
-            if t.name == name:
-                return await t.execute(self, tool_call)
+        t = self._find_tool(name)
+        if t is not None:
+            return await t.execute(self, tool_call)
 
         raise Exception(f"Tool {name} not found")
 
@@ -253,9 +342,6 @@ class Agent(Service):
             self.args = ArgsSchema.model_validate(task.args)
 
     def instantiate_agent_tools(self) -> List[Tool]:
-        """Find Tool instances on class and bind them to the agent instance."""
-        return [
-            attr.bind_to(self)
-            for name in dir(self.__class__)
-            if isinstance(attr := getattr(self.__class__, name, None), Tool)
-        ]
+        """Find Tool instances on class (once per class) and bind them to the
+        agent instance."""
+        return class_tools.bind(self)
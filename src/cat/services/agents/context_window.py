@@ -0,0 +1,232 @@
+"""
+Fit the conversation into the model context window before each LLM call.
+
+`Agent.loop` sends the whole conversation on every iteration, so a long
+running agent would eventually overflow the context and pay for an ever
+growing prompt. A `ContextWindow` estimates the tokens of each message,
+compares the total with the budget of the model (`model_budget`), and when it
+does not fit applies its truncation strategies in order until it does:
+
+- `DropStaleToolResults` blanks the output of all but the latest tool calls;
+- `DropOldest` drops the oldest messages;
+- `KeepLast` keeps only the last N messages.
+
+Strategies never split a tool call from its results, never drop the last
+message, and start the conversation from a user message when they cut it. The system prompt is not a message: it is always sent, and counted.
+
+Agents opt in with the `context_window` class attribute (`None` by default,
+which sends everything):
+
+    class MyAgent(Agent):
+        context_window = ContextWindow(strategies=[KeepLast(20)], budget=8000)
+
+Estimates are heuristic (about 4 characters per token, fixed costs for
+media), good enough to stay under a budget with `config.CONTEXT_RESERVE`
+tokens of headroom left for the reply.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import List
+
+from cat.types import Message, TextContent
+from cat import config
+
+
+# Rough token costs.
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD = 4  # role and separators
+IMAGE_TOKENS = 1000
+AUDIO_TOKENS = 1000
+
+# Context windows of well known models, matched as a prefix of the model name
+# (the part after "provider:"); others get `config.CONTEXT_WINDOW`.
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4.1": 1_047_576,
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-3.5-turbo": 16_385,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4": 200_000,
+    "claude": 200_000,
+    "gemini": 1_048_576,
+    "llama3": 128_000,
+    "mistral": 32_000,
+    "qwen": 32_000,
+}
+
+# What a blanked tool result says instead.
+STALE_TOOL_RESULT = "[tool result removed to save context]"
+
+
+def estimate_tokens(message: Message) -> int:
+    """Approximate tokens of a message: a walk over its blocks, cheap enough
+    to run on every call."""
+    chars = 0
+    tokens = MESSAGE_OVERHEAD
+    for block in message.content:
+        if block.type == "text":
+            chars += len(block.text)
+        elif block.type == "image":
+            tokens += IMAGE_TOKENS
+        elif block.type == "audio":
+            tokens += AUDIO_TOKENS
+        elif block.type == "resource":
+            text = getattr(block.resource, "text", None)
+            if text is None:
+                tokens += IMAGE_TOKENS
+            else:
+                chars += len(text)
+        else:
+            chars += len(str(block.uri)) + len(block.name or "")
+    for tool_call in message.tool_calls:
+        chars += len(tool_call.name) + len(json.dumps(tool_call.args, default=str))
+    return tokens + chars // CHARS_PER_TOKEN
+
+
+def count_tokens(messages: List[Message]) -> int:
+    return sum(estimate_tokens(m) for m in messages)
+
+
+def model_budget(model: str) -> int:
+    """Prompt tokens available for a "provider:model": its context window
+    minus the reply reserve."""
+    name = model.split(":", 1)[-1].lower()
+    window = config.CONTEXT_WINDOW
+    for prefix, size in MODEL_CONTEXT_WINDOWS.items():
+        if name.startswith(prefix):
+            window = size
+            break
+    return max(window - config.CONTEXT_RESERVE, 0)
+
+
+def turns(messages: List[Message]) -> List[List[Message]]:
+    """Split messages in units that must be kept or dropped together: an
+    assistant message with tool calls goes with the tool results after it."""
+    units: List[List[Message]] = []
+    for message in messages:
+        if message.role == "tool" and units:
+            units[-1].append(message)
+        else:
+            units.append([message])
+    return units
+
+
+class TruncationStrategy:
+    """Shrinks a conversation towards `budget` tokens (prompt included)."""
+
+    def __call__(self, messages: List[Message], budget: int) -> List[Message]:
+        raise NotImplementedError
+
+
+@dataclass
+class DropStaleToolResults(TruncationStrategy):
+    """Blank the results of all tool calls but the `keep` most recent ones.
+    The calls stay, so the model still knows what it did."""
+
+    keep: int = 1
+
+    def __call__(self, messages: List[Message], budget: int) -> List[Message]:
+        units = turns(messages)
+        with_results = [i for i, u in enumerate(units) if len(u) > 1]
+        stale = set(with_results[:-self.keep] if self.keep else with_results)
+
+        fitted = []
+        for i, unit in enumerate(units):
+            if i not in stale:
+                fitted += unit
+                continue
+            fitted.append(unit[0])
+            for result in unit[1:]:
+                fitted.append(result.model_copy(update={
+                    "content": [TextContent(text=STALE_TOOL_RESULT)]
+                }))
+        return fitted
+
+
+@dataclass
+class DropOldest(TruncationStrategy):
+    """Drop the oldest messages until the conversation fits."""
+
+    def __call__(self, messages: List[Message], budget: int) -> List[Message]:
+        units = turns(messages)
+        total = count_tokens(messages)
+        while len(units) > 1 and total > budget:
+            total -= count_tokens(units.pop(0))
+        return _join(_from_user(units))
+
+
+@dataclass
+class KeepLast(TruncationStrategy):
+    """Keep only the last `n` messages, and a few more not to split a tool call
+    from its results and to start from the user message they answer."""
+
+    n: int = 20
+
+    def __call__(self, messages: List[Message], budget: int) -> List[Message]:
+        units = turns(messages)
+        kept: List[List[Message]] = []
+        count = 0
+        while units and (count < self.n or not kept or kept[0][0].role != "user"):
+            unit = units.pop()
+            kept.insert(0, unit)
+            count += len(unit)
+        return _join(kept)
+
+
+def _from_user(units: List[List[Message]]) -> List[List[Message]]:
+    """Drop leading replies: some providers want the first message from the user."""
+    while len(units) > 1 and units[0][0].role != "user":
+        units = units[1:]
+    return units
+
+
+def _join(units: List[List[Message]]) -> List[Message]:
+    return [m for unit in units for m in unit]
+
+
+@dataclass
+class ContextReport:
+    """What fitting one LLM call did."""
+
+    budget: int
+    tokens_before: int
+    tokens_after: int
+    strategies: List[str] = field(default_factory=list)
+
+    @property
+    def saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+@dataclass
+class ContextWindow:
+    """
+    Keeps the prompt of each LLM call within a token budget.
+
+    `budget` overrides the per-model one (`model_budget`); `strategies` run in
+    order, each only if the conversation still does not fit.
+    """
+
+    strategies: List[TruncationStrategy] = field(
+        default_factory=lambda: [DropStaleToolResults(), DropOldest()]
+    )
+    budget: int | None = None
+
+    def fit(
+        self, system_prompt: str, messages: List[Message], model: str
+    ) -> tuple[List[Message], ContextReport]:
+        budget = self.budget if self.budget is not None else model_budget(model)
+        prompt = len(system_prompt) // CHARS_PER_TOKEN
+        before = prompt + count_tokens(messages)
+        report = ContextReport(budget=budget, tokens_before=before, tokens_after=before)
+
+        for strategy in self.strategies:
+            if report.tokens_after <= budget:
+                break
+            messages = strategy(messages, budget - prompt)
+            report.tokens_after = prompt + count_tokens(messages)
+            report.strategies.append(type(strategy).__name__)
+
+        return messages, report
@@ -4,6 +4,7 @@ from uuid import uuid5, NAMESPACE_DNS
 
 from fastapi import Request
 
+from cat.auth.cache import auth_cache
 from cat.auth.jwt import JWTHelper
 from cat.auth.user import User
 
@@ -24,6 +25,11 @@ class Auth(ABC, Service):
 
     Because verification lives here, the core `DefaultAuth` is just this base with
     a slug, and can step aside the moment a plugin registers its own handler.
+
+    Verified credentials are cached (`cat.auth.cache`): `authenticate` serves a
+    known credential without verifying it again. The core JWT and key checks
+    `remember` what they verified; an override that verifies differently calls
+    `self.remember(...)` too to get the fast path.
     """
 
     service_type = "auths"
@@ -63,8 +69,22 @@ class Auth(ABC, Service):
         credential = self.get_credential(request)
         if credential is None:
             return None
+        user = auth_cache.get(self.slug, credential)
+        if user is not None:
+            return user
         return await self.authorize_user_from_credential(credential)
 
+    def remember(self, credential: str, user: User, expires: float | None = None) -> None:
+        """Cache a verified credential until `expires` (a timestamp), at most
+        `config.AUTH_CACHE_TTL` seconds."""
+        auth_cache.put(self.slug, credential, user, expires)
+
+    @classmethod
+    async def refresh(cls) -> None:
+        # new settings may verify differently
+        auth_cache.clear()
+        await super().refresh()
+
     async def authorize_user_from_credential(
         self,
         credential: str,
@@ -87,26 +107,35 @@ class Auth(ABC, Service):
         payload = self.jwt.decode(token)
         if not payload:
             return None
-        return User(
+        user = User(
             id=payload["sub"],
             name=payload["username"],
             roles=payload.get("roles", []),
         )
+        self.remember(token, user, payload.get("exp"))
+        return user
 
     async def authorize_user_from_key(
         self,
         api_key: str,
     ) -> User | None:
-        """Authorize from the master API key (→ the admin user).
+        """Authorize from the master API key (→ the admin user), or from a
+        per-user key (`cat.auth.api_keys`) → the user it belongs to.
 
-        This is the simplest possible key policy. Override for custom schemes,
-        e.g. per-user keys looked up in a database.
+        Override for custom schemes.
         """
         from cat import config
+        from cat.auth.api_keys import ApiKeys
 
         if config.API_KEY is not None and api_key == config.API_KEY:
-            return self.get_admin()
-        return None
+            admin = self.get_admin()
+            self.remember(api_key, admin)
+            return admin
+
+        user = await ApiKeys.verify(api_key)
+        if user is not None:
+            self.remember(api_key, user)
+        return user
 
     async def get_provider_login_url(
         self,
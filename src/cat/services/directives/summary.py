@@ -0,0 +1,203 @@
+"""
+Directives · summary — keep long conversations short.
+
+Once the history of a run grows past `threshold` tokens, the older turns are
+summarized by an LLM (pick a cheap one in the settings) in a background task:
+the agent answers right away with the full history, and on the first `step()`
+after the summary is ready the summarized messages leave the conversation and
+the summary joins the system prompt. Only the last `keep_last` messages (or a
+few more, to start from a user message) are always kept verbatim.
+
+Summaries are cached per conversation — the thread id, or the first
+`KEY_MESSAGES` messages for clients that resend the whole history — in memory
+and in the user's key-value store, so the next runs start from the summary,
+and summarizing again only folds the new turns into it. A summary is only
+reused while the conversation still has as many messages and the same one
+where the summary ends (its hash is stored with it): an edit rewrites the
+conversation from the edited message on. Each summary is its own key in the
+user's store, and each user keeps the summaries of their
+`config.SUMMARY_LIMIT` most recently summarized conversations.
+
+Attach it by slug: `directives = ["summary"]`.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import List
+
+from cachetools import LRUCache
+from pydantic import BaseModel, Field
+
+from cat.types import Message, TextContent
+from cat.ambient import llm
+from cat.ambient.context_vars import user
+from cat.services.agents.context_window import count_tokens, turns
+from cat import config, log
+
+from .base import Directive
+
+
+SUMMARY_PROMPT = (
+    "You maintain the running summary of a conversation between a user and an "
+    "AI assistant. Write a concise summary that keeps every fact, decision, "
+    "preference and open question needed to continue the conversation. Reply "
+    "with the summary only."
+)
+
+# Longest tool result included in a summary transcript, in characters.
+TOOL_RESULT_LENGTH = 500
+
+# Messages identifying a conversation without a thread id: the opening turns,
+# which a client resending the history sends unchanged on every run.
+KEY_MESSAGES = 4
+
+# User store keys of the summaries, followed by the conversation key.
+KEY_PREFIX = "summary_"
+
+# Recently used summaries, keyed by (user id, conversation key).
+summaries = LRUCache(maxsize=config.THREAD_CACHE_SIZE)
+
+# Summaries being written, same keys; never two at once for a conversation.
+pending: dict[tuple[str, str], asyncio.Task] = {}
+
+
+def digest(messages: List[Message]) -> str:
+    """Hash of a few messages: the opening ones keying a conversation, or the
+    last one a summary covers."""
+    h = hashlib.sha256()
+    for m in messages:
+        h.update(m.model_dump_json(exclude={"text"}).encode())
+    return h.hexdigest()
+
+
+def transcript(messages: List[Message]) -> str:
+    lines = []
+    for m in messages:
+        if m.text:
+            text = m.text if m.role != "tool" else m.text[:TOOL_RESULT_LENGTH]
+            lines.append(f"{m.role}: {text}")
+        for tc in m.tool_calls:
+            lines.append(f"{m.role} called {tc.name}({json.dumps(tc.args, default=str)})")
+    return "\n".join(lines)
+
+
+class SummaryDirective(Directive):
+    slug = "summary"
+    name = "Conversation summary"
+    description = "Summarizes older turns of long conversations in the background."
+
+    class Settings(BaseModel):
+        threshold: int = Field(
+            4000, title="Threshold",
+            description="Summarize once the history exceeds this many tokens.",
+        )
+        keep_last: int = Field(
+            6, title="Messages kept",
+            description="Most recent messages never summarized.",
+        )
+        model: str = Field(
+            "", title="Model",
+            description="provider:model writing the summaries; empty for the default LLM.",
+        )
+
+    async def start(self, agent) -> None:
+        self.settings = await self.load_settings()
+        self.history = agent.task.messages
+        self.key = (str(user.id), self.conversation_key(agent))
+        self.summary = None  # the entry in use
+        self.checked = None  # the last entry considered
+
+        entry = summaries.get(self.key)
+        if entry is None:
+            entry = await user.load(self._store_key())
+            if entry is not None:
+                summaries[self.key] = entry
+        self._apply(agent, entry)
+        self._summarize_if_long()
+
+    async def step(self, agent) -> None:
+        entry = summaries.get(self.key)
+        if entry is not None and entry is not self.checked:
+            self._apply(agent, entry)
+
+        if self.summary is not None:
+            agent.system_prompt += (
+                "\n\nSummary of the earlier conversation:\n" + self.summary["text"]
+            )
+
+    def conversation_key(self, agent) -> str:
+        if agent.task.thread_id:
+            return agent.task.thread_id
+        return digest(self.history[:KEY_MESSAGES]) if self.history else ""
+
+    def _store_key(self) -> str:
+        return KEY_PREFIX + self.key[1]
+
+    async def _prune(self) -> None:
+        """Delete the summaries past the `config.SUMMARY_LIMIT` most recently
+        saved ones."""
+        stale = (await user.keys(KEY_PREFIX))[config.SUMMARY_LIMIT:]
+        if stale:
+            await user.delete_many(stale)
+            for k in stale:
+                summaries.pop((self.key[0], k[len(KEY_PREFIX):]), None)
+
+    def _apply(self, agent, entry: dict | None) -> None:
+        """Swap the messages `entry` covers for it, if they are unchanged."""
+        self.checked = entry
+        if entry is None or entry["count"] >= len(self.history):
+            return
+        if self.summary is not None and entry["count"] <= self.summary["count"]:
+            return
+        if digest(self.history[entry["count"] - 1:entry["count"]]) != entry["digest"]:
+            return
+        self.summary = entry
+        agent.task.messages = self.history[entry["count"]:]
+
+    def _summarize_if_long(self) -> None:
+        covered = self.summary["count"] if self.summary else 0
+        if count_tokens(self.history[covered:]) <= self.settings.threshold:
+            return
+
+        # cut between turns, keeping at least `keep_last` messages and
+        # starting the kept ones from a user message
+        cut, kept = len(self.history), 0
+        for unit in reversed(turns(self.history)):
+            cut -= len(unit)
+            kept += len(unit)
+            if kept >= self.settings.keep_last and unit[0].role == "user":
+                break
+        if cut <= covered:
+            return
+
+        running = pending.get(self.key)
+        if running is not None and not running.done():
+            return
+        pending[self.key] = asyncio.create_task(
+            self._summarize(self.summary, self.history[:cut])
+        )
+
+    async def _summarize(self, previous: dict | None, messages: List[Message]) -> None:
+        """Fold `messages` (after those `previous` covers) into a new summary.
+        Runs in the background, in a copy of the request context."""
+        try:
+            covered = previous["count"] if previous else 0
+            text = transcript(messages[covered:])
+            if previous:
+                text = f"Summary so far:\n{previous['text']}\n\nNew messages:\n{text}"
+
+            reply = await llm(
+                SUMMARY_PROMPT,
+                model=self.settings.model or None,
+                messages=[Message(role="user", content=[TextContent(text=text)])],
+                stream=False,
+            )
+            entry = {"count": len(messages), "digest": digest(messages[-1:]), "text": reply.text}
+            summaries[self.key] = entry
+            await user.save(self._store_key(), entry)
+            await self._prune()
+        except Exception as e:
+            log.error(f"Conversation summary failed: {e}")
+        finally:
+            pending.pop(self.key, None)
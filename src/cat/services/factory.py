@@ -73,12 +73,43 @@ class Registry:
         """All instances of a given type, keyed by slug."""
         return {slug: await self.get(type, slug) for slug in self.classes.get(type, {})}
 
+    async def sync(self, classes: Dict[str, Dict[str, Type["Service"]]]) -> set[str]:
+        """Replace the class map with `classes`, as a diff.
+
+        Only the classes removed or replaced have their singleton closed; the
+        live singletons of unchanged classes (and their clients, connection
+        pools...) are kept. Returns the service types that changed.
+        """
+        from cat.services.service import settings_cache
+
+        if not self.classes:
+            # first sync (bootstrap): settings read before it are not ours
+            settings_cache.clear()
+
+        changed = set()
+        for type in self.classes.keys() | classes.keys():
+            old, new = self.classes.get(type, {}), classes.get(type, {})
+            if old == new:
+                continue
+            changed.add(type)
+            for slug, ServiceClass in old.items():
+                if new.get(slug) is not ServiceClass:
+                    await self._close(ServiceClass)
+        self.classes = classes
+        return changed
+
     async def teardown(self) -> None:
         """Close every live singleton (shutdown) and clear the class map."""
+        from cat.services.service import settings_cache
+
+        settings_cache.clear()
         for type_map in self.classes.values():
             for ServiceClass in type_map.values():
-                try:
-                    await ServiceClass.refresh()
-                except Exception as e:
-                    log.error(f"Error during teardown of {ServiceClass.__name__}: {e}")
+                await self._close(ServiceClass)
         self.classes = {}
+
+    async def _close(self, ServiceClass: Type["Service"]) -> None:
+        try:
+            await ServiceClass.refresh()
+        except Exception as e:
+            log.error(f"Error during teardown of {ServiceClass.__name__}: {e}")
@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, TYPE_CHECKING
 from abc import abstractmethod
 
@@ -20,6 +21,9 @@ class ModelProvider(Service):
     service_type = "model_providers"
     singleton = True  # caches a lazily-built client; reused across calls
 
+    # How many single `embed()` calls the default `embed_many()` runs at once.
+    embed_concurrency: int = 8
+
     async def list_llms(self) -> List[str]:
         """
         Return a list of available LLM slugs (without provider prefix).
@@ -98,3 +102,31 @@ class ModelProvider(Service):
         Override this in subclasses to implement embedding.
         """
         return [0.0]
+
+    async def embed_many(self, model: str, texts: list[str]) -> list[list[float]]:
+        """
+        Embed several texts, returning one vector per text, in order.
+
+        The default implementation runs `embed()` concurrently (at most
+        `embed_concurrency` calls at a time). Override it for providers whose
+        API accepts a batch of inputs in one request.
+
+        Parameters
+        ----------
+        model : str
+            Model identifier (e.g. "text-embedding-3-small").
+        texts : list[str]
+            The texts to embed.
+
+        Returns
+        -------
+        list[list[float]]
+            The embedding vectors, `texts[i]` → `vectors[i]`.
+        """
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+
+        async def bounded_embed(text: str) -> list[float]:
+            async with semaphore:
+                return await self.embed(model, text)
+
+        return list(await asyncio.gather(*map(bounded_embed, texts)))
@@ -1,4 +1,5 @@
 import json
+import asyncio
 from typing import List, TYPE_CHECKING
 
 from pydantic import BaseModel, Field
@@ -99,6 +100,13 @@ class OpenAICompatibleProvider(ModelProvider):
     DISCOVERY_CONNECT_TIMEOUT_S = 1.0
     DISCOVERY_READ_TIMEOUT_S = 3.0
 
+    # Limits for one embeddings request in `embed_many()`. The OpenAI API takes
+    # up to 2048 inputs and ~300k tokens per request; compatible servers often
+    # accept less, so subclasses can lower these. Tokens are estimated from the
+    # text length (`estimate_tokens`), not counted with a tokenizer.
+    EMBED_BATCH_SIZE = 512
+    EMBED_BATCH_MAX_TOKENS = 100_000
+
     async def list_models(self) -> List[str]:
         """All model ids from the endpoint, cached on the singleton instance.
 
@@ -355,3 +363,49 @@ class OpenAICompatibleProvider(ModelProvider):
             raise RuntimeError(NO_KEY_MESSAGE)
         response = await client.embeddings.create(model=model, input=text)
         return response.data[0].embedding
+
+    async def embed_many(self, model: str, texts: list[str]) -> list[list[float]]:
+        """Embed many texts with as few embeddings API requests as possible.
+
+        Texts are split into batches bounded by `EMBED_BATCH_SIZE` inputs and
+        `EMBED_BATCH_MAX_TOKENS` estimated tokens; batches are sent concurrently
+        (at most `embed_concurrency` at a time) and the vectors are returned in
+        the order of `texts`.
+        """
+        client = await self.client()
+        if client is None:
+            raise RuntimeError(NO_KEY_MESSAGE)
+
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+
+        async def embed_batch(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                response = await client.embeddings.create(model=model, input=batch)
+            # the API tags each vector with its input position
+            return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+        results = await asyncio.gather(*map(embed_batch, self.split_batches(texts)))
+        return [vector for batch in results for vector in batch]
+
+    def split_batches(self, texts: list[str]) -> list[list[str]]:
+        """Group consecutive texts into request-sized batches (see `embed_many`)."""
+        batches: list[list[str]] = []
+        batch: list[str] = []
+        batch_tokens = 0
+        for text in texts:
+            tokens = self.estimate_tokens(text)
+            if batch and (
+                len(batch) >= self.EMBED_BATCH_SIZE
+                or batch_tokens + tokens > self.EMBED_BATCH_MAX_TOKENS
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def estimate_tokens(self, text: str) -> int:
+        """Cheap token estimate (~4 characters per token). Override for a real tokenizer."""
+        return len(text) // 4 + 1
@@ -15,7 +15,8 @@ Settings live on the service itself: declare a nested `class Settings(BaseModel)
 (or override `settings_schema()` for a dynamic one) and read the current values
 with `await self.load_settings()`. Nothing is pushed in or preloaded — code pulls
 its settings when it needs them, so `MyService()` by hand and `get(...)` through
-the registry behave identically.
+the registry behave identically. Loaded settings are kept in a small in-process
+cache (`settings_cache`) that `save_settings()` and `refresh()` invalidate.
 
 Lifecycle is a single boolean, `singleton`, enforced by `ServiceMeta` on the
 *class*: a singleton's instance is cached on the class, so a hand import
@@ -30,17 +31,76 @@ instance and drops it so the next use rebuilds it with fresh settings. There is
 `setup()` — async wiring happens lazily on first use, not in a build hook.
 """
 
+import time
 from abc import ABCMeta
-from typing import TYPE_CHECKING
+from typing import Dict, Iterable, TYPE_CHECKING
 
 from pydantic import BaseModel, ValidationError
 
 from cat.ambient.runtime import ccat
+from cat import config
 
 if TYPE_CHECKING:
     from cat.mad_hatter.plugin import Plugin
 
 
+class SettingsCache:
+    """
+    In-process cache of validated settings, keyed by the service settings key.
+
+    Settings change a few times a month but are read on every agent iteration
+    (e.g. the default LLM), so `load_settings()` serves them from here and only
+    reads the DB on a miss. Each key carries a version, bumped by every
+    invalidation: a load that raced with a save (read the DB, then the save
+    invalidated) does not put its stale value back into the cache.
+
+    Entries also expire after `config.SETTINGS_CACHE_TTL` seconds (None: never),
+    which bounds staleness across worker processes sharing the same DB.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[int, float, BaseModel]] = {}
+        self._versions: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def get(self, key: str) -> "BaseModel | None":
+        entry = self._entries.get(key)
+        if entry is not None:
+            version, expires, value = entry
+            if version == self.version(key) and time.monotonic() < expires:
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, version: int, value: BaseModel) -> None:
+        """Cache `value`, read at `version`, unless the key changed meanwhile."""
+        if version != self.version(key):
+            return
+        ttl = config.SETTINGS_CACHE_TTL
+        expires = float("inf") if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (version, expires, value)
+
+    def invalidate(self, key: str) -> None:
+        self._versions[key] = self.version(key) + 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        for key in set(self._entries) | set(self._versions):
+            self.invalidate(key)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+settings_cache = SettingsCache()
+
+
 class ServiceMeta(ABCMeta):
     """Make `singleton = True` a property of the class.
 
@@ -95,6 +155,7 @@ class Service(metaclass=ServiceMeta):
         a client/connection picks up the new settings on next resolution. A no-op
         for non-singletons and for singletons that were never instantiated.
         """
+        settings_cache.invalidate(cls._settings_key())
         instance = cls.__dict__.get("_instance")
         if instance is not None:
             await instance.close()
@@ -156,18 +217,35 @@ class Service(metaclass=ServiceMeta):
     async def load_settings(cls) -> "BaseModel | None":
         """
         Current persisted settings as a typed instance, or None if the service
-        declares no settings. Read fresh every call — there is no cache and no
-        preload, so the value is always current. Loading never destroys the
-        stored record: a missing/corrupted blob falls back to defaults, and a
-        blob that no longer fully validates is salvaged field-by-field.
+        declares no settings. Served from `settings_cache` when possible (a
+        deep copy, so callers may mutate it freely, nested fields included);
+        `save_settings()` and `refresh()` invalidate it. Loading never destroys the stored record: a
+        missing/corrupted blob falls back to defaults, and a blob that no longer
+        fully validates is salvaged field-by-field.
         """
-        from cat.db import store
-
         model = await cls.value_schema()
         if model is None:
             return None
 
+        key = cls._settings_key()
+        cached = settings_cache.get(key)
+        if cached is None:
+            version = settings_cache.version(key)
+            cached = await cls._read_settings(model)
+            settings_cache.put(key, version, cached)
+        return cached.model_copy(deep=True)
+
+    @classmethod
+    async def _read_settings(cls, model: "type[BaseModel]") -> BaseModel:
+        """Uncached DB read + validation behind `load_settings()`."""
+        from cat.db import store
+
         raw = await store.load(cls._settings_key())
+        return cls._parse_settings(model, raw)
+
+    @classmethod
+    def _parse_settings(cls, model: "type[BaseModel]", raw) -> BaseModel:
+        """Validate a stored settings blob: defaults if missing, salvage if stale."""
         if not isinstance(raw, dict):
             return cls._settings_defaults(model)
 
@@ -187,7 +265,10 @@ class Service(metaclass=ServiceMeta):
         validated = (
             payload if isinstance(payload, BaseModel) else model.model_validate(payload)
         )
+        # the store announces the change: other workers drop their cached
+        # settings and singleton
         await store.save(cls._settings_key(), validated.model_dump(mode="json"))
+        settings_cache.invalidate(cls._settings_key())
         return validated
 
     # -- settings internals -------------------------------------------------
@@ -230,3 +311,33 @@ class Service(metaclass=ServiceMeta):
         except ValidationError as e:
             log.error(f"Could not salvage settings, using defaults: {e}")
             return cls._settings_defaults(model)
+
+
+async def load_many_settings(
+    ServiceClasses: "Iterable[type[Service]]",
+) -> "Dict[type[Service], BaseModel | None]":
+    """
+    `load_settings()` for several services at once: cache misses are read with
+    a single `store.load_many()` query instead of one query per service.
+    """
+    from cat.db import store
+
+    settings, misses = {}, {}
+    for ServiceClass in ServiceClasses:
+        model = await ServiceClass.value_schema()
+        if model is None:
+            settings[ServiceClass] = None
+            continue
+        key = ServiceClass._settings_key()
+        cached = settings_cache.get(key)
+        if cached is None:
+            misses[ServiceClass] = (model, key, settings_cache.version(key))
+        else:
+            settings[ServiceClass] = cached.model_copy(deep=True)
+
+    raw = await store.load_many(key for _, key, _ in misses.values())
+    for ServiceClass, (model, key, version) in misses.items():
+        loaded = ServiceClass._parse_settings(model, raw[key])
+        settings_cache.put(key, version, loaded)
+        settings[ServiceClass] = loaded.model_copy(deep=True)
+    return settings
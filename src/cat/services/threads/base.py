@@ -0,0 +1,122 @@
+from abc import abstractmethod
+from typing import List, TYPE_CHECKING
+
+from cachetools import TTLCache
+
+from cat.types import Message, Task, TaskResult
+from cat.ambient.context_vars import user
+from cat.looking_glass.change_bus import change_bus
+from cat import config
+
+from ..service import Service
+
+if TYPE_CHECKING:
+    from cat.services.agents.base import Agent
+
+
+class Threads(Service):
+    """
+    Base class for server-side conversation threads.
+
+    A request to an agent may name a thread (`Task.thread_id`) instead of
+    carrying the whole conversation: the client sends only the new messages,
+    the history is read from storage, and after the run the new messages and
+    the agent's replies are appended to the thread. Threads belong to the user
+    who created them.
+
+    Subclasses implement storage with `load` and `append`. Recently used
+    histories are kept in a bounded in-memory cache (`config.THREAD_CACHE_SIZE`
+    threads, for `config.THREAD_CACHE_TTL` seconds), so a lively conversation
+    is read from storage once and then only written to.
+
+    Writes keep this cache in step and drop the thread from the caches of the
+    other workers (through the change bus), whose next turn reads storage.
+
+    Core ships `default`, storing each thread in the user's key-value store;
+    the `chats` plugin replaces it with threads saved as chats. Like auth
+    handlers, the core one steps aside as soon as a plugin registers its own;
+    among several plugin ones, the highest `priority` is used.
+    """
+
+    service_type = "threads"
+    singleton = True  # holds the hot cache
+    priority: int = 0
+
+    def __init__(self):
+        self.cache = TTLCache(
+            maxsize=config.THREAD_CACHE_SIZE, ttl=config.THREAD_CACHE_TTL
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    async def load(self, thread_id: str) -> List[Message] | None:
+        """Messages of a thread of the current user, oldest first.
+
+        An unknown thread is empty (`[]`); return None if the thread id is not
+        valid for this storage or the thread belongs to someone else.
+        """
+        pass
+
+    @abstractmethod
+    async def append(self, thread_id: str, messages: List[Message]) -> None:
+        """Add messages at the end of a thread, creating it if needed."""
+        pass
+
+    def _key(self, thread_id: str) -> tuple[str, str]:
+        return str(user.id), thread_id
+
+    async def history(self, thread_id: str) -> List[Message] | None:
+        """Cached `load`: the messages of a thread, None if not accessible."""
+        cached = self.cache.get(self._key(thread_id))
+        if cached is not None:
+            self.hits += 1
+            return list(cached)
+
+        self.misses += 1
+        messages = await self.load(thread_id)
+        if messages is not None and self.cache.maxsize:
+            self.cache[self._key(thread_id)] = tuple(messages)
+        return messages
+
+    async def extend(self, thread_id: str, messages: List[Message]) -> None:
+        """`append`, keeping the cached history in step here and dropping it
+        in the other workers."""
+        await self.append(thread_id, messages)
+        key = self._key(thread_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache[key] = cached + tuple(messages)
+        await change_bus.publish(f"threads:{key[0]}:{thread_id}")
+
+    def forget(self, thread_id: str) -> None:
+        """Drop a thread from the cache, e.g. after it was edited elsewhere."""
+        self.cache.pop(self._key(thread_id), None)
+
+    async def run(self, agent: "Agent", task: Task) -> TaskResult:
+        """
+        Run `agent` on `task` continuing thread `task.thread_id`: the task
+        messages are the new turn, the history is prepended before the run,
+        and the turn plus the agent's replies are appended after it.
+
+        Returns the agent result, which carries only the new replies.
+        """
+        history = await self.history(task.thread_id)
+        if history is None:
+            raise ValueError(f"Thread '{task.thread_id}' not found.")
+
+        turn = task.messages
+        result = await agent(task.model_copy(update={"messages": history + turn}))
+        await self.extend(task.thread_id, turn + result.messages)
+
+        result.thread_id = task.thread_id
+        return result
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
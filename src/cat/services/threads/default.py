@@ -0,0 +1,34 @@
+from typing import List
+
+from cat.types import Message
+from cat.ambient.context_vars import user
+
+from .base import Threads
+
+
+class DefaultThreads(Threads):
+    """Threads in the user's key-value store, one key per thread.
+
+    Present only when no plugin provides threads (see
+    `CheshireCat.refresh_registry`). Each append rewrites the whole thread, so
+    it suits short conversations; the `chats` plugin stores one row per message.
+    """
+
+    slug = "default"
+    name = "Default threads"
+    description = "Core threads, stored in the user's key-value store."
+
+    def _store_key(self, thread_id: str) -> str:
+        return f"thread_{thread_id}"
+
+    async def load(self, thread_id: str) -> List[Message] | None:
+        stored = await user.load(self._store_key(thread_id), [])
+        return [Message(**m) for m in stored]
+
+    async def append(self, thread_id: str, messages: List[Message]) -> None:
+        # read storage, not the cache: another worker may have added turns
+        history = await self.load(thread_id)
+        await user.save(
+            self._store_key(thread_id),
+            [m.model_dump(mode="json", exclude={"text"}) for m in history + messages],
+        )
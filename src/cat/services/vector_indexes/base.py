@@ -0,0 +1,111 @@
+from abc import abstractmethod
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from ..service import Service
+
+
+class VectorHit(BaseModel):
+    """One search result: the stored id, its similarity to the query and what
+    was stored with it."""
+
+    id: str
+    score: float
+    user_id: str | None = None
+    metadata: dict = Field(default_factory=dict)
+
+
+class VectorIndex(Service):
+    """
+    Base class for vector storage and similarity search.
+
+    Vectors live in named collections (one per use, e.g. "documents" or
+    "episodic"); each vector has a string id, an optional owner `user_id` and a
+    metadata dict, and searches can be restricted by both. Similarity is cosine.
+
+    Core ships two NumPy-backed indexes (install the `vector` extra): `default`,
+    exact brute-force search, and `ivf`, approximate search that only scans the
+    clusters closest to the query. Plugins add others (a vector database
+    client, another ANN library) by subclassing this and registering the class
+    like any other service:
+
+        index = await ccat().get("vector_indexes", "default")
+        await index.upsert("documents", ids, await embedder_many(texts))
+        hits = await index.search("documents", await embedder(query), k=5)
+    """
+
+    service_type = "vector_indexes"
+    singleton = True  # holds the collections in memory
+
+    @abstractmethod
+    async def upsert(
+        self,
+        collection: str,
+        ids: List[str],
+        vectors: List[List[float]],
+        metadata: List[dict] | None = None,
+        user_id: str | None = None,
+    ) -> None:
+        """
+        Insert vectors, replacing those whose id is already stored.
+
+        Parameters
+        ----------
+        collection : str
+            Collection name; created on first upsert.
+        ids : List[str]
+            One id per vector.
+        vectors : List[List[float]]
+            The vectors, all with the same dimension.
+        metadata : List[dict] | None
+            One dict per vector, returned with search hits and usable in `where`.
+        user_id : str | None
+            Owner of all the vectors in this call; None for shared vectors.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, collection: str, ids: List[str]) -> int:
+        """Delete vectors by id. Returns how many were found and deleted."""
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        collection: str,
+        vector: List[float],
+        k: int = 10,
+        user_id: str | None = None,
+        where: dict | None = None,
+    ) -> List[VectorHit]:
+        """
+        The `k` stored vectors most similar to `vector`, best first.
+
+        Parameters
+        ----------
+        collection : str
+            Collection to search; an unknown collection has no hits.
+        vector : List[float]
+            The query vector.
+        k : int
+            Maximum number of hits.
+        user_id : str | None
+            If given, only vectors owned by this user are considered.
+        where : dict | None
+            If given, only vectors whose metadata has all these key/value pairs
+            are considered.
+        """
+        pass
+
+    async def count(self, collection: str) -> int:
+        """Number of vectors stored in a collection."""
+        return 0
+
+    async def drop(self, collection: str) -> None:
+        """Delete a whole collection."""
+        pass
+
+    async def persist(self) -> None:
+        """Flush pending changes to storage, if the index keeps any in memory."""
+        pass
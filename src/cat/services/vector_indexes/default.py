@@ -0,0 +1,380 @@
+import os
+import re
+import json
+import shutil
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Dict
+
+import numpy as np
+
+from cat import config
+from .base import VectorIndex, VectorHit
+
+
+# Collection names become folder names.
+COLLECTION_NAME = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length, so a dot product is a cosine similarity."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def ranked(scores: np.ndarray, n: int) -> np.ndarray:
+    """Positions of the `n` highest scores, best first, without a full sort."""
+    if n < len(scores):
+        top = np.argpartition(-scores, n)[:n]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class ReadWriteLock:
+    """Any number of readers, or one writer.
+
+    A waiting writer holds back readers that arrive after it, so a steady
+    flow of searches does not starve writes.
+    """
+
+    def __init__(self):
+        # held by a writer, and briefly by each reader on its way in
+        self._lock = asyncio.Lock()
+        self._readers = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @asynccontextmanager
+    async def read(self):
+        async with self._lock:
+            self._readers += 1
+            self._idle.clear()
+        try:
+            yield
+        finally:
+            self._readers -= 1
+            if not self._readers:
+                self._idle.set()
+
+    @asynccontextmanager
+    async def write(self):
+        async with self._lock:
+            await self._idle.wait()
+            yield
+
+
+class Collection:
+    """
+    A dense, in-memory table of unit vectors with ids, owners and metadata.
+
+    Row-aligned NumPy arrays (`columns`) hold the vectors and the owner of
+    each row (as an int code); ids and metadata are Python lists. Deleting a
+    row moves the last row into its place, so the table stays dense and every
+    search is one matrix-vector product over `columns["vectors"][:size]`.
+
+    `save()` writes one `.npy` file per column plus a `records.json`; `load()`
+    maps the `.npy` files read-only (`mmap_mode="r"`), so opening a large
+    collection is instant and pages are read from disk as searches touch them.
+    The first write copies the arrays into memory.
+
+    Not thread safe: `DefaultVectorIndex` lets searches run concurrently and
+    writes one at a time, per collection.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.dim: int | None = None
+        self.size = 0
+        self.columns: Dict[str, np.ndarray] = {}
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.metadata: List[dict] = []
+        # owner codes; 0 is "no owner"
+        self.owners: List[str | None] = [None]
+        self.owner_codes: Dict[str | None, int] = {None: 0}
+        self.dirty = False
+
+    # --- storage -----------------------------------------------------------
+
+    def new_columns(self, capacity: int) -> Dict[str, np.ndarray]:
+        return {
+            "vectors": np.empty((capacity, self.dim), dtype=np.float32),
+            "owner": np.empty(capacity, dtype=np.int32),
+        }
+
+    def reserve(self, n: int) -> None:
+        """Make room for `n` rows in writable arrays."""
+        vectors = self.columns.get("vectors")
+        if vectors is not None and vectors.flags.writeable and len(vectors) >= n:
+            return
+        capacity = max(n, 2 * self.size, 1024)
+        columns = self.new_columns(capacity)
+        for name, column in self.columns.items():
+            columns[name][:self.size] = column[:self.size]
+        self.columns = columns
+
+    def move(self, src: int, dst: int) -> None:
+        for column in self.columns.values():
+            column[dst] = column[src]
+        self.metadata[dst] = self.metadata[src]
+        self.ids[dst] = self.ids[src]
+        self.positions[self.ids[dst]] = dst
+
+    # --- writes ------------------------------------------------------------
+
+    def upsert(
+        self,
+        ids: List[str],
+        vectors: List[List[float]],
+        metadata: List[dict] | None = None,
+        user_id: str | None = None,
+    ) -> np.ndarray:
+        """Store vectors; returns the rows they were written to."""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(ids):
+            raise ValueError("Expected one vector per id.")
+        if metadata is not None and len(metadata) != len(ids):
+            raise ValueError("Expected one metadata dict per id.")
+        if len(ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        if self.dim is None:
+            self.dim = matrix.shape[1]
+        elif matrix.shape[1] != self.dim:
+            raise ValueError(
+                f"Collection stores {self.dim}-d vectors, got {matrix.shape[1]}-d."
+            )
+
+        self.reserve(self.size + len(ids))
+        owner = self.owner_codes.get(user_id)
+        if owner is None:
+            owner = self.owner_codes[user_id] = len(self.owners)
+            self.owners.append(user_id)
+
+        rows = np.empty(len(ids), dtype=np.int64)
+        for i, id in enumerate(ids):
+            row = self.positions.get(id)
+            meta = dict(metadata[i]) if metadata is not None else {}
+            if row is None:
+                row = self.positions[id] = self.size
+                self.ids.append(id)
+                self.metadata.append(meta)
+                self.size += 1
+            else:
+                self.metadata[row] = meta
+            rows[i] = row
+
+        self.columns["vectors"][rows] = normalize(matrix)
+        self.columns["owner"][rows] = owner
+        self.dirty = True
+        return rows
+
+    def delete(self, ids: List[str]) -> int:
+        rows = [self.positions[id] for id in set(ids) if id in self.positions]
+        if not rows:
+            return 0
+        self.reserve(self.size)
+        # fill holes from the end, highest rows first, so a moved row is never
+        # one that is about to be deleted
+        for row in sorted(rows, reverse=True):
+            last = self.size - 1
+            del self.positions[self.ids[row]]
+            if row != last:
+                self.move(last, row)
+            self.ids.pop()
+            self.metadata.pop()
+            self.size -= 1
+        self.dirty = True
+        return len(rows)
+
+    # --- search ------------------------------------------------------------
+
+    def needs_training(self) -> bool:
+        """Whether `train()` is due before searching (see `IVFCollection`)."""
+        return False
+
+    def train(self) -> None:
+        pass
+
+    def candidates(self, query: np.ndarray, user_id: str | None) -> np.ndarray | None:
+        """Rows worth scoring for this query (None: all of them)."""
+        if user_id is None:
+            return None
+        owner = self.owner_codes.get(user_id)
+        if owner is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.columns["owner"][:self.size] == owner)
+
+    def search(
+        self,
+        vector: List[float],
+        k: int = 10,
+        user_id: str | None = None,
+        where: dict | None = None,
+    ) -> List[VectorHit]:
+        if self.size == 0 or k <= 0:
+            return []
+        query = normalize(np.asarray(vector, dtype=np.float32))
+        if query.shape != (self.dim,):
+            raise ValueError(f"Collection stores {self.dim}-d vectors, got {query.shape}.")
+
+        vectors = self.columns["vectors"][:self.size]
+        rows = self.candidates(query, user_id)
+        if rows is None:
+            scores = vectors @ query
+        else:
+            scores = vectors[rows] @ query
+
+        # metadata filters are checked on the best rows first; over-fetch, and
+        # only rank everything if too few of them match
+        n = k * 4 if where else k
+        while True:
+            hits = []
+            for i in ranked(scores, n):
+                row = int(i if rows is None else rows[i])
+                meta = self.metadata[row]
+                if where and any(meta.get(key) != value for key, value in where.items()):
+                    continue
+                hits.append(VectorHit(
+                    id=self.ids[row],
+                    score=float(scores[i]),
+                    user_id=self.owners[self.columns["owner"][row]],
+                    metadata=meta,
+                ))
+                if len(hits) == k:
+                    return hits
+            if n >= len(scores):
+                return hits
+            n = len(scores)
+
+    # --- persistence -------------------------------------------------------
+
+    def save(self) -> None:
+        """Write the collection to `path`, atomically per file."""
+        os.makedirs(self.path, exist_ok=True)
+        for name, column in self.columns.items():
+            self._replace(
+                f"{name}.npy", lambda f, column=column: np.save(f, column[:self.size])
+            )
+        records = {
+            "dim": self.dim,
+            "columns": list(self.columns),
+            "ids": self.ids,
+            "metadata": self.metadata,
+            "owners": self.owners,
+        }
+        self._replace("records.json", lambda f: f.write(json.dumps(records).encode()))
+        self.dirty = False
+
+    def _replace(self, filename: str, write) -> None:
+        path = os.path.join(self.path, filename)
+        with open(path + ".tmp", "wb") as f:
+            write(f)
+        os.replace(path + ".tmp", path)
+
+    def load(self) -> "Collection":
+        """Read a saved collection back, memory-mapping its arrays."""
+        records_path = os.path.join(self.path, "records.json")
+        if not os.path.exists(records_path):
+            return self
+        with open(records_path) as f:
+            records = json.load(f)
+
+        self.dim = records["dim"]
+        self.ids = records["ids"]
+        self.metadata = records["metadata"]
+        self.owners = records["owners"]
+        self.owner_codes = {owner: code for code, owner in enumerate(self.owners)}
+        self.positions = {id: row for row, id in enumerate(self.ids)}
+        self.size = len(self.ids)
+        self.columns = {
+            name: np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+            for name in records["columns"]
+        }
+        return self
+
+
+class DefaultVectorIndex(VectorIndex):
+    """
+    Exact (brute-force) cosine search with NumPy.
+
+    Every query is scored against every stored vector in one vectorized
+    product: no build step, perfect recall, and fast enough up to a few
+    hundred thousand vectors per collection (see `benchmark.py` next to this
+    file). Collections are persisted under `<DATA_PATH>/vector_indexes/<slug>/`
+    on `persist()` and on shutdown.
+    """
+
+    slug = "default"
+    name = "Vector index (exact)"
+    description = "Brute-force cosine similarity over memory-mapped NumPy arrays."
+
+    def __init__(self):
+        self.collections: Dict[str, Collection] = {}
+        self.locks: Dict[str, ReadWriteLock] = {}
+
+    def collection_path(self, collection: str) -> str:
+        if not COLLECTION_NAME.match(collection):
+            raise ValueError(f"Invalid collection name: {collection!r}")
+        return os.path.join(config.DATA_PATH, "vector_indexes", self.slug, collection)
+
+    async def new_collection(self, path: str) -> Collection:
+        return Collection(path)
+
+    async def get_collection(self, collection: str) -> Collection:
+        """The named collection, loaded from disk on first use."""
+        if collection not in self.collections:
+            path = self.collection_path(collection)
+            c = await self.new_collection(path)
+            c = await asyncio.to_thread(c.load)
+            # concurrent readers may have loaded it too: keep the first
+            self.collections.setdefault(collection, c)
+        return self.collections[collection]
+
+    def lock(self, collection: str) -> ReadWriteLock:
+        return self.locks.setdefault(collection, ReadWriteLock())
+
+    async def upsert(self, collection, ids, vectors, metadata=None, user_id=None):
+        async with self.lock(collection).write():
+            c = await self.get_collection(collection)
+            c.upsert(ids, vectors, metadata=metadata, user_id=user_id)
+
+    async def delete(self, collection, ids):
+        async with self.lock(collection).write():
+            c = await self.get_collection(collection)
+            return c.delete(ids)
+
+    async def search(self, collection, vector, k=10, user_id=None, where=None):
+        lock = self.lock(collection)
+        async with lock.read():
+            c = await self.get_collection(collection)
+        if c.needs_training():
+            # training rewrites the collection: a write, not a read
+            async with lock.write():
+                if c.needs_training():
+                    await asyncio.to_thread(c.train)
+        async with lock.read():
+            c = await self.get_collection(collection)
+            # scoring a large collection takes a while: keep it off the event loop
+            return await asyncio.to_thread(c.search, vector, k, user_id, where)
+
+    async def count(self, collection):
+        async with self.lock(collection).read():
+            c = await self.get_collection(collection)
+            return c.size
+
+    async def drop(self, collection):
+        async with self.lock(collection).write():
+            path = self.collection_path(collection)
+            self.collections.pop(collection, None)
+            await asyncio.to_thread(shutil.rmtree, path, True)
+
+    async def persist(self):
+        for name, c in list(self.collections.items()):
+            async with self.lock(name).write():
+                if c.dirty:
+                    await asyncio.to_thread(c.save)
+
+    async def close(self):
+        await self.persist()
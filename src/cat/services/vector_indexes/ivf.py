@@ -0,0 +1,149 @@
+import os
+from typing import Dict
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .default import DefaultVectorIndex, Collection, normalize, ranked
+
+
+# Below this many vectors a collection is searched exactly; clustering only
+# pays off on larger ones.
+MIN_TRAIN_SIZE = 4096
+# k-means runs on a sample of this many vectors per cluster.
+TRAIN_SAMPLE_PER_LIST = 64
+TRAIN_ITERATIONS = 10
+# Rows assigned to clusters per matrix product, to bound temporary memory.
+ASSIGN_CHUNK = 8192
+
+
+class IVFCollection(Collection):
+    """
+    A `Collection` partitioned into clusters (an inverted file index).
+
+    Vectors are grouped by spherical k-means into `nlist` clusters; a search
+    ranks the cluster centroids and only scores the rows of the `nprobe`
+    closest clusters, trading a little recall for scanning roughly
+    `nprobe / nlist` of the collection. Each row's cluster is kept in the
+    `list` column, so upserts and deletes stay as cheap as in the exact index.
+
+    Clusters are (re)trained before a search, by the index under its write
+    lock, once the collection reaches `MIN_TRAIN_SIZE` vectors and whenever it
+    has doubled since the last training; until then searches are exact.
+    """
+
+    def __init__(self, path: str, nlist: int = 0, nprobe: int = 8):
+        super().__init__(path)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.centroids: np.ndarray | None = None
+        self.trained_size = 0
+
+    def new_columns(self, capacity: int) -> Dict[str, np.ndarray]:
+        columns = super().new_columns(capacity)
+        columns["list"] = np.zeros(capacity, dtype=np.int32)
+        return columns
+
+    def upsert(self, ids, vectors, metadata=None, user_id=None):
+        rows = super().upsert(ids, vectors, metadata=metadata, user_id=user_id)
+        if self.centroids is not None and len(rows):
+            self.columns["list"][rows] = self.assign(self.columns["vectors"][rows])
+        return rows
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest centroid of each vector."""
+        lists = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_CHUNK):
+            chunk = vectors[start:start + ASSIGN_CHUNK]
+            lists[start:start + ASSIGN_CHUNK] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return lists
+
+    def needs_training(self) -> bool:
+        if self.size < MIN_TRAIN_SIZE:
+            return False
+        return self.centroids is None or self.size >= 2 * self.trained_size
+
+    def train(self) -> None:
+        """Cluster the stored vectors and assign every row to its cluster."""
+        nlist = self.nlist or int(np.sqrt(self.size))
+        nlist = max(1, min(nlist, self.size))
+
+        rng = np.random.default_rng(0)
+        vectors = self.columns["vectors"][:self.size]
+        n_sample = min(self.size, nlist * TRAIN_SAMPLE_PER_LIST)
+        sample = vectors[np.sort(rng.choice(self.size, n_sample, replace=False))]
+
+        centroids = sample[rng.choice(n_sample, nlist, replace=False)]
+        for _ in range(TRAIN_ITERATIONS):
+            lists = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, lists, sample)
+            # an empty cluster keeps its previous centroid
+            empty = np.bincount(lists, minlength=nlist) == 0
+            sums[empty] = centroids[empty]
+            centroids = normalize(sums)
+
+        self.reserve(self.size)
+        self.centroids = centroids
+        self.columns["list"][:self.size] = self.assign(self.columns["vectors"][:self.size])
+        self.trained_size = self.size
+        self.dirty = True
+
+    def candidates(self, query, user_id):
+        # trained by `DefaultVectorIndex.search` under the write lock, never
+        #  here: searches only hold the read lock
+        if self.centroids is None:
+            return super().candidates(query, user_id)
+
+        probes = ranked(self.centroids @ query, self.nprobe)
+        mask = np.isin(self.columns["list"][:self.size], probes)
+        if user_id is not None:
+            owner = self.owner_codes.get(user_id)
+            if owner is None:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.columns["owner"][:self.size] == owner
+        return np.flatnonzero(mask)
+
+    def save(self) -> None:
+        super().save()
+        path = os.path.join(self.path, "centroids.npy")
+        if self.centroids is None:
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            self._replace("centroids.npy", lambda f: np.save(f, self.centroids))
+
+    def load(self) -> "IVFCollection":
+        super().load()
+        path = os.path.join(self.path, "centroids.npy")
+        if os.path.exists(path) and "list" in self.columns:
+            self.centroids = np.load(path)
+            self.trained_size = self.size
+        return self
+
+
+class IVFVectorIndex(DefaultVectorIndex):
+    """
+    Approximate cosine search with an inverted file (IVF) index.
+
+    Same API and storage as the exact `default` index, but large collections
+    are clustered and a query only scans the clusters nearest to it. Raise
+    `nprobe` for better recall, lower it for speed; `benchmark.py` next to this
+    file reports both against exact search.
+    """
+
+    slug = "ivf"
+    name = "Vector index (approximate, IVF)"
+    description = "Clustered (inverted file) cosine search over NumPy arrays."
+
+    class Settings(BaseModel):
+        nlist: int = Field(
+            0, ge=0, description="Number of clusters; 0 picks sqrt(collection size)."
+        )
+        nprobe: int = Field(
+            8, ge=1, description="Clusters scanned per query."
+        )
+
+    async def new_collection(self, path: str) -> IVFCollection:
+        settings = await self.load_settings()
+        return IVFCollection(path, nlist=settings.nlist, nprobe=settings.nprobe)
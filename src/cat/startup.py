@@ -5,11 +5,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from cat import config
 from cat.ambient.context_vars import Ctx, set_ctx, reset_ctx
+from cat.looking_glass.change_bus import change_bus
 from cat.routes import (
     status,
     openapi,
     settings,
     agents,
+    embeddings,
+    keys,
 )
 
 from cat.routes.me import me
@@ -23,19 +26,26 @@ async def lifespan(app: FastAPI):
     #  ^._.^
     ccat = CheshireCat()
     await ccat.bootstrap(app)
+    await change_bus.start()
 
     yield
 
+    await change_bus.stop()
+    await openapi.document(app).close()
+    await ccat.mcp_clients.close()
+    # close every live service (providers' clients, vector indexes save to disk)
+    await ccat.registry.teardown()
+
 
 class RequestContextMiddleware:
     """
-    Pure-ASGI middleware that authenticates each request and populates the
-    per-request context vars.
+    Pure-ASGI middleware that populates the per-request context vars.
 
     Pure ASGI (not BaseHTTPMiddleware) so the contextvar is set in the *same*
     async context the endpoint runs in — BaseHTTPMiddleware would set it in a
-    separate task and the endpoint would not see it. Authentication is
-    best-effort: public routes simply get `user = None`.
+    separate task and the endpoint would not see it. Authentication is lazy
+    and best-effort: it runs on the first `await ctx().get_user()` (routes
+    gated by role, plugin endpoints), and failures give `user = None`.
     """
 
     def __init__(self, app):
@@ -49,12 +59,14 @@ class RequestContextMiddleware:
         from cat.ambient import auth
 
         request = Request(scope, receive)
-        try:
-            user = await auth(request)
-        except Exception:
-            user = None
 
-        token = set_ctx(Ctx(user=user, request=request))
+        async def authenticate():
+            try:
+                return await auth(request)
+            except Exception:
+                return None
+
+        token = set_ctx(Ctx(user=None, request=request, authenticator=authenticate))
         try:
             await self.app(scope, receive, send)
         finally:
@@ -72,6 +84,8 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
         docs_url=None,
         redoc_url=None,
+        # served pre-built by `routes/openapi.py`
+        openapi_url=None,
         title="Cheshire Cat AI",
         license_info={
             "name": "GPL-3",
@@ -109,10 +123,11 @@ def create_app() -> FastAPI:
 
     # all routers mounted at root (no API prefix)
     for r in [
-        me, status, settings, agents,
-        plugins, openapi
+        me, keys, status, settings, agents,
+        embeddings, plugins, openapi
     ]:
         app.include_router(r.router)
+    app.openapi = openapi.get_openapi_configuration_function(app)
 
     return app
 
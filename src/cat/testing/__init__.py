@@ -174,6 +174,12 @@ def isolated_project(monkeypatch, tmp_path, request):
     # seed active_plugins to exactly the selected set
     _set_active_plugins(sorted(selected))
 
+    # values cached from the previous test's db (and the direct seeding above
+    # bypassed the store, so it did not invalidate them)
+    from cat.db.cache import store_cache
+
+    store_cache.clear()
+
 
 # The default master key ("meow") as a Bearer header. Baked into the standard
 # clients so the common case — an authenticated admin — needs no boilerplate.
@@ -32,6 +32,13 @@ class Task(BaseModel):
         description="Whether to enable streaming tokens or not."
     )
 
+    thread_id: str | None = Field(
+        None,
+        description="Server-side thread to continue. When set, `messages` holds only "
+                    "the new turn: the history is loaded from the thread and the turn "
+                    "and its replies are appended to it after the run."
+    )
+
 class TaskResult(Task):
     """
     Output from an Agent.
@@ -0,0 +1,86 @@
+"""
+Multi-worker serving (`config.WORKERS > 1`).
+
+The parent process binds the socket and preloads the app before forking: the
+API module and the modules of the active plugins (with their requirements)
+are imported once, so workers start fast and share those pages. Each worker
+then runs the app lifespan on its own, finding the plugin modules already
+imported, and serves connections from the shared socket.
+
+Workers keep their plugin and settings state coherent through the change bus
+(`cat.looking_glass.change_bus`). A worker that dies is replaced.
+"""
+
+import os
+import signal
+import asyncio
+
+import uvicorn
+
+from cat import log
+
+
+APP = "cat.startup:cheshire_cat_api"
+
+
+def preload() -> None:
+    """Import the app and the active plugins in the parent process."""
+    from cat.startup import cheshire_cat_api  # noqa: F401
+    from cat.mad_hatter.mad_hatter import MadHatter
+    from cat.db.cache import store_cache
+
+    asyncio.run(MadHatter().find_plugins())
+    # workers read their own
+    store_cache.clear()
+
+
+def serve(workers: int, **options) -> None:
+    """Run `workers` forked uvicorn servers on one socket."""
+
+    if not hasattr(os, "fork"):
+        log.warning("Preloading workers needs fork(); starting them without preload.")
+        uvicorn.run(APP, workers=workers, **options)
+        return
+
+    uvicorn_config = uvicorn.Config(APP, **options)
+    sock = uvicorn_config.bind_socket()
+    preload()
+
+    children = set()
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                uvicorn.Server(uvicorn_config).run(sockets=[sock])
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for _ in range(workers):
+        spawn()
+    log.info(f"Serving with {workers} workers.")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            log.error(f"Worker {pid} exited ({status}), starting a new one.")
+            spawn()
+
+    sock.close()
@@ -76,3 +76,47 @@ def test_ctx_resets_after_block():
         assert ctx_is_empty()
 
     asyncio.run(main())
+
+
+def test_user_is_authenticated_lazily_once():
+    """`get_user()` runs the authenticator on first call only, also when the
+    first calls are concurrent; before that the proxy refuses to guess."""
+    alice = _user("alice")
+    calls = []
+
+    async def authenticate():
+        calls.append(1)
+        await asyncio.sleep(0)  # let the other first call in
+        return alice
+
+    async def main():
+        with use_ctx(Ctx(user=None, authenticator=authenticate)) as c:
+            with pytest.raises(RuntimeError, match="get_user"):
+                _ = user.name
+            assert await asyncio.gather(c.get_user(), ctx().get_user()) == [alice, alice]
+            assert user.name == "alice"
+
+    asyncio.run(main())
+    assert calls == [1]
+
+
+def test_user_methods_authenticate_first(monkeypatch):
+    """The async methods of the proxy resolve the user through `get_user()`."""
+    from cat.auth.user import User
+
+    alice = _user("alice")
+
+    async def load(self, key, default=None):
+        return f"{self.name}:{key}"
+
+    async def authenticate():
+        return alice
+
+    monkeypatch.setattr(User, "load", load)
+
+    async def main():
+        with use_ctx(Ctx(user=None, authenticator=authenticate)) as c:
+            assert await user.load("theme") == "alice:theme"
+            assert c.authenticator is None and c.user is alice
+
+    asyncio.run(main())
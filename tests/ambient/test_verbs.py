@@ -9,7 +9,7 @@ import asyncio
 
 
 from cat.ambient import verbs
-from cat.types import Message, TextContent
+from cat.types import Message, TextContent, ToolCall
 
 
 # --- slug parsing ----------------------------------------------------------
@@ -77,9 +77,113 @@ def test_existing_messages_keep_system_prompt(monkeypatch):
     assert provider.seen["messages"] == existing
 
 
+# --- llm() streaming: token coalescing --------------------------------------
+# Provider deltas are batched into few TextMessageContent events sharing one
+# message_id with the start/end events; the concatenated text is unchanged.
+
+class _StreamingProvider:
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    async def llm(self, model, messages, system_prompt="", tools=[], on_token=None, on_tool_call=None):
+        for t in self.tokens:
+            if isinstance(t, float):
+                await asyncio.sleep(t)  # a slow token
+            elif isinstance(t, ToolCall):
+                await on_tool_call(t)
+            elif isinstance(t, Exception):
+                raise t  # the provider fails mid-stream
+            else:
+                await on_token(t)
+        text = "".join(t for t in self.tokens if isinstance(t, str))
+        return Message(role="assistant", content=[TextContent(text=text)])
+
+
+def _stream_llm(monkeypatch, tokens, **coalescing):
+    from cat import config
+    from cat.ambient.context_vars import Ctx, use_ctx
+
+    for key, value in coalescing.items():
+        monkeypatch.setitem(config._values, key, value)
+    monkeypatch.setattr(verbs, "ccat", lambda: _FakeCat(_StreamingProvider(tokens)))
+
+    sent = []
+
+    async def stream(event):
+        sent.append(event)
+
+    async def main():
+        with use_ctx(Ctx(user=None, stream=stream)):
+            try:
+                await verbs.llm("hi", model="fake:fake", stream=True)
+            except RuntimeError as e:
+                sent.append({"type": "RUN_ERROR", "message": str(e)})
+                await asyncio.sleep(0.05)  # past any flush deadline
+
+    asyncio.run(main())
+    return sent
+
+
+def test_stream_coalesces_tokens_by_size(monkeypatch):
+    tokens = ["ab"] * 10
+    sent = _stream_llm(monkeypatch, tokens, STREAM_FLUSH_MS=60_000, STREAM_FLUSH_BYTES=8)
+
+    types = [e["type"] for e in sent]
+    assert types[0] == "TEXT_MESSAGE_START" and types[-1] == "TEXT_MESSAGE_END"
+    contents = [e["delta"] for e in sent if e["type"] == "TEXT_MESSAGE_CONTENT"]
+    assert contents == ["abababab", "abababab", "abab"]  # last batch flushed at end
+    assert len({e["message_id"] for e in sent}) == 1  # one stable message id
+
+
+def test_stream_flush_ms_zero_sends_every_token(monkeypatch):
+    tokens = ["a", "b", "c"]
+    sent = _stream_llm(monkeypatch, tokens, STREAM_FLUSH_MS=0)
+
+    contents = [e["delta"] for e in sent if e["type"] == "TEXT_MESSAGE_CONTENT"]
+    assert contents == tokens
+
+
+def test_stream_flushes_text_before_tool_calls(monkeypatch):
+    call = ToolCall(id="1", name="search", args={"q": "cats"})
+    tokens = ["let me ", "look", call, "found"]
+    sent = _stream_llm(monkeypatch, tokens, STREAM_FLUSH_MS=60_000)
+
+    flow = [(e["type"], e.get("delta")) for e in sent]
+    assert flow[1:3] == [
+        ("TEXT_MESSAGE_CONTENT", "let me look"),
+        ("TOOL_CALL_START", None),
+    ]
+    assert flow[-2:] == [("TEXT_MESSAGE_CONTENT", "found"), ("TEXT_MESSAGE_END", None)]
+
+
+def test_stream_deadline_flushes_before_a_slow_token(monkeypatch):
+    # "ab" is sent by the timer, ~flush_ms after it was buffered, not with "c"
+    sent = _stream_llm(monkeypatch, ["a", "b", 0.3, "c"], STREAM_FLUSH_MS=20)
+
+    contents = [e["delta"] for e in sent if e["type"] == "TEXT_MESSAGE_CONTENT"]
+    assert contents == ["ab", "c"]
+
+
+def test_stream_without_text_sends_nothing(monkeypatch):
+    assert _stream_llm(monkeypatch, []) == []
+
+
 # --- execute_hook no-op path -----------------------------------------------
 
 def test_execute_hook_unknown_returns_default(client):
     """Firing a hook no plugin defines returns the piped value unchanged."""
     out = asyncio.run(verbs.execute_hook("a_hook_no_one_defines", "passthrough"))
     assert out == "passthrough"
+
+
+def test_stream_is_closed_when_the_provider_fails(monkeypatch):
+    tokens = ["partial", RuntimeError("provider down")]
+    sent = _stream_llm(monkeypatch, tokens, STREAM_FLUSH_MS=20)
+
+    flow = [(e["type"], e.get("delta")) for e in sent]
+    assert flow == [
+        ("TEXT_MESSAGE_START", None),
+        ("TEXT_MESSAGE_CONTENT", "partial"),
+        ("TEXT_MESSAGE_END", None),
+        ("RUN_ERROR", None),
+    ]
@@ -0,0 +1,114 @@
+"""
+The content-addressed embedding cache (`cat.db.embeddings`).
+
+- vectors survive the float32 packing used by the DB tier;
+- `embedder_many()` only sends cache misses to the provider, once per distinct
+  text, and returns vectors in input order;
+- a lookup is served by the in-memory LRU first, then by the DB table;
+- purging drops both tiers, optionally for one provider / model only, and is an
+  admin-only endpoint.
+"""
+
+import asyncio
+
+import pytest
+
+from cat import config
+from cat.ambient import verbs
+from cat.db.embeddings import EmbeddingCache, embedding_cache, pack_vector, unpack_vector
+
+
+class _CountingProvider:
+    def __init__(self):
+        self.seen = []
+
+    async def embed(self, model, text):
+        self.seen.append(text)
+        return [float(len(text)), 0.5]
+
+    async def embed_many(self, model, texts):
+        return [await self.embed(model, t) for t in texts]
+
+
+class _FakeCat:
+    def __init__(self, provider):
+        self._provider = provider
+
+    async def get(self, type, slug, raise_error=True):
+        return self._provider
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = _CountingProvider()
+    monkeypatch.setattr(verbs, "ccat", lambda: _FakeCat(provider))
+    monkeypatch.setattr(verbs, "embedding_cache", EmbeddingCache())
+    return provider
+
+
+def test_pack_roundtrip():
+    assert unpack_vector(pack_vector([1.0, -2.5, 0.0])) == [1.0, -2.5, 0.0]
+    assert len(pack_vector([0.1] * 8)) == 8 * 4
+
+
+async def test_only_misses_are_embedded(provider):
+    await verbs.embedder("a", model="p:m")
+    vectors = await verbs.embedder_many(["bb", "a", "bb", "ccc"], model="p:m")
+
+    assert vectors == [[2.0, 0.5], [1.0, 0.5], [2.0, 0.5], [3.0, 0.5]]
+    assert provider.seen == ["a", "bb", "ccc"]
+
+
+async def test_cache_is_per_model(provider):
+    await verbs.embedder("a", model="p:m1")
+    await verbs.embedder("a", model="p:m2")
+    assert provider.seen == ["a", "a"]
+
+
+async def test_disabled(provider, monkeypatch):
+    monkeypatch.setitem(config._values, "EMBEDDING_CACHE", False)
+    await verbs.embedder("a", model="p:m")
+    await verbs.embedder("a", model="p:m")
+    assert provider.seen == ["a", "a"]
+
+
+async def test_memory_then_db_tier():
+    cache = EmbeddingCache()
+    await cache.put_many("p", "m", ["x", "y"], [[1.0], [2.0]])
+    assert await cache.get_many("p", "m", ["x", "z"]) == [[1.0], None]
+
+    # a fresh process (empty LRU) still finds the vectors in the DB
+    cold = EmbeddingCache()
+    assert await cold.get_many("p", "m", ["y", "x"]) == [[2.0], [1.0]]
+    assert await cold.get_many("p", "m", ["y"]) == [[2.0]]
+
+    stats = cold.stats()
+    assert (stats["db_hits"], stats["memory_hits"], stats["misses"]) == (2, 1, 0)
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+async def test_purge_by_provider():
+    cache = EmbeddingCache()
+    await cache.put_many("p1", "m", ["x"], [[1.0]])
+    await cache.put_many("p2", "m", ["x"], [[2.0]])
+
+    assert await cache.purge(provider="p1") == 1
+    assert await cache.get_many("p1", "m", ["x"]) == [None]
+    assert await cache.get_many("p2", "m", ["x"]) == [[2.0]]
+
+    assert await cache.purge() == 1
+    assert len(cache.memory) == 0
+
+
+def test_cache_endpoints(client, anon_client):
+    asyncio.run(embedding_cache.put_many("p", "m", ["x"], [[1.0]]))
+
+    assert anon_client.get("/embeddings/cache").status_code == 403
+    assert anon_client.delete("/embeddings/cache").status_code == 403
+
+    stats = client.get("/embeddings/cache").json()
+    assert set(stats) == {"size", "memory_hits", "db_hits", "misses", "hit_rate"}
+
+    res = client.delete("/embeddings/cache", params={"provider": "p"})
+    assert res.status_code == 200
+    assert res.json() == {"deleted": 1}
@@ -149,3 +149,43 @@ async def test_re_save_after_delete():
     await store.delete("k")
     await store.save("k", 2)
     assert await store.load("k") == 2
+
+
+# --- bulk verbs --------------------------------------------------------------
+
+async def test_save_many_load_many():
+    await store.save("a", 0)
+    await store.save_many({"a": 1, "b": [2], "c": None})
+
+    loaded = await store.load_many(["a", "b", "c", "missing"], default="?")
+    assert loaded == {"a": 1, "b": [2], "c": None, "missing": "?"}
+    assert list(loaded) == ["a", "b", "c", "missing"]  # request order
+
+
+async def test_delete_many():
+    await store.save_many({"a": 1, "b": 2, "c": 3})
+    assert await store.delete_many(["a", "b", "missing"]) == 2
+    assert await store.load_many(["a", "b", "c"]) == {"a": None, "b": None, "c": 3}
+
+
+async def test_bulk_verbs_chunk_large_batches(monkeypatch):
+    """Batches are split so a statement never binds more than SQLite allows."""
+    from uuid import uuid4
+    from cat.db import UserStore, helper
+
+    monkeypatch.setattr(helper, "CHUNK_SIZE", 2)
+    values = {f"k{i}": i for i in range(5)}
+    await store.save_many(values)
+    assert await store.load_many(values) == values
+    assert await store.delete_many(values) == 5
+
+    uid = uuid4()
+    await UserStore.save_many(uid, values)
+    assert await UserStore.load_many(uid, values) == values
+    assert await UserStore.delete_many(uid, values) == 5
+
+
+async def test_bulk_verbs_accept_empty_input():
+    assert await store.load_many([]) == {}
+    assert await store.save_many({}) == {}
+    assert await store.delete_many([]) == 0
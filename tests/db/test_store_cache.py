@@ -0,0 +1,83 @@
+"""
+The read-through cache in front of the global store (`cat.db.cache`).
+
+- repeated loads are served from memory, unset keys included;
+- every write invalidates, so a worker always reads its own writes;
+- a write by another worker is picked up when its change is received;
+- per-read `ttl=` bounds how long a value may be served, `ttl=0` bypasses.
+
+"Another worker" writes to the same DB; its change reaches this one on the
+change bus (`cat.looking_glass.change_bus`).
+"""
+
+from cat import config
+from cat.db import store
+from cat.db.cache import store_cache
+from cat.db.models import KeyValueDB
+from cat.looking_glass.change_bus import change_bus
+
+
+async def _write_behind_the_cache(key, raw):
+    await KeyValueDB.update({KeyValueDB.value: raw}).where(KeyValueDB.key == key)
+
+
+async def test_repeated_loads_are_hits():
+    await store.save("k", {"a": 1})
+    before = store_cache.stats()
+
+    for _ in range(3):
+        loaded = await store.load("k")
+        loaded["a"] = 2  # callers get their own copy
+    assert await store.load("k") == {"a": 1}
+    assert await store.load("unset") is None
+    assert await store.load("unset", "dflt") == "dflt"
+
+    after = store_cache.stats()
+    # misses: the first read of "k" after the save, and of "unset"
+    assert after["misses"] - before["misses"] == 2
+    assert after["hits"] - before["hits"] == 4
+
+
+async def test_writes_invalidate():
+    await store.save("k", 1)
+    assert await store.load("k") == 1
+    await store.save("k", 2)
+    assert await store.load("k") == 2
+    await store.save_many({"k": 3})
+    assert await store.load_many(["k"]) == {"k": 3}
+    await store.delete("k")
+    assert await store.exists("k") is False
+
+
+async def test_other_workers_changes_are_applied():
+    await store.save("k", "old")
+    assert await store.load("k") == "old"
+
+    # written without a change record: this worker keeps serving its cache
+    await _write_behind_the_cache("k", '"sneaky"')
+    assert await store.load("k") == "old"
+
+    # another worker's write announces the change
+    await _write_behind_the_cache("k", '"new"')
+    await change_bus.apply("store:k")
+    assert await store.load("k") == "new"
+
+
+async def test_ttl(monkeypatch):
+    await store.save("k", "old")
+    await store.load("k", ttl=0)
+    await _write_behind_the_cache("k", '"new"')
+    # ttl=0 neither caches nor needs a cached value
+    assert await store.load("k", ttl=0) == "new"
+
+    monkeypatch.setitem(config._values, "STORE_CACHE_TTL", 0)
+    await _write_behind_the_cache("k", '"newer"')
+    assert await store.load("k") == "newer"
+
+
+async def test_disabled(monkeypatch):
+    monkeypatch.setitem(config._values, "STORE_CACHE", False)
+    await store.save("k", "old")
+    await store.load("k")
+    await _write_behind_the_cache("k", '"new"')
+    assert await store.load("k") == "new"
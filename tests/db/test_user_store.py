@@ -5,11 +5,14 @@ The per-user key-value store: the `UserStore` data layer and the ambient
 The autouse `isolated_project` fixture gives every test a fresh SQLite DB.
 """
 
+import asyncio
+import datetime
 from uuid import uuid4, uuid5, NAMESPACE_DNS
 
 import pytest
 
-from cat.db import UserStore, store
+from cat.db import UserStore, UserKeyValueDB, store
+from cat.db.models import USER_KEY_VALUE_INDEX, migrate_user_key_value
 from cat.ambient.context_vars import Ctx, use_ctx, user
 from cat.auth.user import User
 
@@ -103,6 +106,16 @@ async def test_delete_is_scoped_to_one_user():
     assert await UserStore.load(bob, "k") == 2  # bob untouched
 
 
+async def test_keys_by_prefix_newest_first():
+    alice, bob = uuid4(), uuid4()
+    for key in ("note_a", "note_b", "notebook", "other"):
+        await UserStore.save(alice, key, 1)
+    await UserStore.save(alice, "note_a", 2)  # saved again: newest
+    await UserStore.save(bob, "note_c", 1)
+    assert await UserStore.keys(alice, "note_") == ["note_a", "note_b"]  # `_` is literal
+    assert len(await UserStore.keys(alice)) == 4
+
+
 async def test_user_and_global_stores_do_not_collide():
     """Same key string in the global store and a user store are different rows."""
     uid = uuid4()
@@ -149,3 +162,51 @@ async def test_proxy_and_userstore_share_storage():
     with use_ctx(Ctx(user=alice)):
         await user.save("k", {"v": 1})
     assert await UserStore.load(alice.id, "k") == {"v": 1}
+
+
+# --- one row per (user_id, key) ---------------------------------------------
+
+async def test_concurrent_saves_keep_one_row():
+    """Saves are single-statement upserts: racing writers never duplicate a key."""
+    uid = uuid4()
+    await asyncio.gather(*(UserStore.save(uid, "k", i) for i in range(20)))
+
+    rows = await UserKeyValueDB.count().where(UserKeyValueDB.user_id == uid)
+    assert rows == 1
+    assert await UserStore.load(uid, "k") in range(20)
+
+
+def test_migration_dedupes_and_adds_unique_index():
+    """Tables written by older versions may hold duplicates: the migration keeps
+    the most recently updated row per key, then enforces uniqueness."""
+    UserKeyValueDB.raw(f"DROP INDEX {USER_KEY_VALUE_INDEX}").run_sync()
+    uid = uuid4()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    # "new" was inserted first but updated last
+    for value, age in [("new", 0), ("old", 60)]:
+        UserKeyValueDB(
+            user_id=uid, key="k", value=f'"{value}"',
+            updated_at=now - datetime.timedelta(seconds=age),
+        ).save().run_sync()
+    UserKeyValueDB(user_id=uid, key="other", value='"x"').save().run_sync()
+
+    migrate_user_key_value()
+
+    rows = UserKeyValueDB.select(UserKeyValueDB.key, UserKeyValueDB.value).where(
+        UserKeyValueDB.user_id == uid
+    ).order_by(UserKeyValueDB.key).run_sync()
+    assert [(r["key"], r["value"]) for r in rows] == [("k", '"new"'), ("other", '"x"')]
+    with pytest.raises(Exception):
+        UserKeyValueDB(user_id=uid, key="k", value='"dup"').save().run_sync()
+
+
+async def test_proxy_bulk_verbs_are_user_scoped():
+    with use_ctx(Ctx(user=_user("alice"))):
+        await user.save_many({"theme": "dark", "lang": "it"})
+    with use_ctx(Ctx(user=_user("bob"))):
+        await user.save_many({"theme": "light"})
+        assert await user.delete_many(["theme", "lang"]) == 1
+    with use_ctx(Ctx(user=_user("alice"))):
+        assert await user.load_many(["theme", "lang", "x"]) == {
+            "theme": "dark", "lang": "it", "x": None
+        }
@@ -0,0 +1,185 @@
+"""Coherence of several workers (`cat.looking_glass.change_bus`).
+
+- a plugin toggled or installed by another worker is loaded here too, with
+  its hooks and endpoints; a toggle leaves the other services alone;
+- store keys saved by another worker are not served stale from the store
+  cache; for settings, neither from the settings cache, and the live
+  singleton is rebuilt; a settings save is announced once;
+- a worker does not refresh for its own changes, but still applies a change
+  another worker made to the same topic before;
+- a worker that may have missed changes (pruned log, lost listener) refreshes
+  everything;
+- refreshes started by NOTIFY are referenced until done;
+- a single worker on SQLite publishes nothing.
+
+The other worker is simulated by publishing under another worker id.
+"""
+
+import pytest
+import pytest_asyncio
+
+from cat import config
+from cat.ambient.runtime import ccat
+from cat.db import store
+from cat.db.models import ChangeDB, KeyValueDB
+from cat.looking_glass.change_bus import CHANNEL, ChangeBus, change_bus
+from cat.mad_hatter.plugin_extractor import PluginExtractor
+from cat.services.core_settings import CoreSettings
+
+from tests.utils import create_mock_plugin_zip
+
+
+@pytest.fixture(autouse=True)
+def several_workers(monkeypatch):
+    # before the app starts: a single worker on SQLite runs no bus
+    monkeypatch.setitem(config._values, "WORKERS", 2)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def cheshire_cat(async_client):
+    yield ccat()
+
+
+async def _publish_elsewhere(topic):
+    me = change_bus.worker
+    change_bus.worker = "other"
+    try:
+        await change_bus.publish(topic)
+    finally:
+        change_bus.worker = me
+
+
+async def test_plugins_changed_elsewhere(cheshire_cat):
+    # another worker installs and activates the mock plugin
+    PluginExtractor(create_mock_plugin_zip(flat=True)).extract(config.PLUGINS_PATH)
+    await store.save("active_plugins", ["mock_plugin"])
+    await _publish_elsewhere("plugins")
+
+    await change_bus.poll()
+
+    mad_hatter = cheshire_cat.mad_hatter
+    assert "mock_plugin" in mad_hatter.plugins
+    assert "before_cat_sends_message" in mad_hatter.hooks
+    assert any(
+        getattr(getattr(r, "endpoint", None), "plugin_id", None) == "mock_plugin"
+        for r in cheshire_cat.fastapi_app.routes
+    )
+
+    # ...and deactivates it
+    await store.save("active_plugins", [])
+    await _publish_elsewhere("plugins")
+    await change_bus.poll()
+    assert "before_cat_sends_message" not in mad_hatter.hooks
+
+
+async def test_plugin_toggled_elsewhere(cheshire_cat):
+    from cat.services.model_providers.openai_compatible import OpenAICompatibleProvider
+
+    mad_hatter = cheshire_cat.mad_hatter
+    await mad_hatter.install_plugin(create_mock_plugin_zip(flat=True), activate=False)
+    provider = await cheshire_cat.get("model_providers", "openai_compatible")
+
+    # another worker activates the plugin
+    await store.save("active_plugins", ["mock_plugin"])
+    await _publish_elsewhere("plugins:mock_plugin")
+    await change_bus.poll()
+
+    assert "before_cat_sends_message" in mad_hatter.hooks
+    assert "mock" in cheshire_cat.registry.classes["model_providers"]
+    assert OpenAICompatibleProvider._instance is provider
+
+    # ...and deactivates it
+    await store.save("active_plugins", [])
+    await _publish_elsewhere("plugins:mock_plugin")
+    await change_bus.poll()
+    assert "before_cat_sends_message" not in mad_hatter.hooks
+    assert OpenAICompatibleProvider._instance is provider
+
+
+async def test_settings_saved_elsewhere(cheshire_cat):
+    before = await CoreSettings.load_settings()
+    instance = CoreSettings()
+
+    # another worker saves: written to the DB, announced on the bus
+    value = before.model_dump()
+    value["default_llm"] = "elsewhere:model"
+    await store.save(CoreSettings._settings_key(), value)
+    assert (await CoreSettings.load_settings()).default_llm == before.default_llm
+
+    await _publish_elsewhere(f"store:{CoreSettings._settings_key()}")
+    await change_bus.poll()
+
+    assert (await CoreSettings.load_settings()).default_llm == "elsewhere:model"
+    assert CoreSettings() is not instance
+
+
+async def test_store_saved_elsewhere(cheshire_cat):
+    await store.save("k", "old")
+    assert await store.load("k") == "old"
+
+    # another worker saves: written to the DB, announced on the bus
+    await KeyValueDB.update({KeyValueDB.value: '"new"'}).where(KeyValueDB.key == "k")
+    assert await store.load("k") == "old"
+    await _publish_elsewhere("store:k")
+    await change_bus.poll()
+    assert await store.load("k") == "new"
+
+
+async def test_settings_save_is_announced_once(cheshire_cat):
+    before = await ChangeDB.count()
+    await CoreSettings.save_settings(await CoreSettings.load_settings())
+    assert await ChangeDB.count() == before + 1
+
+
+async def test_own_changes_are_not_applied_twice(cheshire_cat):
+    received = change_bus.received
+    settings = await CoreSettings.load_settings()
+    await CoreSettings.save_settings(settings)
+    await change_bus.poll()
+    assert change_bus.received == received
+
+
+async def test_changes_to_the_same_topic_are_all_seen(cheshire_cat):
+    await change_bus.poll()
+    received = change_bus.received
+    # another worker changes a topic, then this one changes it too
+    await _publish_elsewhere("auth")
+    await change_bus.publish("auth")
+
+    await change_bus.poll()
+    assert change_bus.received == received + 1
+
+
+async def test_pruned_changes_refresh_everything(cheshire_cat, monkeypatch):
+    resyncs = []
+    monkeypatch.setattr(change_bus, "resync", lambda: resyncs.append(1) or _done())
+    monkeypatch.setitem(config._values, "CHANGE_LOG_SIZE", 1)
+    await change_bus.poll()
+
+    await _publish_elsewhere("auth")
+    await _publish_elsewhere("plugins")  # prunes the first one
+    await change_bus.poll()
+    assert resyncs == [1]
+
+
+async def test_notified_refreshes_are_kept(cheshire_cat):
+    received = change_bus.received
+    change_bus._on_notify(None, 0, CHANNEL, "other:auth")
+    (task,) = change_bus._tasks
+    await task
+    assert change_bus._tasks == set()
+    assert change_bus.received == received + 1
+
+
+async def test_single_worker_publishes_nothing(cheshire_cat, monkeypatch):
+    monkeypatch.setitem(config._values, "WORKERS", 1)
+    bus = ChangeBus()
+    await bus.start()
+    before = await ChangeDB.count()
+    await bus.publish("auth")
+    assert bus.worker is None and await ChangeDB.count() == before
+    await bus.stop()
+
+
+async def _done():
+    pass
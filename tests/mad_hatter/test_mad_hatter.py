@@ -1,4 +1,6 @@
 import os
+from types import SimpleNamespace
+
 import pytest
 import pytest_asyncio
 
@@ -87,3 +89,87 @@ async def test_plugin_uninstall(mad_hatter: MadHatter, plugin_is_flat):
 
     # list of active plugins in DB is correct
     assert set(await mad_hatter.get_active_plugins()) == set()
+
+
+async def test_hook_pipeline_prepared_at_refresh(monkeypatch):
+    """Hook async-ness and the sync-hook deprecation warning are resolved once,
+    in `refresh_caches`, not on every `execute_hook`."""
+    from types import SimpleNamespace
+    from cat import log, utils
+    from cat.mad_hatter.decorators import hook
+
+    @hook("pipe", priority=2)
+    async def first(value):
+        return value + ["async"]
+
+    @hook("pipe", priority=1)
+    def second(value):
+        return value + ["sync"]
+
+    for h in (first, second):
+        h.plugin_id = "fake"
+
+    mad_hatter = MadHatter()
+    mad_hatter.plugins = {
+        "fake": SimpleNamespace(hooks=[second, first], endpoints=[], services=[])
+    }
+
+    warnings = []
+    monkeypatch.setattr(log, "warning", warnings.append)
+    await mad_hatter.refresh_caches()
+    assert len(warnings) == 1
+    assert "pipe" in warnings[0] and "should be async" in warnings[0]
+
+    def no_runtime_inspection(*args, **kwargs):
+        raise AssertionError("hooks must not be inspected per call")
+
+    monkeypatch.setattr(utils, "run_sync_or_async", no_runtime_inspection)
+    for _ in range(3):
+        assert await mad_hatter.execute_hook("pipe", []) == ["async", "sync"]
+    assert len(warnings) == 1
+
+
+async def test_toggle_is_incremental(mad_hatter: MadHatter):
+    """Toggling a plugin swaps only its hooks, endpoints and services: the live
+    singletons of untouched services survive."""
+    from cat.services.model_providers.openai_compatible import OpenAICompatibleProvider
+
+    await mad_hatter.install_plugin(create_mock_plugin_zip(flat=True))
+    registry = ccat().registry
+    provider = await ccat().get("model_providers", "openai_compatible")
+    assert registry.classes["model_providers"]["mock"].plugin_id == "mock_plugin"
+
+    await mad_hatter.toggle_plugin("mock_plugin")
+    assert "before_cat_sends_message" not in mad_hatter.hooks
+    assert mad_hatter.endpoints == []
+    assert "mock" not in registry.classes["model_providers"]
+    assert OpenAICompatibleProvider._instance is provider
+
+    await mad_hatter.toggle_plugin("mock_plugin")
+    assert [h.priority for h in mad_hatter.hooks["before_cat_sends_message"]] == [3, 2]
+    assert len(mad_hatter.endpoints) == get_mock_plugin_info()["endpoints"]
+    assert "mock" in registry.classes["model_providers"]
+    assert await ccat().get("model_providers", "openai_compatible") is provider
+
+
+async def test_toggled_hooks_keep_plugin_order(mad_hatter: MadHatter, monkeypatch):
+    """A toggled plugin's hooks go back where a full refresh puts them: in
+    plugin order among hooks of the same priority."""
+
+    def plugin(id):
+        hook = SimpleNamespace(name="h", priority=1, plugin_id=id, is_async=True)
+        return SimpleNamespace(id=id, hooks=[hook], endpoints=[], services=[])
+
+    first, second = plugin("first"), plugin("second")
+    monkeypatch.setattr(mad_hatter, "plugins", {"first": first, "second": second})
+    monkeypatch.setattr(mad_hatter, "on_refresh_callbacks", [])
+    await mad_hatter.refresh_caches()
+    assert [h.plugin_id for h in mad_hatter.hooks["h"]] == ["first", "second"]
+
+    hooks, first.hooks = first.hooks, []
+    await mad_hatter.refresh_caches(["first"])
+    assert [h.plugin_id for h in mad_hatter.hooks["h"]] == ["second"]
+
+    first.hooks = hooks
+    await mad_hatter.refresh_caches(["first"])
+    assert [h.plugin_id for h in mad_hatter.hooks["h"]] == ["first", "second"]
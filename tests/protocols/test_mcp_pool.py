@@ -0,0 +1,172 @@
+"""The MCP session pool (`cat.protocols.model_context.client`).
+
+- repeated listings and tool calls reuse one initialized session per user and
+  per server, across agent runs;
+- with several servers tool names are prefixed and calls routed to their server;
+- requests on a session are bounded by `MCP_SESSION_CONCURRENCY`;
+- sessions that stop answering, or whose configuration changed, are reopened;
+- idle sessions are closed, with their locks, and all of them on `close()`;
+- tool listings are cached per server configuration, until the server
+  notifies a change or the TTL expires.
+
+In-memory FastMCP servers, no network.
+"""
+
+import asyncio
+from uuid import uuid5, NAMESPACE_DNS
+
+import pytest
+from cachetools import TTLCache
+from fastmcp import FastMCP
+
+from cat import config
+from cat.auth.user import User
+from cat.ambient.context_vars import Ctx, use_ctx
+from cat.protocols.model_context.client import MCPClients
+
+
+ADMIN = User(id=uuid5(NAMESPACE_DNS, "admin"), name="admin", roles=["admin"])
+
+
+def _server(name):
+    server = FastMCP(name)
+    server.running, server.peak = 0, 0
+
+    @server.tool
+    async def learn(name: str) -> str:
+        """Add a tool; the server notifies the change."""
+        server.tool(lambda: name, name=name)
+        return "ok"
+
+    @server.tool
+    async def echo(text: str, delay: float = 0) -> str:
+        """Echo the text, after a while."""
+        server.running += 1
+        server.peak = max(server.peak, server.running)
+        await asyncio.sleep(delay)
+        server.running -= 1
+        return f"{name}: {text}"
+
+    return server
+
+
+@pytest.fixture
+async def pool(monkeypatch):
+    servers = {"math": _server("math")}
+    monkeypatch.setattr(MCPClients, "server_configs", lambda self, agent: servers)
+    pool = MCPClients()
+    with use_ctx(Ctx(user=ADMIN)):
+        yield pool, servers
+    await pool.close()
+
+
+async def _echo(pool, name="echo", **args):
+    async with pool.get_user_client(None) as client:
+        await client.list_tools()
+        result = await client.call_tool(name, {"text": "hi", **args})
+    return result.content[0].text
+
+
+async def test_sessions_are_reused(pool):
+    pool, _ = pool
+    assert await _echo(pool) == "math: hi"
+    assert await _echo(pool) == "math: hi"
+
+    stats = pool.stats()
+    assert (stats["sessions"], stats["opened"], stats["evicted"]) == (1, 1, 0)
+    # still open between runs
+    assert pool.sessions[(str(ADMIN.id), "math")].connected
+
+
+async def test_tools_of_several_servers(pool):
+    pool, servers = pool
+    servers["search"] = _server("search")
+
+    async with pool.get_user_client(None) as client:
+        names = sorted(t.name for t in await client.list_tools())
+        assert names == ["math_echo", "math_learn", "search_echo", "search_learn"]
+        result = await client.call_tool("search_echo", {"text": "hi"})
+    assert result.content[0].text == "search: hi"
+    assert pool.stats()["sessions"] == 2
+
+
+async def test_concurrency_limit(pool, monkeypatch):
+    pool, servers = pool
+    monkeypatch.setitem(config._values, "MCP_SESSION_CONCURRENCY", 2)
+
+    async with pool.get_user_client(None) as client:
+        await client.list_tools()
+        await asyncio.gather(*[
+            client.call_tool("echo", {"text": str(i), "delay": 0.05}) for i in range(5)
+        ])
+    assert servers["math"].peak == 2
+
+
+async def test_dead_and_changed_sessions_are_reopened(pool, monkeypatch):
+    pool, servers = pool
+    await _echo(pool)
+    session = pool.sessions[(str(ADMIN.id), "math")]
+
+    # the connection dropped
+    await session.client.close()
+    assert await _echo(pool) == "math: hi"
+    assert pool.stats()["opened"] == 2
+
+    # the server does not answer pings anymore
+    async def no_pong():
+        raise ConnectionError("gone")
+
+    session = pool.sessions[(str(ADMIN.id), "math")]
+    monkeypatch.setattr(session.client, "ping", no_pong)
+    monkeypatch.setitem(config._values, "MCP_KEEPALIVE", 0)
+    assert await _echo(pool) == "math: hi"
+    assert pool.stats()["opened"] == 3
+
+    # the configuration changed
+    servers["math"] = _server("math")
+    await _echo(pool)
+    assert pool.stats()["opened"] == 4
+
+
+async def test_idle_sessions_are_closed(pool, monkeypatch):
+    pool, _ = pool
+    await _echo(pool)
+    session = pool.sessions[(str(ADMIN.id), "math")]
+
+    await pool.sweep()  # recently used: kept
+    assert pool.stats()["sessions"] == 1
+
+    monkeypatch.setitem(config._values, "MCP_IDLE_TIMEOUT", 0)
+    await pool.sweep()
+    assert pool.stats()["sessions"] == 0
+    assert not session.connected
+    assert pool.locks == {}  # not kept for the closed session
+
+    await _echo(pool)
+    session = pool.sessions[(str(ADMIN.id), "math")]
+    await pool.close()
+    assert not session.connected and pool.sessions == {}
+
+
+async def test_tool_listings_are_cached(pool, monkeypatch):
+    pool, servers = pool
+
+    async def names():
+        async with pool.get_user_client(None) as client:
+            return sorted(t.name for t in await client.list_tools())
+
+    assert await names() == ["echo", "learn"]
+    assert await names() == ["echo", "learn"]
+    assert (pool.listing_hits, pool.listing_misses) == (1, 1)
+
+    # the server says its tools changed
+    async with pool.get_user_client(None) as client:
+        await client.list_tools()
+        await client.call_tool("learn", {"name": "new"})
+    await asyncio.sleep(0.05)
+    assert await names() == ["echo", "learn", "new"]
+
+    # expired
+    pool.listings = TTLCache(maxsize=10, ttl=0)
+    await names()
+    assert pool.listing_misses == 3
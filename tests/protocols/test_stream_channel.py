@@ -0,0 +1,74 @@
+"""The bounded event channel behind streaming responses (`StreamChannel`).
+
+Self-contained: the channel is a plain asyncio queue, driven directly here.
+"""
+
+import asyncio
+
+import pytest
+
+from cat.protocols.agui import events
+from cat.protocols.agui.streaming import StreamChannel
+
+
+def _delta(text, message_id="m"):
+    return dict(events.TextMessageContentEvent(message_id=message_id, delta=text))
+
+
+def _drain(channel):
+    items = []
+    while not channel.empty():
+        items.append(channel.get_nowait())
+    return items
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        StreamChannel(overflow="explode")
+
+
+def test_drop_oldest_keeps_newest_events():
+    async def main():
+        channel = StreamChannel(maxsize=2, overflow="drop_oldest")
+        for i in range(5):
+            await channel.put(i)
+        return channel
+
+    channel = asyncio.run(main())
+    assert channel.dropped == 3
+    assert channel.peak_depth == 2
+    assert _drain(channel) == [3, 4]
+
+
+def test_coalesce_merges_deltas_of_the_same_message():
+    async def main():
+        channel = StreamChannel(maxsize=2, overflow="coalesce")
+        await channel.put("start")
+        for t in ["a", "b", "c"]:
+            await channel.put(_delta(t))
+        return channel
+
+    channel = asyncio.run(main())
+    assert channel.coalesced == 2
+    assert channel.dropped == 0
+    start, delta = _drain(channel)
+    assert start == "start"
+    assert delta["delta"] == "abc"
+
+
+def test_block_applies_backpressure():
+    async def main():
+        channel = StreamChannel(maxsize=1, overflow="block")
+        await channel.put(1)
+
+        producer = asyncio.create_task(channel.put(2))
+        await asyncio.sleep(0.01)
+        assert not producer.done()  # waiting for the consumer
+
+        assert await channel.get() == 1
+        await producer
+        assert await channel.get() == 2
+        return channel
+
+    channel = asyncio.run(main())
+    assert channel.stats() == {"depth": 0, "peak_depth": 1, "dropped": 0, "coalesced": 0}
@@ -0,0 +1,119 @@
+"""Per-user API keys (`cat.auth.api_keys`, `/me/keys`).
+
+- a key is shown once, at creation, and then authenticates as its user;
+- a key drawn with a taken prefix is drawn again;
+- it is verified with one bcrypt check, later requests hit the cache;
+- keys are found by prefix: unknown prefixes cost no hash check;
+- deleting a key revokes it right away;
+- wrong keys are not checked again for a while;
+- keys cannot grant roles their user does not hold;
+- admins can delete all keys of a user.
+"""
+
+from uuid import uuid4
+
+import bcrypt
+import pytest
+
+from cat import config
+from cat.auth.jwt import JWTHelper
+from cat.auth.user import User
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashes(monkeypatch):
+    monkeypatch.setitem(config._values, "API_KEY_BCRYPT_ROUNDS", 4)
+
+
+def _me(anon_client, key):
+    return anon_client.get("/me", headers={"Authorization": f"Bearer {key}"})
+
+
+def _count_checks(monkeypatch):
+    checks = []
+    original = bcrypt.checkpw
+
+    def spy(password, hashed):
+        checks.append(1)
+        return original(password, hashed)
+
+    monkeypatch.setattr(bcrypt, "checkpw", spy)
+    return checks
+
+
+def test_key_lifecycle(client, anon_client, monkeypatch):
+    created = client.post("/me/keys", json={"name": "ci"}).json()
+    key = created["key"]
+    assert key.startswith(created["prefix"] + "_")
+
+    checks = _count_checks(monkeypatch)
+    for _ in range(3):
+        response = _me(anon_client, key)
+        assert response.status_code == 200
+        assert response.json()["name"] == "admin"
+    assert len(checks) == 1
+
+    listed = client.get("/me/keys").json()
+    assert [k["name"] for k in listed] == ["ci"]
+    assert "key" not in listed[0] and "hash" not in listed[0]
+
+    assert client.delete(f"/me/keys/{created['id']}").status_code == 200
+    assert _me(anon_client, key).status_code == 403
+    assert client.delete(f"/me/keys/{created['id']}").status_code == 404
+
+
+async def test_taken_prefixes_are_drawn_again(monkeypatch):
+    from cat.auth import api_keys
+    from cat.auth.api_keys import ApiKeys
+
+    owner = User(id=uuid4(), name="alice", roles=["editor"])
+    monkeypatch.setattr(api_keys, "_new_prefix", lambda: "taken")
+    await ApiKeys.create(owner, "first")
+
+    prefixes = iter(["taken", "fresh"])
+    monkeypatch.setattr(api_keys, "_new_prefix", lambda: next(prefixes))
+    key, record = await ApiKeys.create(owner, "second")
+    assert record["prefix"] == "ccat_fresh"
+    assert (await ApiKeys.verify(key)).id == owner.id
+
+
+def test_wrong_keys(client, anon_client, monkeypatch):
+    key = client.post("/me/keys", json={"name": "ci"}).json()["key"]
+    checks = _count_checks(monkeypatch)
+
+    assert _me(anon_client, "ccat_unknown_secret").status_code == 403
+    assert checks == []
+
+    prefix = "_".join(key.split("_")[:2])
+    assert _me(anon_client, f"{prefix}_wrongsecret").status_code == 403
+    assert len(checks) == 1
+    # remembered as wrong: no second check
+    assert _me(anon_client, f"{prefix}_wrongsecret").status_code == 403
+    assert len(checks) == 1
+
+
+def test_keys_only_grant_held_roles(anon_client):
+    editor = User(id=uuid4(), name="ed", roles=["editor"])
+    headers = {"Authorization": f"Bearer {JWTHelper().encode(editor)}"}
+
+    denied = anon_client.post("/me/keys", json={"name": "x", "roles": ["admin"]}, headers=headers)
+    assert denied.status_code == 403
+
+    key = anon_client.post("/me/keys", json={"name": "x"}, headers=headers).json()["key"]
+    me = _me(anon_client, key).json()
+    assert (me["name"], me["roles"]) == ("ed", ["editor"])
+
+
+def test_admins_revoke_the_keys_of_a_user(client, anon_client):
+    editor = User(id=uuid4(), name="ed", roles=["editor"])
+    headers = {"Authorization": f"Bearer {JWTHelper().encode(editor)}"}
+    keys = [
+        anon_client.post("/me/keys", json={"name": n}, headers=headers).json()["key"]
+        for n in ("a", "b")
+    ]
+    assert _me(anon_client, keys[0]).status_code == 200
+
+    assert anon_client.delete(f"/keys/users/{editor.id}", headers=headers).status_code == 403
+    response = client.delete(f"/keys/users/{editor.id}")
+    assert response.json() == {"deleted": 2}
+    assert all(_me(anon_client, k).status_code == 403 for k in keys)
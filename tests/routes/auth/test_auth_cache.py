@@ -0,0 +1,102 @@
+"""The verified-credential cache (`cat.auth.cache`).
+
+- a token is verified (decoded) once, later requests are served from the cache;
+- entries expire with the token;
+- each lookup gets its own copy of the user, and the cache keeps its own copy
+  of the user verified on a miss;
+- revoking a credential or a user makes the next request verify again;
+- the auth handler chain is built once per registry refresh.
+"""
+
+import time
+from uuid import uuid4
+
+from cat.auth.cache import auth_cache
+from cat.auth.jwt import JWTHelper
+from cat.auth.user import User
+from cat.looking_glass.cheshire_cat import CheshireCat
+
+
+def _token():
+    user = User(id=uuid4(), name="alice", roles=["editor"])
+    return user, JWTHelper().encode(user)
+
+
+def _me(anon_client, token):
+    return anon_client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def _count_decodes(monkeypatch):
+    decodes = []
+    original = JWTHelper.decode
+
+    def spy(self, token):
+        decodes.append(token)
+        return original(self, token)
+
+    monkeypatch.setattr(JWTHelper, "decode", spy)
+    return decodes
+
+
+def test_tokens_are_verified_once(anon_client, monkeypatch):
+    decodes = _count_decodes(monkeypatch)
+    user, token = _token()
+
+    for _ in range(3):
+        response = _me(anon_client, token)
+        assert response.status_code == 200
+        assert response.json()["name"] == "alice"
+    assert len(decodes) == 1
+
+
+def test_entries_expire_with_the_token():
+    user, token = _token()
+    auth_cache.put("default", token, user, expires=time.time() - 1)
+    assert auth_cache.get("default", token) is None
+
+    auth_cache.put("default", token, user, expires=time.time() + 60)
+    assert auth_cache.get("default", token) == user
+
+
+def test_lookups_do_not_share_the_user():
+    user, token = _token()
+    auth_cache.put("default", token, user)
+    auth_cache.get("default", token).roles.append("admin")
+    assert auth_cache.get("default", token).roles == ["editor"]
+
+
+async def test_users_verified_on_a_miss_are_not_shared():
+    from cat.auth.api_keys import ApiKeys
+
+    owner = User(id=uuid4(), name="alice", roles=["editor"])
+    key, _ = await ApiKeys.create(owner, "ci")
+    (await ApiKeys.verify(key)).roles.append("admin")  # a miss: verified now
+    assert (await ApiKeys.verify(key)).roles == ["editor"]
+
+
+async def test_revocation(anon_client, monkeypatch):
+    decodes = _count_decodes(monkeypatch)
+    user, token = _token()
+
+    _me(anon_client, token)
+    await auth_cache.revoke(token)
+    _me(anon_client, token)
+    assert len(decodes) == 2
+
+    await auth_cache.revoke_user(user.id)
+    _me(anon_client, token)
+    assert len(decodes) == 3
+
+
+def test_handler_chain_is_cached(anon_client, monkeypatch):
+    calls = []
+    original = CheshireCat.get_all
+
+    async def spy(self, type):
+        calls.append(type)
+        return await original(self, type)
+
+    monkeypatch.setattr(CheshireCat, "get_all", spy)
+    for _ in range(3):
+        anon_client.get("/me", headers={"Authorization": "Bearer meow"})
+    assert calls.count("auths") <= 1
@@ -0,0 +1,45 @@
+"""Requests are authenticated only when a route needs the user.
+
+- public core routes never run the auth handlers, even with a credential;
+- gated routes authenticate once per request;
+- open plugin endpoints authenticate too, so they can read `user`.
+"""
+
+from cat.services.auths.base import Auth
+
+
+def _count_authentications(monkeypatch):
+    calls = []
+    original = Auth.authenticate
+
+    async def spy(self, request):
+        calls.append(request.url.path)
+        return await original(self, request)
+
+    monkeypatch.setattr(Auth, "authenticate", spy)
+    return calls
+
+
+def test_public_routes_skip_authentication(client, monkeypatch):
+    calls = _count_authentications(monkeypatch)
+    assert client.get("/status").status_code == 200
+    assert calls == []
+
+
+def test_gated_routes_authenticate_once(client, monkeypatch):
+    calls = _count_authentications(monkeypatch)
+    assert client.get("/me").status_code == 200
+    assert calls == ["/me"]
+
+
+def test_open_plugin_endpoints_read_the_caller(app, client, monkeypatch):
+    from cat import endpoint, user
+
+    @endpoint.get("/whoami")
+    def whoami():
+        return {"name": user.name}
+
+    app.include_router(whoami)
+    calls = _count_authentications(monkeypatch)
+    assert client.get("/whoami").json() == {"name": "admin"}
+    assert calls == ["/whoami"]
@@ -0,0 +1,80 @@
+"""`/openapi.json` and the plugin routes behind it.
+
+- the schema is served pre-serialized, with an ETag; an `If-None-Match`
+  listing it gets a 304, a tag merely containing it does not;
+- a failed build fails the request, and the next request builds again;
+- toggling a plugin re-includes only its routes, and the schema (with a new
+  ETag) is rebuilt in the background, not on the next request.
+"""
+
+import pytest
+
+from cat.routes import openapi
+from cat.routes.openapi import document
+
+
+def _from_plugin(route) -> bool:
+    return hasattr(getattr(route, "endpoint", None), "plugin_id")
+
+
+def test_openapi_etag(client):
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    assert "/status" in response.json()["paths"]
+    etag = response.headers["etag"]
+
+    again = client.get("/openapi.json", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert document(client.app).builds == 1
+
+
+def test_if_none_match_is_parsed(client):
+    etag = client.get("/openapi.json").headers["etag"]
+
+    def status(header):
+        return client.get("/openapi.json", headers={"If-None-Match": header}).status_code
+
+    assert status(f'"other", {etag}') == 304
+    assert status(f"W/{etag}") == 304
+    assert status("*") == 304
+    assert status(f'"x{etag[1:]}') == 200
+    assert status('"other"') == 200
+
+
+def test_failed_builds_are_reported(client, monkeypatch):
+    original = openapi._serialize
+
+    def broken(app, routes):
+        raise ValueError("broken model")
+
+    monkeypatch.setattr(openapi, "_serialize", broken)
+    with pytest.raises(RuntimeError):  # a 500, raised by the test client
+        client.get("/openapi.json")
+
+    monkeypatch.setattr(openapi, "_serialize", original)
+    assert client.get("/openapi.json").status_code == 200
+
+
+def test_plugin_toggle_reconciles_routes(client, just_installed_plugin):
+    app = client.app
+    doc = document(app)
+    assert "/tests/endpoint" in client.get("/openapi.json").json()["paths"]
+    core = [r for r in app.routes if not _from_plugin(r)]
+    plugin = [r for r in app.routes if _from_plugin(r)]
+    built = doc._task
+
+    client.put("/plugins/mock_plugin/toggle")
+    # the rebuild started with the toggle, not with the next request
+    assert doc._task is not built
+    assert "/tests/endpoint" not in client.get("/openapi.json").json()["paths"]
+    assert [r for r in app.routes if not _from_plugin(r)] == core
+    assert not [r for r in app.routes if _from_plugin(r)]
+
+    client.put("/plugins/mock_plugin/toggle")
+    response = client.get("/openapi.json")
+    assert "/tests/endpoint" in response.json()["paths"]
+    assert len([r for r in app.routes if _from_plugin(r)]) == len(plugin)
+    assert client.get(
+        "/openapi.json", headers={"If-None-Match": response.headers["etag"]}
+    ).status_code == 304
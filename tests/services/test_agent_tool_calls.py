@@ -0,0 +1,103 @@
+"""Tool calls of a single LLM turn (`Agent.call_tools`).
+
+The contract under test:
+
+- tool messages come back in the same order as the tool calls, whether they
+  ran sequentially or concurrently;
+- `parallel_tool_calls` (agent-wide) or `@tool(parallel=True)` (per tool) make
+  calls overlap, and `max_concurrent_tool_calls` bounds the overlap;
+- a ToolCallResult event is streamed per call, as each one finishes.
+
+No app and no LLM: the agent is built by hand and `call_tools` is driven
+directly inside a request context with a recording stream callback.
+"""
+
+import asyncio
+
+from cat import Agent, tool
+from cat.ambient.context_vars import Ctx, use_ctx
+from cat.types import ToolCall
+
+
+class SleepyAgent(Agent):
+    slug = "sleepy"
+
+    @tool
+    async def slow(self, label: str, delay: float) -> str:
+        """Sleep, then echo the label."""
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(delay)
+        self.running -= 1
+        return label
+
+    @tool(parallel=True)
+    async def fast(self, label: str, delay: float) -> str:
+        """Parallel-safe twin of `slow`."""
+        return await self.slow.func(self, label, delay)
+
+
+def _calls(name, delays):
+    return [
+        ToolCall(id=str(i), name=name, args={"label": str(i), "delay": d})
+        for i, d in enumerate(delays)
+    ]
+
+
+def _run(agent, tool_calls):
+    agent.tools = agent.instantiate_agent_tools()
+    agent.running, agent.peak = 0, 0
+    events = []
+
+    async def stream(event):
+        events.append(event)
+
+    async def main():
+        with use_ctx(Ctx(user=None, stream=stream)):
+            return await agent.call_tools(tool_calls)
+
+    return asyncio.run(main()), events
+
+
+def test_sequential_by_default():
+    agent = SleepyAgent()
+    messages, _ = _run(agent, _calls("slow", [0.02, 0.01, 0]))
+
+    assert [m.text for m in messages] == ["0", "1", "2"]
+    assert agent.peak == 1
+
+
+def test_parallel_agent_preserves_order():
+    agent = SleepyAgent()
+    agent.parallel_tool_calls = True
+    # the first call finishes last, yet its message stays first
+    messages, events = _run(agent, _calls("slow", [0.03, 0.02, 0.01]))
+
+    assert [m.text for m in messages] == ["0", "1", "2"]
+    assert [m.tool_call_id for m in messages] == ["0", "1", "2"]
+    assert agent.peak == 3
+
+    # result events stream as each call finishes, not in request order
+    results = [e for e in events if e["type"] == "TOOL_CALL_RESULT"]
+    assert [e["tool_call_id"] for e in results] == ["2", "1", "0"]
+
+
+def test_concurrency_cap():
+    agent = SleepyAgent()
+    agent.parallel_tool_calls = True
+    agent.max_concurrent_tool_calls = 2
+    messages, _ = _run(agent, _calls("slow", [0.01] * 5))
+
+    assert [m.text for m in messages] == ["0", "1", "2", "3", "4"]
+    assert agent.peak == 2
+
+
+def test_parallel_tool_opt_in():
+    agent = SleepyAgent()
+    tool_calls = _calls("fast", [0.02, 0.01]) + [
+        ToolCall(id="s", name="slow", args={"label": "s", "delay": 0})
+    ]
+    messages, _ = _run(agent, tool_calls)
+
+    assert [m.text for m in messages] == ["0", "1", "s"]
+    assert agent.peak == 2
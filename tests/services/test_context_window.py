@@ -0,0 +1,144 @@
+"""The agent context window (`cat.services.agents.context_window`).
+
+- token estimates follow edits to the message;
+- budgets come from the model, or the window;
+- nothing changes while the conversation fits;
+- stale tool results are blanked first, then the oldest turns are dropped,
+  never splitting a tool call from its results nor starting with a reply;
+- `KeepLast` keeps the last N messages;
+- agents opt in; the agent loop sends the fitted conversation and adds up
+  the saved tokens.
+"""
+
+from cat import Agent
+from cat.ambient.context_vars import Ctx, use_ctx
+from cat.types import Message, Task, TextContent, ToolCall
+from cat.services.agents.context_window import (
+    ContextWindow,
+    DropOldest,
+    DropStaleToolResults,
+    KeepLast,
+    STALE_TOOL_RESULT,
+    estimate_tokens,
+    model_budget,
+)
+from cat import config
+
+
+def _text(role, text, **kwargs):
+    return Message(role=role, content=[TextContent(text=text)], **kwargs)
+
+
+def _tool_turn(name, result):
+    call = ToolCall(id=name, name=name, args={})
+    return [
+        _text("assistant", "", tool_calls=[call]),
+        _text("tool", result, tool_call_id=name),
+    ]
+
+
+def _conversation():
+    return [
+        _text("user", "u" * 400),
+        *_tool_turn("search", "r" * 4000),
+        _text("assistant", "a" * 400),
+        _text("user", "v" * 400),
+        *_tool_turn("fetch", "s" * 4000),
+        _text("assistant", "b" * 400),
+    ]
+
+
+def test_edited_messages_are_estimated_again():
+    message = _text("user", "x" * 400)
+    assert estimate_tokens(message) == 104
+    message.content = []
+    assert estimate_tokens(message) == 4
+    message.content = [TextContent(text="y" * 40)]
+    assert estimate_tokens(message) == 14
+
+
+def test_budgets():
+    assert model_budget("openai:gpt-4o-mini") == 128_000 - config.CONTEXT_RESERVE
+    assert model_budget("ollama:someday") == config.CONTEXT_WINDOW - config.CONTEXT_RESERVE
+
+
+def test_fitting_conversation_is_untouched():
+    messages = _conversation()
+    fitted, report = ContextWindow(budget=10_000).fit("prompt", messages, "any:model")
+    assert fitted == messages
+    assert report.saved == 0 and report.strategies == []
+
+
+def test_stale_tool_results_go_first():
+    fitted, report = ContextWindow(budget=1500).fit("", _conversation(), "any:model")
+
+    assert len(fitted) == 8
+    assert fitted[2].text == STALE_TOOL_RESULT    # old result blanked...
+    assert fitted[6].text == "s" * 4000           # ...the latest one kept
+    assert report.strategies == ["DropStaleToolResults"]
+    assert report.saved == 1000 - len(STALE_TOOL_RESULT) // 4
+
+
+def test_then_oldest_turns_are_dropped():
+    fitted, report = ContextWindow(budget=1300).fit("", _conversation(), "any:model")
+
+    # the whole first exchange went, and the rest starts from the user
+    assert [m.role for m in fitted] == ["user", "assistant", "tool", "assistant"]
+    assert fitted[0].text == "v" * 400
+    assert report.strategies == ["DropStaleToolResults", "DropOldest"]
+    assert report.tokens_after <= 1300
+
+    # never below the last message
+    fitted, _ = ContextWindow(strategies=[DropOldest()], budget=1).fit("", _conversation(), "m")
+    assert [m.text for m in fitted] == ["b" * 400]
+
+
+def test_keep_last():
+    fitted, _ = ContextWindow(strategies=[KeepLast(3)], budget=1).fit("", _conversation(), "m")
+    # the tool call comes with its result, and a reply is not the first message
+    assert [m.role for m in fitted] == ["user", "assistant", "tool", "assistant"]
+
+
+def test_blanked_results_are_copies():
+    messages = _conversation()
+    DropStaleToolResults(keep=0)(messages, 0)
+    assert messages[2].text == "r" * 4000
+
+
+async def test_agent_loop_sends_fitted_messages(monkeypatch):
+    from cat.services.agents import base
+
+    sent = []
+
+    async def fake_llm(system_prompt, model=None, messages=[], tools=[], stream=True):
+        sent.append(messages)
+        return _text("assistant", "done")
+
+    monkeypatch.setattr(base, "llm", fake_llm)
+
+    class TinyAgent(Agent):
+        slug = "tiny"
+        model = "any:model"
+        context_window = ContextWindow(strategies=[KeepLast(1)], budget=10)
+
+    class PlainAgent(TinyAgent):
+        context_window = Agent.context_window
+
+    async def run(agent_class):
+        agent = agent_class()
+        agent.task = Task(messages=_conversation()[:4] + [_text("user", "last")])
+        agent.result = base.TaskResult()
+        agent.tools, agent.directives, agent.tokens_saved = [], [], 0
+        agent.system_prompt = ""
+        with use_ctx(Ctx(user=None)):
+            await agent.loop()
+        return agent
+
+    agent = await run(TinyAgent)
+    assert [m.text for m in sent[0]] == ["last"]
+    assert agent.tokens_saved > 1000
+
+    # opt-in: by default the whole conversation goes out
+    agent = await run(PlainAgent)
+    assert len(sent[1]) == 5
+    assert agent.tokens_saved == 0
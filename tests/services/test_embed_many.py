@@ -0,0 +1,84 @@
+"""Batch embeddings (`ModelProvider.embed_many`).
+
+- the base fallback runs single `embed()` calls concurrently, keeping order;
+- the OpenAI-compatible provider sends one request per batch, split by input
+  count and estimated tokens, and reassembles vectors by their `index`.
+
+No network: the vendor client is a stub recording each request.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from cat.base import ModelProvider, OpenAICompatibleProvider
+
+
+class CountingProvider(ModelProvider):
+    slug = "embed_counting"
+    embed_concurrency = 2
+
+    async def llm(self, *args, **kwargs):
+        raise NotImplementedError
+
+    async def embed(self, model, text):
+        self.running = getattr(self, "running", 0) + 1
+        self.peak = max(getattr(self, "peak", 0), self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return [float(len(text))]
+
+
+class StubEmbeddings:
+    def __init__(self):
+        self.requests = []
+
+    async def create(self, model, input):
+        self.requests.append(list(input))
+        # answer out of order: the provider must sort by `index`
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(t))])
+            for i, t in enumerate(input)
+        ]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+def make_openai_provider(batch_size, max_tokens):
+    class Batched(OpenAICompatibleProvider):
+        EMBED_BATCH_SIZE = batch_size
+        EMBED_BATCH_MAX_TOKENS = max_tokens
+
+    Batched.slug = "embed_batched"
+    p = Batched()
+    p._client = SimpleNamespace(embeddings=StubEmbeddings())
+    return p
+
+
+@pytest.mark.asyncio
+async def test_base_fallback_is_concurrent_and_ordered():
+    p = CountingProvider()
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    assert await p.embed_many("m", texts) == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert p.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_openai_compatible_splits_by_batch_size():
+    p = make_openai_provider(batch_size=2, max_tokens=10_000)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    assert await p.embed_many("m", texts) == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert p._client.embeddings.requests == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+
+
+@pytest.mark.asyncio
+async def test_openai_compatible_splits_by_tokens():
+    p = make_openai_provider(batch_size=100, max_tokens=30)
+    long = "x" * 80  # ~21 estimated tokens
+    texts = [long, long, "short", long]
+
+    vectors = await p.embed_many("m", texts)
+    assert vectors == [[80.0], [80.0], [5.0], [80.0]]
+    assert p._client.embeddings.requests == [[long], [long, "short"], [long]]
@@ -0,0 +1,101 @@
+"""The in-process settings cache behind `Service.load_settings()`.
+
+- repeated loads are served from memory (a hit), not the DB, as deep copies;
+- `save_settings()` and `refresh()` invalidate, so the next load sees the DB;
+- a load that raced with a save does not re-cache the stale value;
+- `load_many_settings()` reads every cache miss with one query.
+"""
+
+import pytest_asyncio
+from pydantic import BaseModel
+
+from cat.db import store
+from cat.services.core_settings import CoreSettings
+from cat.services.service import Service, settings_cache, load_many_settings
+
+
+class Tagged(Service):
+    service_type = "config"
+    slug = "tagged"
+
+    class Settings(BaseModel):
+        tags: list[str] = ["cat"]
+
+
+@pytest_asyncio.fixture(scope="function")
+async def core(async_client):
+    yield CoreSettings
+
+
+async def test_repeated_loads_hit_the_cache(core):
+    await core.load_settings()
+    before = settings_cache.stats()
+
+    for _ in range(3):
+        await core.load_settings()
+
+    after = settings_cache.stats()
+    assert after["hits"] - before["hits"] == 3
+    assert after["misses"] == before["misses"]
+
+
+async def test_loaded_settings_are_copies(core):
+    first = await core.load_settings()
+    first.default_llm = "mutated:locally"
+    assert (await core.load_settings()).default_llm != "mutated:locally"
+
+
+async def test_nested_fields_are_copied_too(core):
+    (await Tagged.load_settings()).tags.append("mutated")
+    assert (await Tagged.load_settings()).tags == ["cat"]
+
+    (await load_many_settings([Tagged]))[Tagged].tags.append("mutated")
+    assert (await load_many_settings([Tagged]))[Tagged].tags == ["cat"]
+
+
+async def test_save_invalidates(core):
+    await core.load_settings()
+    await core.save_settings({"default_llm": "openai:gpt-4o"})
+    assert (await core.load_settings()).default_llm == "openai:gpt-4o"
+
+
+async def test_refresh_invalidates(core):
+    await core.load_settings()
+    # written behind the cache's back (e.g. by another worker)
+    await store.save(core._settings_key(), {"default_llm": "ollama:llama3.2"})
+    assert (await core.load_settings()).default_llm != "ollama:llama3.2"
+
+    await core.refresh()
+    assert (await core.load_settings()).default_llm == "ollama:llama3.2"
+
+
+async def test_stale_read_is_not_cached(core):
+    key = core._settings_key()
+    version = settings_cache.version(key)
+    stale = await core._read_settings(core.Settings)
+
+    settings_cache.invalidate(key)  # a save landed while we were reading
+    settings_cache.put(key, version, stale)
+
+    assert settings_cache.get(key) is None
+
+
+async def test_load_many_settings_reads_once(core, monkeypatch):
+    await core.save_settings({"default_llm": "openai:gpt-4o"})
+    reads = []
+    original = store.load_many
+
+    async def counting_load_many(keys, default=None):
+        keys = list(keys)
+        reads.append(keys)
+        return await original(keys, default)
+
+    monkeypatch.setattr(store, "load_many", counting_load_many)
+
+    settings = await load_many_settings([core])
+    assert settings[core].default_llm == "openai:gpt-4o"
+    assert reads == [[core._settings_key()]]
+
+    # now cached: no key left to read
+    await load_many_settings([core])
+    assert reads[-1] == []
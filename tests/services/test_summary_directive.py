@@ -0,0 +1,168 @@
+"""The `summary` directive (`cat.services.directives.summary`).
+
+- a long history is summarized in the background: `start()` does not wait for
+  the summary LLM call;
+- the next `step()` after it is ready swaps the older turns for the summary,
+  keeping the last messages and starting them from a user message;
+- summaries are cached per thread: the next run starts from it, and folds only
+  the new turns into it;
+- a summary is not used once the conversation was rewritten before its end;
+- without a thread id, conversations opening the same way keep their own
+  summaries;
+- each user keeps the summaries of the last `config.SUMMARY_LIMIT`
+  conversations.
+"""
+
+import asyncio
+from uuid import uuid5, NAMESPACE_DNS
+
+import pytest
+from cachetools import LRUCache
+
+from cat.auth.user import User
+from cat.ambient.context_vars import Ctx, use_ctx
+from cat.services.agents.default import DefaultAgent
+from cat.services.directives import summary
+from cat.services.directives.summary import SummaryDirective
+from cat.types import Message, Task, TextContent
+from cat import config
+
+
+ADMIN = User(id=uuid5(NAMESPACE_DNS, "admin"), name="admin", roles=["admin"])
+
+
+def _text(role, text):
+    return Message(role=role, content=[TextContent(text=text)])
+
+
+def _history(n, first="hello"):
+    return [_text("user", first)] + [
+        _text("assistant" if i % 2 else "user", f"{i} " + "x" * 400) for i in range(1, n)
+    ]
+
+
+@pytest.fixture
+async def summarizer(client, monkeypatch):
+    """Fake summary LLM: records its input, answers once `release` is set.
+    Summaries still being written are waited for at the end."""
+    calls, release = [], asyncio.Event()
+
+    async def fake_llm(system_prompt, model=None, messages=[], tools=[], stream=True):
+        calls.append(messages[0].text)
+        await release.wait()
+        return _text("assistant", f"SUMMARY {len(calls)}")
+
+    monkeypatch.setattr(summary, "llm", fake_llm)
+    monkeypatch.setattr(summary, "summaries", LRUCache(maxsize=10))
+    monkeypatch.setattr(summary, "pending", {})
+    yield calls, release
+    release.set()
+    await asyncio.gather(*summary.pending.values())
+
+
+async def _start(messages, thread_id="t1"):
+    directive, agent = SummaryDirective(), DefaultAgent()
+    agent.task = Task(messages=messages, thread_id=thread_id)
+    agent.system_prompt = ""
+    await directive.start(agent)
+    return directive, agent
+
+
+async def _step(directive, agent):
+    agent.system_prompt = ""
+    await directive.step(agent)
+
+
+async def test_summarizes_in_the_background_and_reuses(summarizer):
+    calls, release = summarizer
+    await SummaryDirective.save_settings({"threshold": 100, "keep_last": 2})
+    history = _history(10)
+
+    with use_ctx(Ctx(user=ADMIN)):
+        directive, agent = await _start(history)
+        # not waiting on the summary: the run goes on with the full history
+        await _step(directive, agent)
+        assert len(agent.task.messages) == 10 and agent.system_prompt == ""
+
+        release.set()
+        await summary.pending[directive.key]
+        await _step(directive, agent)
+        assert agent.task.messages == history[8:]
+        assert "SUMMARY 1" in agent.system_prompt
+        assert calls[0].startswith("user: hello")
+
+        # next run on the thread: summary applied from the start, and only
+        # the turns after it are summarized again
+        directive, agent = await _start(history + _history(2, first="more"))
+        assert agent.task.messages == history[8:] + _history(2, first="more")
+        await summary.pending[directive.key]
+        assert calls[1].startswith("Summary so far:\nSUMMARY 1")
+
+        # ...also after a restart, from the user store
+        summary.summaries.clear()
+        directive, agent = await _start(history + _history(2, first="more"))
+        assert agent.task.messages == _history(2, first="more")
+
+
+async def test_changed_history_is_not_summarized_away(summarizer):
+    calls, release = summarizer
+    release.set()
+    await SummaryDirective.save_settings({"threshold": 100, "keep_last": 2})
+
+    with use_ctx(Ctx(user=ADMIN)):
+        directive, _ = await _start(_history(10))
+        await summary.pending[directive.key]
+
+        # edited from the fourth message on: the opening turns are the same
+        edited = _history(4) + [_text(m.role, "edited " + m.text) for m in _history(10)[4:]]
+        directive, agent = await _start(edited, thread_id="t1")
+        assert agent.task.messages == edited
+
+        # ...and cut short
+        directive, agent = await _start(_history(8), thread_id="t1")
+        assert len(agent.task.messages) == 8
+
+
+async def test_short_histories_are_left_alone(summarizer):
+    calls, _ = summarizer
+    with use_ctx(Ctx(user=ADMIN)):
+        directive, agent = await _start(_history(4))
+        await _step(directive, agent)
+    assert calls == [] and len(agent.task.messages) == 4
+
+
+async def test_conversations_without_thread_do_not_collide(summarizer):
+    calls, release = summarizer
+    release.set()
+    await SummaryDirective.save_settings({"threshold": 100, "keep_last": 2})
+    one = _history(10)
+    other = one[:1] + [_text("assistant", "another reply")] + _history(9)[1:]
+
+    with use_ctx(Ctx(user=ADMIN)):
+        directive, _ = await _start(one, thread_id=None)
+        await summary.pending[directive.key]
+
+        directive, agent = await _start(other, thread_id=None)
+        assert agent.task.messages == other  # not the summary of `one`
+        await summary.pending[directive.key]
+
+        # ...which is still there for `one`
+        directive, agent = await _start(one, thread_id=None)
+        assert agent.task.messages == one[8:]
+
+
+async def test_stored_summaries_are_capped(summarizer, monkeypatch):
+    calls, release = summarizer
+    release.set()
+    monkeypatch.setitem(config._values, "SUMMARY_LIMIT", 2)
+    await SummaryDirective.save_settings({"threshold": 100, "keep_last": 2})
+
+    with use_ctx(Ctx(user=ADMIN)):
+        for thread_id in ("t1", "t2", "t3"):
+            directive, _ = await _start(_history(10), thread_id=thread_id)
+            await summary.pending[directive.key]
+
+        assert await ADMIN.keys(summary.KEY_PREFIX) == ["summary_t3", "summary_t2"]
+        assert await ADMIN.load("summary_t1") is None
+        assert (str(ADMIN.id), "t1") not in summary.summaries
+        assert await ADMIN.load("summary_t3") is not None
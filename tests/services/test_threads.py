@@ -0,0 +1,156 @@
+"""Server-side threads (`Task.thread_id`, `threads` services).
+
+- with a thread id the client sends only the new turn; the agent sees the
+  whole history and the result carries only its new replies;
+- the turn and the replies are appended to the thread after the run;
+- histories are served from the hot cache after the first read;
+- appends read storage, not a cache another worker may have outdated, and
+  drop the thread from the other workers' caches;
+- the threads with the highest priority are used;
+- streamed runs report the thread id in their AG-UI events.
+
+Core only: the `default` threads, in the user key-value store.
+"""
+
+import json
+from uuid import uuid4, uuid5, NAMESPACE_DNS
+
+from cat.auth.user import User
+from cat.ambient.context_vars import Ctx, use_ctx
+from cat.ambient.runtime import ccat
+from cat.looking_glass.change_bus import change_bus
+from cat.routes.agents import get_threads
+from cat.services.threads.default import DefaultThreads
+from cat.types import Message
+
+ADMIN = User(id=uuid5(NAMESPACE_DNS, "admin"), name="admin", roles=["admin"])
+
+
+def _turn(client, text, thread_id, stream=False):
+    return client.post("/agents/default/message", json={
+        "thread_id": thread_id,
+        "stream": stream,
+        "messages": [{"role": "user", "content": [{"type": "text", "text": text}]}],
+    })
+
+
+def _message(text):
+    return Message(role="user", content=[{"type": "text", "text": text}])
+
+
+async def _history(threads, thread_id):
+    with use_ctx(Ctx(user=ADMIN)):
+        return await threads.history(thread_id)
+
+
+def test_thread_keeps_the_history(client, monkeypatch):
+    seen = []
+    original = DefaultThreads.run
+
+    async def spy(self, agent, task):
+        result = await original(self, agent, task)
+        seen.append([m.role for m in agent.task.messages])
+        return result
+
+    monkeypatch.setattr(DefaultThreads, "run", spy)
+
+    thread_id = str(uuid4())
+    first = _turn(client, "hello", thread_id).json()
+    second = _turn(client, "again", thread_id).json()
+
+    # only the deltas travel: one reply per turn
+    assert [m["role"] for m in first["messages"]] == ["assistant"]
+    assert [m["role"] for m in second["messages"]] == ["assistant"]
+    assert second["thread_id"] == thread_id
+
+    # ...while the agent saw the whole conversation
+    assert seen == [["user"], ["user", "assistant", "user"]]
+
+
+async def test_history_is_stored_and_cached(client):
+    threads, thread_id = DefaultThreads(), str(uuid4())
+    _turn(client, "hello", thread_id)
+    before = threads.stats()
+    _turn(client, "again", thread_id)
+
+    after = threads.stats()
+    assert after["hits"] - before["hits"] >= 1
+    assert after["misses"] == before["misses"]
+
+    # written through to storage: a cold read finds the same four messages
+    threads.cache.clear()
+    texts = [m.text for m in await _history(threads, thread_id)]
+    assert texts[0::2] == ["hello", "again"]
+    assert len(texts) == 4
+
+
+def test_streamed_events_carry_the_thread_id(client):
+    response = _turn(client, "hello", "t2", stream=True)
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines() if line.startswith("data: ")
+    ]
+    started = next(e for e in events if e["type"] == "RUN_STARTED")
+    assert started["thread_id"] == "t2"
+
+
+def test_runs_without_a_thread_get_their_own_id(client):
+    response = client.post("/agents/default/message", json={
+        "messages": [{"role": "user", "content": [{"type": "text", "text": "hi"}]}],
+    })
+    started = next(
+        json.loads(line[len("data: "):]) for line in response.text.splitlines()
+        if line.startswith("data: ") and "RUN_STARTED" in line
+    )
+    assert started["thread_id"] not in ("", "_")
+
+
+async def test_append_does_not_trust_a_stale_cache(client):
+    here, elsewhere, thread_id = DefaultThreads(), DefaultThreads(), str(uuid4())
+    with use_ctx(Ctx(user=ADMIN)):
+        await here.extend(thread_id, [_message("one")])
+        assert len(await here.history(thread_id)) == 1  # cached here
+
+        # another worker adds a turn; this cache does not know
+        await elsewhere.extend(thread_id, [_message("two")])
+        await here.extend(thread_id, [_message("three")])
+
+        assert [m.text for m in await here.load(thread_id)] == ["one", "two", "three"]
+
+
+async def test_writes_elsewhere_drop_the_cached_thread(client):
+    threads, thread_id = await get_threads(), str(uuid4())
+    with use_ctx(Ctx(user=ADMIN)):
+        await threads.extend(thread_id, [_message("one")])
+        await threads.history(thread_id)
+    await change_bus.poll()  # own write: the cache stays
+    assert (str(ADMIN.id), thread_id) in threads.cache
+
+    me, change_bus.worker = change_bus.worker, "other"
+    try:
+        await change_bus.publish(f"threads:{ADMIN.id}:{thread_id}")
+    finally:
+        change_bus.worker = me
+    await change_bus.poll()
+    assert (str(ADMIN.id), thread_id) not in threads.cache
+
+
+async def test_threads_precedence(client, monkeypatch):
+    class Low(DefaultThreads):
+        slug = "a_low"
+
+    class High(DefaultThreads):
+        slug = "z_high"
+        priority = 10
+
+    classes = {"a_low": Low, "z_high": High}
+    monkeypatch.setitem(ccat().registry.classes, "threads", classes)
+    monkeypatch.setattr(ccat().registry, "get", lambda type, slug, **kw: _async(slug))
+    assert await get_threads() == "z_high"
+
+    High.priority = 0  # same priority: by slug
+    assert await get_threads() == "a_low"
+
+
+async def _async(value):
+    return value
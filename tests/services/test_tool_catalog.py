@@ -0,0 +1,54 @@
+"""Agent tools collected once per class (`ClassTools`).
+
+- the `@tool`s of an agent class (inherited ones included) are found on the
+  first run, later runs only bind them;
+- bound tools call the method of their own instance;
+- the counters are served to admins at `/agents/tools/cache`.
+"""
+
+from cat import Agent, tool
+from cat.mad_hatter.decorators.tool import class_tools
+
+
+class Base(Agent):
+    slug = "catalog_base"
+
+    @tool
+    def whoami(self) -> str:
+        """Name of the instance."""
+        return self.label
+
+
+class Child(Base):
+    slug = "catalog_child"
+
+    @tool
+    async def shout(self, text: str) -> str:
+        """Shout the text."""
+        return f"{self.label}: {text.upper()}"
+
+
+async def test_tools_are_collected_once_per_class():
+    before = class_tools.stats()
+
+    first, second = Child(), Child()
+    first.label, second.label = "first", "second"
+    tools = {t.name: t for t in first.instantiate_agent_tools()}
+    second_tools = {t.name: t for t in second.instantiate_agent_tools()}
+
+    after = class_tools.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+    assert sorted(tools) == ["shout", "whoami"]
+    assert await tools["shout"].func(text="hi", extra="ignored") == "first: HI"
+    assert await second_tools["whoami"].func() == "second"
+
+
+def test_stats_endpoint(client, anon_client):
+    response = client.get("/agents/tools/cache")
+    assert response.status_code == 200
+    assert set(response.json()) == {"mcp", "agent_classes"}
+    assert "listing_hits" in response.json()["mcp"]
+
+    assert anon_client.get("/agents/tools/cache").status_code in (401, 403)
@@ -0,0 +1,192 @@
+"""The core vector indexes (`vector_indexes` services `default` and `ivf`).
+
+- upsert replaces by id, delete keeps the remaining rows addressable;
+- search is cosine, best first, and can be restricted by owner and metadata;
+- collections survive a restart (saved to the data folder at shutdown,
+  memory-mapped back);
+- searches run concurrently, writes wait for them;
+- the IVF index clusters large collections (under the write lock, never in a
+  search) and still finds the neighbours;
+- both resolve through the registry.
+
+Skipped without NumPy (the `vector` extra).
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from cat.services.vector_indexes.default import DefaultVectorIndex, Collection  # noqa: E402
+from cat.services.vector_indexes import ivf  # noqa: E402
+
+
+def _fresh(IndexClass):
+    # bypass the singleton cache: a new instance, as after a restart
+    index = object.__new__(IndexClass)
+    index.__init__()
+    return index
+
+
+@pytest.fixture
+def index():
+    return _fresh(DefaultVectorIndex)
+
+
+async def test_upsert_search_delete(index):
+    await index.upsert("docs", ["x", "y", "xy"], [[1, 0], [0, 1], [1, 1]])
+    hits = await index.search("docs", [1, 0.1], k=2)
+    assert [h.id for h in hits] == ["x", "xy"]
+    assert hits[0].score == pytest.approx(0.995, abs=1e-3)
+
+    # same id: replaced, not duplicated
+    await index.upsert("docs", ["x"], [[0, 1]], metadata=[{"v": 2}])
+    assert await index.count("docs") == 3
+    hits = await index.search("docs", [0, 1], k=2)
+    assert {h.id for h in hits} == {"x", "y"}
+    assert next(h for h in hits if h.id == "x").metadata == {"v": 2}
+
+    assert await index.delete("docs", ["x", "missing"]) == 1
+    assert await index.count("docs") == 2
+    hits = await index.search("docs", [0, 1], k=10)
+    assert [h.id for h in hits] == ["y", "xy"]
+
+
+async def test_filters(index):
+    await index.upsert("docs", ["a1", "a2"], [[1, 0], [1, 0.2]], user_id="alice",
+                       metadata=[{"kind": "note"}, {"kind": "mail"}])
+    await index.upsert("docs", ["b1"], [[1, 0]], user_id="bob", metadata=[{"kind": "note"}])
+
+    hits = await index.search("docs", [1, 0], user_id="alice")
+    assert [h.id for h in hits] == ["a1", "a2"]
+    assert {h.user_id for h in hits} == {"alice"}
+
+    hits = await index.search("docs", [1, 0], where={"kind": "mail"})
+    assert [h.id for h in hits] == ["a2"]
+
+    assert await index.search("docs", [1, 0], user_id="carol") == []
+    assert await index.search("nothing", [1, 0]) == []
+
+
+async def test_dimension_mismatch(index):
+    await index.upsert("docs", ["a"], [[1, 0]])
+    with pytest.raises(ValueError):
+        await index.upsert("docs", ["b"], [[1, 0, 0]])
+    with pytest.raises(ValueError):
+        await index.upsert("../escape", ["b"], [[1, 0]])
+
+
+async def test_persisted_and_memory_mapped(index):
+    await index.upsert("docs", ["a", "b"], [[1, 0], [0, 1]], user_id="u",
+                       metadata=[{"n": 1}, {"n": 2}])
+    await index.close()
+
+    reopened = _fresh(DefaultVectorIndex)
+    c = await reopened.get_collection("docs")
+    assert isinstance(c.columns["vectors"], np.memmap)
+
+    hits = await reopened.search("docs", [0, 1], k=1, user_id="u")
+    assert hits[0].id == "b" and hits[0].metadata == {"n": 2}
+
+    # first write moves the arrays to memory and keeps working
+    await reopened.delete("docs", ["a"])
+    await reopened.upsert("docs", ["c"], [[1, 1]])
+    assert [h.id for h in await reopened.search("docs", [1, 1])] == ["c", "b"]
+
+    await reopened.drop("docs")
+    assert await _fresh(DefaultVectorIndex).count("docs") == 0
+
+
+async def test_saved_at_app_shutdown(app):
+    from asgi_lifespan import LifespanManager
+    from cat.ambient.runtime import ccat
+
+    async with LifespanManager(app):
+        index = await ccat().get("vector_indexes", "default")
+        await index.upsert("docs", ["a", "b"], [[1, 0], [0, 1]])
+
+    # the singleton was closed with the app...
+    assert DefaultVectorIndex.__dict__.get("_instance") is None
+    # ...and a new one finds the vectors on disk
+    assert await _fresh(DefaultVectorIndex).count("docs") == 2
+
+
+async def test_searches_run_concurrently(index, monkeypatch):
+    import asyncio
+    import threading
+
+    await index.upsert("docs", ["a"], [[1, 0]])
+    c = await index.get_collection("docs")
+    both_in = threading.Barrier(2, timeout=5)
+    search = c.search
+
+    def slow_search(*args):
+        both_in.wait()  # raises if the two searches do not overlap
+        return search(*args)
+
+    monkeypatch.setattr(c, "search", slow_search)
+    hits = await asyncio.gather(
+        index.search("docs", [1, 0]), index.search("docs", [1, 0])
+    )
+    assert [h[0].id for h in hits] == ["a", "a"]
+
+    monkeypatch.setattr(c, "search", search)
+    await index.upsert("docs", ["b"], [[0, 1]])
+    assert await index.count("docs") == 2
+
+
+def test_ivf_clusters_and_finds_neighbours(tmp_path, monkeypatch):
+    monkeypatch.setattr(ivf, "MIN_TRAIN_SIZE", 500)
+    rng = np.random.default_rng(1)
+    centers = rng.standard_normal((10, 16))
+    vectors = centers[rng.integers(0, 10, 2000)] + rng.standard_normal((2000, 16)) * 0.1
+    ids = [str(i) for i in range(2000)]
+
+    exact = Collection(str(tmp_path / "exact"))
+    exact.upsert(ids, vectors)
+    approx = ivf.IVFCollection(str(tmp_path / "ivf"), nlist=10, nprobe=2)
+    approx.upsert(ids, vectors)
+
+    query = vectors[7]
+    approx.search(query, k=10)
+    assert approx.centroids is None  # searches never train: the index does
+    assert approx.needs_training()
+    approx.train()
+    found = approx.search(query, k=10)
+    # only a fraction of the collection is scanned...
+    assert len(approx.candidates(query, None)) < 1000
+    # ...and the neighbours are the exact ones
+    assert [h.id for h in found] == [h.id for h in exact.search(query, k=10)]
+
+    # new rows land in their cluster; a reload keeps the clustering
+    approx.upsert(["new"], [vectors[7]])
+    assert approx.search(query, k=1)[0].id in {"7", "new"}
+    approx.save()
+    reloaded = ivf.IVFCollection(approx.path, nprobe=2).load()
+    assert reloaded.centroids is not None
+    assert [h.id for h in reloaded.search(query, k=10)] == [h.id for h in approx.search(query, k=10)]
+
+
+async def test_ivf_trains_under_the_write_lock(monkeypatch):
+    monkeypatch.setattr(ivf, "MIN_TRAIN_SIZE", 50)
+    index = _fresh(ivf.IVFVectorIndex)
+    vectors = np.random.default_rng(2).standard_normal((100, 8))
+    await index.upsert("docs", [str(i) for i in range(100)], vectors)
+
+    lock, held = index.lock("docs"), []
+    train = ivf.IVFCollection.train
+
+    def spy(self):
+        held.append(lock._lock.locked() and lock._readers == 0)
+        train(self)
+
+    monkeypatch.setattr(ivf.IVFCollection, "train", spy)
+    await index.search("docs", vectors[0])
+    await index.search("docs", vectors[1])
+    assert held == [True]  # once, with no search running
+
+
+async def test_resolved_through_registry(client):
+    from cat.ambient.runtime import ccat
+
+    assert isinstance(await ccat().get("vector_indexes", "default"), DefaultVectorIndex)
+    assert isinstance(await ccat().get("vector_indexes", "ivf"), ivf.IVFVectorIndex)